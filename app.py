@@ -1,20 +1,154 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, g
 import asyncio
+import contextvars
 import json
 import io
 import os
+import queue
+import re
+import threading
 import uuid
+import time
 import logging
 from functools import wraps
+from werkzeug.exceptions import HTTPException
+from werkzeug.middleware.proxy_fix import ProxyFix
+from typing import Any, Dict, Optional, Tuple
 from utils.extract import convert_pdf_to_json_schema
 from utils.enhance import enhance_resume_with_model
 from utils.render import generate_resume_pdf
+from utils.tracing import Trace, start_trace, finish_trace, span, set_attribute
+from utils.singleflight import get_flight_group, content_key
+from utils.admission import (AdmissionRejected, AdmissionTicket, UnknownApiKey, get_admission_controller,
+                             validate_api_key, API_KEY_HEADER)
+from utils.scheduler import set_work_class, current_work_class, PRIORITY_HEADER, INTERACTIVE
+from utils.uploads import SpoolingRequest, UploadRejected, PdfUpload, open_pdf_upload, MAX_REQUEST_BYTES
+from utils.profiling import should_profile, start_profile, write_profile
+from utils.template_registry import ResumeTemplate, UnknownTemplateError, get_template_registry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.request_class = SpoolingRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+
+# Number of reverse proxies (e.g. nginx) in front of the app whose
+# X-Forwarded-For/-Proto/-Host headers are trusted. Behind a proxy, set it so
+# quotas for clients without an API key use the client's address rather
+# than the proxy's; leave it at 0 when clients connect directly, since the
+# headers could then be forged.
+TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))
+if TRUSTED_PROXY_COUNT:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_COUNT, x_proto=TRUSTED_PROXY_COUNT,
+                            x_host=TRUSTED_PROXY_COUNT)
+
+# Time budget for a whole /process-resume request. Enhancement gets whatever
+# is left after extraction, minus what rendering needs; sections it cannot
+# finish in time keep their extracted content.
+REQUEST_DEADLINE_SECONDS = float(os.getenv('REQUEST_DEADLINE_SECONDS', '120'))
+RENDER_BUDGET_SECONDS = float(os.getenv('RENDER_BUDGET_SECONDS', '10'))
+# Comment lines sent on an idle event stream so proxies keep it open while a
+# long LLM call runs
+SSE_KEEPALIVE_SECONDS = float(os.getenv('SSE_KEEPALIVE_SECONDS', '15'))
+
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), 'temp', 'output')
+OUTPUT_ID_PATTERN = re.compile(r'^[0-9a-f-]{36}$')
+
+# Double-clicks and client retries send the same PDF and job description
+# while the first copy is still running; they wait for its result
+pipeline_flight = get_flight_group("pipeline")
+
+# Templates are discovered, validated and laid out for Typst once, here;
+# requests only pick one by name
+template_registry = get_template_registry()
+
+@app.before_request
+def begin_request_trace():
+    g.request_started = time.monotonic()
+    g.trace = start_trace(request.path, force_sample=request.headers.get('X-Trace-Sample') == '1')
+    g.profiler = start_profile() if should_profile(request.headers) else None
+
+@app.before_request
+def assign_work_class():
+    # LLM calls and renders started by this request are scheduled in its
+    # priority lane and under its tenant
+    set_work_class(request.headers.get(PRIORITY_HEADER, INTERACTIVE).strip().lower(), client_key())
+    set_attribute("priority", current_work_class()[0])
+
+@app.after_request
+def end_request_trace(response):
+    trace = g.pop('trace', None)
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profile_id = trace.trace_id if trace is not None else uuid.uuid4().hex
+        write_profile(profiler, profile_id, trace)
+        response.headers['X-Profile-Id'] = profile_id
+    if trace is not None:
+        response.headers['Server-Timing'] = trace.server_timing_header()
+        response.headers['X-Trace-Id'] = trace.trace_id
+        trace.attributes['status'] = response.status_code
+        finish_trace(trace)
+    return response
+
+@app.errorhandler(413)
+def request_too_large(error):
+    return jsonify({"error": f"Upload exceeds {MAX_REQUEST_BYTES // (1024 * 1024)} MB"}), 413
+
+@app.errorhandler(AdmissionRejected)
+def admission_rejected(error):
+    response = jsonify({"error": str(error), "reason": error.reason})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+@app.errorhandler(UnknownApiKey)
+def unknown_api_key(error):
+    return jsonify({"error": str(error)}), 401
+
+def client_key() -> str:
+    """
+    Whose quota a request counts against: its API key, else the client
+    address (as forwarded by TRUSTED_PROXY_COUNT proxies); raises UnknownApiKey
+    """
+    api_key = request.headers.get(API_KEY_HEADER)
+    return f"key:{validate_api_key(api_key)}" if api_key else f"ip:{request.remote_addr}"
+
+def admit() -> Optional[AdmissionTicket]:
+    """Wait for a pipeline slot; raises AdmissionRejected when the request is shed"""
+    controller = get_admission_controller()
+    if controller is None:
+        return None
+    with span("admission"):
+        ticket = controller.acquire(client_key())
+        set_attribute("queue_wait_ms", round(ticket.queue_wait * 1000, 1))
+    return ticket
+
+def release(ticket: Optional[AdmissionTicket]) -> None:
+    if ticket is not None:
+        get_admission_controller().release(ticket)
+
+def admitted(f):
+    """Run the view only once admission control lets the request in"""
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        ticket = admit()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            release(ticket)
+    return wrapped
+
+def request_deadline() -> float:
+    """Deadline for the current request; time spent queued for admission counts against it"""
+    return g.get('request_started', time.monotonic()) + REQUEST_DEADLINE_SECONDS
+
+def requested_template() -> ResumeTemplate:
+    """The template named by the `template` form field, else the default; raises UnknownTemplateError"""
+    template = template_registry.get(request.form.get('template') or None)
+    set_attribute("template", template.name)
+    return template
 
 def async_route(f):
     @wraps(f)
@@ -22,9 +156,87 @@ def async_route(f):
         return asyncio.run(f(*args, **kwargs))
     return wrapped
 
+def save_and_render(enhanced_json: Dict[str, Any], template: ResumeTemplate) -> Tuple[str, str]:
+    """
+    Save the enhanced JSON and render it to PDF with the given template.
+
+    Returns:
+        (id of the saved JSON, path of the rendered PDF, which may not exist
+        if rendering failed)
+    """
+    unique_id = str(uuid.uuid4())
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    
+    pdf_filename = f"{unique_id}_resume.pdf"
+    json_filename = f"{unique_id}.json"
+    pdf_path = os.path.join(OUTPUT_DIR, pdf_filename)
+    json_filepath = os.path.join(OUTPUT_DIR, json_filename)
+
+    with span("save_json"), open(json_filepath, 'w', encoding='utf-8') as f:
+        json.dump(enhanced_json, f, indent=2)
+    
+    with span("render"):
+        pdf_result = generate_resume_pdf(enhanced_json, template.name)
+    logger.info(f"PDF generation result: {pdf_result}")
+
+    if isinstance(pdf_result, str) and os.path.exists(pdf_result):
+        pdf_path = pdf_result
+    else:
+
+        pdf_files = [f for f in os.listdir(OUTPUT_DIR) if f.endswith('.pdf')]
+        if pdf_files:
+
+            pdf_files.sort(key=lambda x: os.path.getmtime(os.path.join(OUTPUT_DIR, x)), reverse=True)
+            pdf_path = os.path.join(OUTPUT_DIR, pdf_files[0])
+    return unique_id, pdf_path
+
+async def run_pipeline(upload: PdfUpload,
+                       job_description: Optional[str],
+                       template: ResumeTemplate,
+                       request_deadline: float) -> Dict[str, Any]:
+    """
+    Extract, enhance and render one resume.
+
+    Returns:
+        {"pdf_path", "unique_id", "degraded_sections"} on success, or
+        {"error", "status"} describing the error response
+    """
+    with span("extract"):
+        json_data = await convert_pdf_to_json_schema(upload.stream, content_hash=upload.digest)
+    
+    if "error" in json_data:
+        return {"error": json_data["error"], "status": 500}
+
+    with span("enhance"):
+        enhanced_json, enhance_metadata = await enhance_resume_with_model(
+            json_data=json_data,
+            job_description=job_description,
+            template_type=template.prompt_style,
+            deadline=request_deadline - RENDER_BUDGET_SECONDS,
+            return_metadata=True
+        )
+    degraded_sections = enhance_metadata["degraded_sections"]
+    if degraded_sections:
+        set_attribute("degraded_sections", degraded_sections)
+
+    try:
+        unique_id, pdf_path = save_and_render(enhanced_json, template)
+        
+        if os.path.exists(pdf_path):
+            return {"pdf_path": pdf_path, "unique_id": unique_id, "degraded_sections": degraded_sections}
+        else:
+            logger.error(f"PDF file not found at path: {pdf_path}")
+            return {"error": "Failed to generate PDF file", "status": 500}
+            
+    except Exception as e:
+        logger.error(f"PDF generation error: {str(e)}")
+        return {"error": f"PDF generation failed: {str(e)}", "status": 500}
+
 @app.route('/process-resume', methods=['POST'])
+@admitted
 @async_route
 async def process_resume():
+    deadline = request_deadline()
     try:
         if 'resume' not in request.files:
             return jsonify({"error": "No resume file provided"}), 400
@@ -35,64 +247,209 @@ async def process_resume():
         if resume_file.filename == '':
             return jsonify({"error": "No file selected"}), 400
 
-        pdf_content = resume_file.read()
+        try:
+            template = requested_template()
+        except UnknownTemplateError as e:
+            return jsonify({"error": str(e), "templates": e.available}), 400
+
+        with span("upload"):
+            try:
+                upload = open_pdf_upload(resume_file)
+            except UploadRejected as e:
+                return jsonify({"error": str(e)}), e.status
+
+        try:
+            result = await pipeline_flight.do(
+                content_key(upload.digest, job_description or "", template.name),
+                lambda: run_pipeline(upload, job_description, template, deadline)
+            )
+        finally:
+            upload.close()
+        if "error" in result:
+            return jsonify({"error": result["error"]}), result["status"]
 
-        json_data = await convert_pdf_to_json_schema(pdf_content)
+        response = send_file(
+            result["pdf_path"],
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=f"resume_{result['unique_id']}.pdf"
+        )
+        if result["degraded_sections"]:
+            response.headers['X-Degraded-Sections'] = ",".join(result["degraded_sections"])
+        return response
         
-        if "error" in json_data:
-            return jsonify({"error": json_data["error"]}), 500
+    except HTTPException:
+        # e.g. 413 while reading an oversized body; answered by its error handler
+        raise
+    except Exception as e:
+        logger.error(f"Error processing resume: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+async def run_stream_pipeline(upload: PdfUpload,
+                              job_description: Optional[str],
+                              template: ResumeTemplate,
+                              request_deadline: float,
+                              emit) -> None:
+    """Run extract, enhance and render, emitting an event as each stage completes"""
+    with span("extract"):
+        json_data = await convert_pdf_to_json_schema(upload.stream, progress=emit, content_hash=upload.digest)
+    if "error" in json_data:
+        emit("error", {"error": json_data["error"]})
+        return
+    emit("extracted", json_data)
 
-        enhanced_json = await enhance_resume_with_model(
+    with span("enhance"):
+        enhanced_json, enhance_metadata = await enhance_resume_with_model(
             json_data=json_data,
             job_description=job_description,
-            template_type="software_engineer"
+            template_type=template.prompt_style,
+            deadline=request_deadline - RENDER_BUDGET_SECONDS,
+            return_metadata=True,
+            progress=emit
         )
+    degraded_sections = enhance_metadata["degraded_sections"]
+    if degraded_sections:
+        set_attribute("degraded_sections", degraded_sections)
+    emit("enhanced", {"resume": enhanced_json, "degraded_sections": degraded_sections})
 
-        unique_id = str(uuid.uuid4())
-        
-        output_dir = os.path.join(os.path.dirname(__file__), 'temp', 'output')
-        os.makedirs(output_dir, exist_ok=True)
-        
-        pdf_filename = f"{unique_id}_resume.pdf"
-        json_filename = f"{unique_id}.json"
-        pdf_path = os.path.join(output_dir, pdf_filename)
-        json_filepath = os.path.join(output_dir, json_filename)
+    try:
+        _, pdf_path = save_and_render(enhanced_json, template)
+    except Exception as e:
+        logger.error(f"PDF generation error: {str(e)}")
+        emit("error", {"error": f"PDF generation failed: {str(e)}"})
+        return
+    if not os.path.exists(pdf_path):
+        logger.error(f"PDF file not found at path: {pdf_path}")
+        emit("error", {"error": "Failed to generate PDF file"})
+        return
+    pdf_id = os.path.basename(pdf_path)[:-len("_resume.pdf")]
+    emit("done", {"pdf_id": pdf_id, "pdf_url": f"/download/{pdf_id}"})
 
-        with open(json_filepath, 'w', encoding='utf-8') as f:
-            json.dump(enhanced_json, f, indent=2)
-        
+def stream_worker(upload: PdfUpload,
+                  job_description: Optional[str],
+                  template: ResumeTemplate,
+                  request_deadline: float,
+                  events: "queue.Queue",
+                  trace: Optional[Trace],
+                  ticket: Optional[AdmissionTicket],
+                  profile_id: Optional[str] = None) -> None:
+    """
+    Thread body for /process-resume/stream; always ends the stream and the
+    trace, closes the upload and releases the admission slot. With a
+    profile_id, this thread (where the pipeline runs) is profiled.
+    """
+    def emit(event: str, data: Dict[str, Any]) -> None:
+        events.put((event, data))
+
+    profiler = start_profile() if profile_id is not None else None
+    status = "ok"
+    try:
+        asyncio.run(run_stream_pipeline(upload, job_description, template, request_deadline, emit))
+    except Exception as e:
+        logger.error(f"Error processing resume: {str(e)}")
+        status = "error"
+        emit("error", {"error": str(e)})
+    finally:
+        upload.close()
+        release(ticket)
+        events.put(None)
+        if profiler is not None:
+            write_profile(profiler, profile_id, trace)
+        if trace is not None:
+            trace.attributes['status'] = status
+            finish_trace(trace)
+
+def format_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_events(events: "queue.Queue"):
+    while True:
         try:
-            pdf_result = generate_resume_pdf(enhanced_json)
-            logger.info(f"PDF generation result: {pdf_result}")
+            item = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+        except queue.Empty:
+            yield ": keep-alive\n\n"
+            continue
+        if item is None:
+            return
+        yield format_event(*item)
 
-            if isinstance(pdf_result, str) and os.path.exists(pdf_result):
-                pdf_path = pdf_result
-            else:
+@app.route('/process-resume/stream', methods=['POST'])
+def process_resume_stream():
+    """
+    Streaming variant of /process-resume.
 
-                pdf_files = [f for f in os.listdir(output_dir) if f.endswith('.pdf')]
-                if pdf_files:
+    Responds with Server-Sent Events as the pipeline progresses:
+    `text_extracted`, `extracted` (the extracted resume JSON), one
+    `section_enhanced` per section as soon as it is final, `enhanced`, and
+    finally `done` with the URL of the PDF, or `error`.
+    """
+    # The slot is held until the worker thread finishes, not until this view returns
+    ticket = admit()
+    started = False
+    try:
+        deadline = request_deadline()
+        if 'resume' not in request.files:
+            return jsonify({"error": "No resume file provided"}), 400
 
-                    pdf_files.sort(key=lambda x: os.path.getmtime(os.path.join(output_dir, x)), reverse=True)
-                    pdf_path = os.path.join(output_dir, pdf_files[0])
-            
-            if os.path.exists(pdf_path):
-                return send_file(
-                    pdf_path,
-                    mimetype='application/pdf',
-                    as_attachment=True,
-                    download_name=f"resume_{unique_id}.pdf"
-                )
-            else:
-                logger.error(f"PDF file not found at path: {pdf_path}")
-                return jsonify({"error": "Failed to generate PDF file"}), 500
-                
-        except Exception as e:
-            logger.error(f"PDF generation error: {str(e)}")
-            return jsonify({"error": f"PDF generation failed: {str(e)}"}), 500
-        
-    except Exception as e:
-        logger.error(f"Error processing resume: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        resume_file = request.files['resume']
+        job_description = request.form.get('job_description')
+
+        if resume_file.filename == '':
+            return jsonify({"error": "No file selected"}), 400
+
+        try:
+            template = requested_template()
+        except UnknownTemplateError as e:
+            return jsonify({"error": str(e), "templates": e.available}), 400
+
+        with span("upload"):
+            try:
+                upload = open_pdf_upload(resume_file)
+            except UploadRejected as e:
+                return jsonify({"error": str(e)}), e.status
+
+        # The pipeline outlives this view, so it runs on its own thread and
+        # event loop with a copy of the request context; the worker finishes
+        # the trace and releases the admission slot. The request thread's
+        # sampler would only see this view return, so the worker profiles itself
+        trace = g.pop('trace', None)
+        profile_id = None
+        request_profiler = g.pop('profiler', None)
+        if request_profiler is not None:
+            request_profiler.stop()
+            profile_id = trace.trace_id if trace is not None else uuid.uuid4().hex
+        events: "queue.Queue" = queue.Queue()
+        worker = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(stream_worker, upload, job_description, template, deadline, events, trace, ticket, profile_id),
+            daemon=True
+        )
+        worker.start()
+        started = True
+    finally:
+        if not started:
+            release(ticket)
+    response = Response(
+        stream_events(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    if profile_id is not None:
+        response.headers['X-Profile-Id'] = profile_id
+    return response
+
+@app.route('/templates', methods=['GET'])
+def list_templates():
+    """Templates a request can name in its `template` form field"""
+    return jsonify({"default": template_registry.default, "templates": template_registry.describe()})
+
+@app.route('/download/<pdf_id>', methods=['GET'])
+def download_resume(pdf_id: str):
+    """Serve a PDF rendered by /process-resume/stream"""
+    pdf_path = os.path.join(OUTPUT_DIR, f"{pdf_id}_resume.pdf")
+    if not OUTPUT_ID_PATTERN.match(pdf_id) or not os.path.exists(pdf_path):
+        return jsonify({"error": "Resume not found"}), 404
+    return send_file(pdf_path, mimetype='application/pdf', as_attachment=True, download_name=f"resume_{pdf_id}.pdf")
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
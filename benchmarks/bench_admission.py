@@ -0,0 +1,160 @@
+"""
+Admission control under overload.
+
+Sends open-loop Poisson arrivals to /process-resume in-process, with the fake
+model limited to --model-concurrency calls at once the way a provider's
+concurrency limit caps a real deployment, so offered load past that capacity
+actually saturates the server. Each rate runs with admission control off and
+on. Reports latency of the admitted (200) requests, how many were shed with
+429, and the Retry-After values they were given.
+
+Usage:
+    python -m benchmarks.bench_admission --rates 2,4,8,16 --duration 20 --latency-ms 300
+"""
+import os
+
+os.environ.setdefault("MODEL_NAME", "fake")
+# Measure uncached work; a warm shared cache from an earlier run would skew it
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
+# Repeated corpus entries must not coalesce into one pipeline run
+os.environ.setdefault("SINGLEFLIGHT_ENABLED", "false")
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List
+
+logging.basicConfig(level=logging.ERROR)
+
+from benchmarks.load_test import JOB_DESCRIPTION
+from benchmarks.pdf_corpus import make_pdf_corpus
+from benchmarks.stats import summarize
+from utils import admission
+from utils.local_models import FakeChatModel
+
+def limit_model_concurrency(limit: int) -> None:
+    """Let at most `limit` fake model calls run at once across all request threads"""
+    slots = threading.BoundedSemaphore(limit)
+    ainvoke = FakeChatModel.ainvoke
+
+    async def limited_ainvoke(model, *a, **kw):
+        # Each request runs its own event loop, so poll rather than block it
+        while not slots.acquire(blocking=False):
+            await asyncio.sleep(0.005)
+        try:
+            return await ainvoke(model, *a, **kw)
+        finally:
+            slots.release()
+
+    FakeChatModel.ainvoke = limited_ainvoke
+
+def run_step(app, corpus: List[bytes], rate: float, duration: float, rng: random.Random) -> Dict[str, Any]:
+    """Send Poisson arrivals at `rate` requests/sec for `duration` seconds"""
+    latencies: List[float] = []
+    retry_after: List[float] = []
+    status_counts: Dict[str, int] = {}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(pdf_content: bytes) -> None:
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        start = time.perf_counter()
+        response = local.client.post(
+            "/process-resume",
+            data={"resume": (io.BytesIO(pdf_content), "resume.pdf"), "job_description": JOB_DESCRIPTION},
+            content_type="multipart/form-data"
+        )
+        latency = time.perf_counter() - start
+        response.close()
+        with lock:
+            status_counts[str(response.status_code)] = status_counts.get(str(response.status_code), 0) + 1
+            if response.status_code == 200:
+                latencies.append(latency)
+            elif response.status_code == 429:
+                retry_after.append(float(response.headers["Retry-After"]))
+
+    futures = []
+    start = time.perf_counter()
+    next_arrival = start
+    index = 0
+    with ThreadPoolExecutor(max_workers=512) as pool:
+        while next_arrival - start < duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(send, corpus[index % len(corpus)]))
+            index += 1
+            next_arrival += rng.expovariate(rate)
+        wait(futures)
+    for future in futures:
+        future.result()
+    wall_seconds = time.perf_counter() - start
+
+    total = sum(status_counts.values())
+    return {
+        "offered_rps": rate,
+        "requests": total,
+        "status_counts": status_counts,
+        "shed_rate": round(status_counts.get("429", 0) / total, 4) if total else 0.0,
+        "goodput_rps": round(len(latencies) / wall_seconds, 3),
+        "admitted_latency": summarize(latencies),
+        "retry_after": summarize(retry_after) if retry_after else None
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", default="2,4,8,16", help="Comma-separated arrival rates (req/s)")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per step")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Fake model base latency")
+    parser.add_argument("--model-concurrency", type=int, default=16, help="Fake model calls allowed at once")
+    parser.add_argument("--max-in-flight", type=int, default=admission.ADMISSION_MAX_IN_FLIGHT)
+    parser.add_argument("--max-queue", type=int, default=admission.ADMISSION_MAX_QUEUE)
+    parser.add_argument("--queue-timeout", type=float, default=admission.ADMISSION_QUEUE_TIMEOUT_SECONDS)
+    parser.add_argument("--corpus-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-output", action="store_true", help="Keep the files app.py writes to temp/output")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    limit_model_concurrency(args.model_concurrency)
+    import app as app_module
+
+    corpus = make_pdf_corpus(args.corpus_size, seed=args.seed)
+    existing_outputs = set(os.listdir(app_module.OUTPUT_DIR)) if os.path.isdir(app_module.OUTPUT_DIR) else set()
+    steps = []
+    for rate in (float(r) for r in args.rates.split(",")):
+        for enabled in (False, True):
+            # All load comes from one client, so the per-key quota is lifted
+            admission.ADMISSION_ENABLED = enabled
+            admission._controller = admission.AdmissionController(
+                max_in_flight=args.max_in_flight, max_queue=args.max_queue,
+                queue_timeout=args.queue_timeout, key_limit=10 ** 6
+            )
+            step = {"admission": enabled,
+                    **run_step(app_module.app, corpus, rate, args.duration, random.Random(args.seed))}
+            if enabled:
+                step["controller"] = admission.get_admission_stats()
+            print(json.dumps(step))
+            steps.append(step)
+
+    if not args.keep_output and os.path.isdir(app_module.OUTPUT_DIR):
+        for name in set(os.listdir(app_module.OUTPUT_DIR)) - existing_outputs:
+            os.remove(os.path.join(app_module.OUTPUT_DIR, name))
+
+    report = {"config": vars(args), "steps": steps}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Compare N individual Typst compiles against one bulk compile.
+
+Usage:
+    python -m benchmarks.bench_bulk_render --count 50
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_corpus
+from utils.custom_typst import process_resume_with_custom_typst, process_resumes_with_custom_typst_bulk
+from utils.template_registry import get_template
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20, help="Number of resumes to render")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.count, seed=args.seed)
+    template = get_template()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        for json_data in corpus:
+            process_resume_with_custom_typst(json_data, template, output_dir)
+        individual_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pdf_paths = process_resumes_with_custom_typst_bulk(corpus, template, output_dir)
+        bulk_seconds = time.perf_counter() - start
+
+        assert len(pdf_paths) == len(corpus) and all(os.path.exists(p) for p in pdf_paths)
+
+    print(json.dumps({
+        "resumes": args.count,
+        "individual_seconds": round(individual_seconds, 3),
+        "bulk_seconds": round(bulk_seconds, 3),
+        "individual_resumes_per_sec": round(args.count / individual_seconds, 2),
+        "bulk_resumes_per_sec": round(args.count / bulk_seconds, 2),
+        "speedup": round(individual_seconds / bulk_seconds, 2)
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
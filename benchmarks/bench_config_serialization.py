@@ -0,0 +1,66 @@
+"""
+Serialization cost and file I/O per render: YAML-on-disk versus in-memory JSON.
+
+"yaml_file" reproduces the previous path (yaml.dump to the output directory,
+copy into the Typst working directory, remove the temporary file). "json_inline"
+is the current path (orjson bytes handed to Typst through --input, written
+to disk only above MAX_INLINE_CONFIG_BYTES).
+
+Usage:
+    python -m benchmarks.bench_config_serialization --size 1000
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import yaml
+
+from benchmarks.synthetic import make_corpus
+from utils.converter import convert_many
+from utils.custom_typst import MAX_INLINE_CONFIG_BYTES, build_config_inputs, serialize_config
+
+def yaml_file_path(config, output_dir: str, work_dir: str) -> int:
+    yaml_path = os.path.join(output_dir, "resume.yaml")
+    with open(yaml_path, 'w', encoding='utf-8') as file:
+        yaml.dump(config, file, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    shutil.copy2(yaml_path, os.path.join(work_dir, "configuration.yaml"))
+    written = os.path.getsize(yaml_path) * 2
+    os.remove(yaml_path)
+    return written
+
+def json_inline_path(config, output_dir: str, work_dir: str) -> int:
+    config_json = serialize_config(config)
+    build_config_inputs(config_json, work_dir)
+    return 0 if len(config_json) <= MAX_INLINE_CONFIG_BYTES else len(config_json)
+
+def measure(fn, configs) -> dict:
+    with tempfile.TemporaryDirectory() as output_dir, tempfile.TemporaryDirectory() as work_dir:
+        bytes_written = 0
+        start = time.perf_counter()
+        for config in configs:
+            bytes_written += fn(config, output_dir, work_dir)
+        elapsed = time.perf_counter() - start
+    return {
+        "mean_ms_per_render": round(elapsed / len(configs) * 1000, 4),
+        "bytes_written_per_render": round(bytes_written / len(configs), 1)
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000, help="Number of synthetic configurations")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    configs = convert_many(make_corpus(args.size, seed=args.seed))
+
+    print(json.dumps({
+        "configurations": args.size,
+        "yaml_file": measure(yaml_file_path, configs),
+        "json_inline": measure(json_inline_path, configs)
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Micro-benchmark of JSON -> Typst configuration conversions per second.
+
+Usage:
+    python -m benchmarks.bench_converter --size 5000 --repeat 5
+"""
+import argparse
+import json
+import time
+
+from benchmarks.synthetic import make_corpus
+from utils.converter import EnhancedJSONToConfigConverter, convert_many
+
+def best_of(repeat: int, fn) -> float:
+    """Return the fastest wall-clock time of several runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=5000, help="Number of synthetic resumes")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.size, seed=args.seed)
+
+    single_seconds = best_of(args.repeat, lambda: [EnhancedJSONToConfigConverter(j).convert() for j in corpus])
+    batch_seconds = best_of(args.repeat, lambda: convert_many(corpus))
+
+    print(json.dumps({
+        "resumes": args.size,
+        "single_conversions_per_sec": round(args.size / single_seconds, 1),
+        "convert_many_conversions_per_sec": round(args.size / batch_seconds, 1)
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Cold-start benchmark for importing app.py.
+
+Each run starts a fresh interpreter, so nothing is shared between runs
+except the OS page cache. The "lazy" variant imports app.py as the server
+does; the "eager" variant first imports every provider backend, which is
+what app.py used to pay at boot before providers were loaded on first use.
+With --breakdown, the slowest modules from `python -X importtime` are
+listed as well.
+
+Usage:
+    python -m benchmarks.bench_import_time --runs 10
+    python -m benchmarks.bench_import_time --runs 5 --breakdown 15 --output import_time.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Any, List, Tuple
+
+from benchmarks.stats import summarize
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER_PROVIDER_IMPORTS = "; ".join(
+    f"from {module} import {class_name}"
+    for module, class_name in (
+        ("langchain_google_genai", "GoogleGenerativeAI"),
+        ("langchain_openai", "ChatOpenAI"),
+        ("langchain_deepseek", "ChatDeepSeek"),
+    )
+)
+
+VARIANTS = {
+    "lazy": "import app",
+    "eager": f"{EAGER_PROVIDER_IMPORTS}; import app",
+}
+
+def time_cold_import(code: str) -> float:
+    """Wall time of a fresh interpreter running `code`, in seconds"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def import_breakdown(code: str, top: int) -> List[Tuple[str, float]]:
+    """Slowest top-level and first-level imports by cumulative time, in ms"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_DIR,
+                            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 1:
+            modules.append((name.strip(), int(cumulative) / 1000))
+    modules.sort(key=lambda item: item[1], reverse=True)
+    return modules[:top]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--variants", default="lazy,eager", help="Comma-separated subset of: " + ", ".join(VARIANTS))
+    parser.add_argument("--breakdown", type=int, default=0, help="List the N slowest imports of each variant")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {"python": sys.version.split()[0], "runs": args.runs, "variants": {}}
+
+    for variant in args.variants.split(","):
+        code = VARIANTS[variant]
+        # One untimed run so every variant starts with a warm page cache
+        time_cold_import(code)
+        timings = [time_cold_import(code) for _ in range(args.runs)]
+        result: Dict[str, Any] = {"latency": summarize(timings)}
+        if args.breakdown:
+            result["slowest_imports_ms"] = dict(import_breakdown(code, args.breakdown))
+        report["variants"][variant] = result
+
+    variants = report["variants"]
+    if "lazy" in variants and "eager" in variants:
+        lazy, eager = variants["lazy"]["latency"]["p50_ms"], variants["eager"]["latency"]["p50_ms"]
+        report["p50_saved_ms"] = round(eager - lazy, 3)
+        report["p50_speedup"] = round(eager / lazy, 2) if lazy else None
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
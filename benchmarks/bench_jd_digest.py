@@ -0,0 +1,108 @@
+"""
+Job description digest: prompt tokens saved and latency cost.
+
+For synthetic postings of increasing length, reports the raw and digest
+token counts, the prompt tokens saved across the enhancement calls planned
+for a synthetic resume, the cost of building a digest (cache miss) and of
+looking it up (cache hit), and the enhancement wall time against the fake
+model with and without the digest. The fake model's latency does not depend
+on prompt size, so the prefill time saved is estimated from
+--prefill-tokens-per-second instead.
+
+Usage:
+    python -m benchmarks.bench_jd_digest --paragraphs 1,3,6 --repeat 200
+"""
+import os
+
+os.environ.setdefault("MODEL_NAME", "fake")
+# Measure uncached work; a warm shared cache from an earlier run would skew it
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+logging.basicConfig(level=logging.WARNING)
+
+from benchmarks.stats import summarize
+from benchmarks.synthetic import make_job_description, make_resume_json
+from utils import jd_digest
+from utils.enhance import enhance_resume_by_sections
+from utils.local_models import FakeChatModel
+from utils.section_planner import plan_enhancement_calls
+
+async def time_enhance(resume, job_description: str, model: FakeChatModel, runs: int) -> float:
+    """Median enhancement wall time in seconds"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await enhance_resume_by_sections(resume, model, job_description, "software_engineer")
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", default="1,3,6", help="Comma-separated posting sizes (~250 tokens each)")
+    parser.add_argument("--repeat", type=int, default=200, help="Digest builds/lookups timed per size")
+    parser.add_argument("--enhance-runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake model base latency")
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=2500.0,
+                        help="Provider prompt processing rate used to estimate prefill time saved")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    resume = make_resume_json(args.seed, work_entries=6)
+    planned_calls = len(plan_enhancement_calls(resume))
+    model = FakeChatModel(latency_ms=args.latency_ms, seed=args.seed)
+
+    results = []
+    for paragraphs in (int(p) for p in args.paragraphs.split(",")):
+        job_description = make_job_description(args.seed, paragraphs)
+
+        build_timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            jd_digest.build_local_digest(job_description)
+            build_timings.append(time.perf_counter() - start)
+
+        digest = asyncio.run(jd_digest.get_jd_digest(job_description))
+        hit_timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            asyncio.run(jd_digest.get_jd_digest(job_description))
+            hit_timings.append(time.perf_counter() - start)
+
+        jd_digest.JD_DIGEST_ENABLED = False
+        raw_seconds = asyncio.run(time_enhance(resume, job_description, model, args.enhance_runs))
+        jd_digest.JD_DIGEST_ENABLED = True
+        digest_seconds = asyncio.run(time_enhance(resume, job_description, model, args.enhance_runs))
+
+        raw_tokens = jd_digest.estimate_tokens(job_description)
+        digest_tokens = digest.digest_tokens if digest else raw_tokens
+        saved_per_resume = (raw_tokens - digest_tokens) * planned_calls
+        results.append({
+            "paragraphs": paragraphs,
+            "raw_jd_tokens": raw_tokens,
+            "digest_tokens": digest_tokens,
+            "digest_source": digest.source if digest else "raw",
+            "planned_calls": planned_calls,
+            "prompt_tokens_saved_per_resume": saved_per_resume,
+            "estimated_prefill_ms_saved_per_resume": round(saved_per_resume / args.prefill_tokens_per_second * 1000, 1),
+            "digest_build": summarize(build_timings),
+            "digest_cache_hit": summarize(hit_timings),
+            "enhance_p50_ms": {"raw_jd": round(raw_seconds * 1000, 2), "digest": round(digest_seconds * 1000, 2)}
+        })
+        print(json.dumps(results[-1]))
+
+    report = {"config": vars(args), "sizes": results, "cache": jd_digest.get_digest_stats()}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+End-to-end pipeline benchmark against the local fake model.
+
+Drives convert_pdf_to_json_schema -> enhance_resume_with_model ->
+generate_resume_pdf over a corpus of generated PDFs and reports per-stage
+p50/p95/p99, throughput at several concurrency levels and peak memory as JSON.
+
+Usage:
+    python -m benchmarks.bench_pipeline --corpus-size 50 --concurrency 1,4,16 \
+        --latency-ms 800 --latency-distribution lognormal --tokens-per-second 80 \
+        --output results.json [--compare baseline.json]
+
+To replay production-shaped traffic instead, record real runs with
+LLM_RECORD_PATH set and replay them over the same PDFs:
+    python -m benchmarks.bench_pipeline --model replay --replay-path llm.jsonl.zst \
+        --simulate-latency --pdf-dir recorded_pdfs/
+"""
+import os
+
+# Every stage builds its model through SimpleModelManager, so selecting the
+# fake provider has to happen before the pipeline modules are imported.
+os.environ["MODEL_NAME"] = "fake"
+# Measure uncached work; a warm shared cache from an earlier run would skew it
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
+
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import platform
+import resource
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, Any, List
+
+logging.basicConfig(level=logging.WARNING)
+
+from benchmarks.pdf_corpus import make_pdf_corpus
+from benchmarks.stats import summarize, compare
+from benchmarks.synthetic import make_resume_json
+from utils import modelmanager
+from utils.modelmanager import MODEL_CONFIGS
+from utils.extract import convert_pdf_to_json_schema
+from utils.enhance import enhance_resume_with_model
+from utils.render import generate_resume_pdf
+
+STAGES = ("extract", "enhance", "render")
+
+async def run_document(pdf_content: bytes, job_description: str, skip_render: bool,
+                       timings: Dict[str, List[float]]) -> bool:
+    """Run one document through the pipeline, recording per-stage durations"""
+    # Kept per document; with concurrency the shared lists interleave documents
+    durations: Dict[str, float] = {}
+    start = time.perf_counter()
+    json_data = await convert_pdf_to_json_schema(pdf_content)
+    durations["extract"] = time.perf_counter() - start
+    timings["extract"].append(durations["extract"])
+    if "error" in json_data:
+        return False
+
+    start = time.perf_counter()
+    enhanced_json = await enhance_resume_with_model(json_data, job_description, "software_engineer")
+    durations["enhance"] = time.perf_counter() - start
+    timings["enhance"].append(durations["enhance"])
+
+    if not skip_render:
+        start = time.perf_counter()
+        pdf_path = await asyncio.to_thread(generate_resume_pdf, enhanced_json)
+        durations["render"] = time.perf_counter() - start
+        timings["render"].append(durations["render"])
+        os.remove(pdf_path)
+
+    timings["total"].append(sum(durations.values()))
+    return True
+
+async def run_level(corpus: List[bytes], concurrency: int, job_description: str,
+                    skip_render: bool) -> Dict[str, Any]:
+    """Run the whole corpus with at most `concurrency` documents in flight"""
+    timings = defaultdict(list)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(pdf_content: bytes) -> bool:
+        async with semaphore:
+            return await run_document(pdf_content, job_description, skip_render, timings)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bounded(pdf) for pdf in corpus))
+    wall = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "throughput_docs_per_sec": round(len(corpus) / wall, 3),
+        "errors": results.count(False),
+        "stages": {stage: summarize(timings[stage]) for stage in (*STAGES, "total")}
+    }
+
+def print_comparison(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print relative changes against a previous report"""
+    previous_levels = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    for level in report["levels"]:
+        previous = previous_levels.get(level["concurrency"])
+        if not previous:
+            continue
+        print(f"concurrency={level['concurrency']} throughput: "
+              f"{compare({'t': level['throughput_docs_per_sec']}, {'t': previous['throughput_docs_per_sec']}).get('t')}")
+        for stage, summary in level["stages"].items():
+            print(f"  {stage}: {compare(summary, previous['stages'].get(stage, {}))}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="fake", choices=["fake", "replay"])
+    parser.add_argument("--replay-path", help="Recording to serve responses from (--model replay)")
+    parser.add_argument("--simulate-latency", action="store_true", help="Replay the recorded provider latency")
+    parser.add_argument("--pdf-dir", help="Use the PDFs in this directory instead of a synthetic corpus")
+    parser.add_argument("--corpus-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median per-call latency of the fake model")
+    parser.add_argument("--latency-distribution", default="fixed", choices=["fixed", "uniform", "lognormal", "exponential"])
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated output token throughput (0 = instant)")
+    parser.add_argument("--job-description", default="Backend engineer with Python, Django and AWS experience.")
+    parser.add_argument("--skip-render", action="store_true", help="Skip the Typst stage")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    modelmanager.DEFAULT_MODEL = args.model
+    MODEL_CONFIGS["replay"].update({
+        "record_path": args.replay_path,
+        "simulate_latency": args.simulate_latency
+    })
+    MODEL_CONFIGS["fake"].update({
+        "latency_ms": args.latency_ms,
+        "latency_distribution": args.latency_distribution,
+        "latency_sigma": args.latency_sigma,
+        "tokens_per_second": args.tokens_per_second,
+        "canned_response": make_resume_json(args.seed),
+        "seed": args.seed
+    })
+
+    if args.pdf_dir:
+        corpus = []
+        for pdf_path in sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf"))):
+            with open(pdf_path, "rb") as f:
+                corpus.append(f.read())
+    else:
+        corpus = make_pdf_corpus(args.corpus_size, seed=args.seed)
+
+    tracemalloc.start()
+    levels = [
+        asyncio.run(run_level(corpus, int(level), args.job_description, args.skip_render))
+        for level in args.concurrency.split(",")
+    ]
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "levels": levels,
+        "memory": {
+            "peak_traced_mb": round(peak_traced / 2**20, 2),
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+        }
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print_comparison(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Interactive latency while a bulk batch saturates the LLM pool.
+
+Runs app.py in-process with the LLM pool capped at --llm-concurrency calls.
+Recruiter batches keep --bulk-clients requests in flight back to back, spread
+over --bulk-tenants API keys, while interactive users (each with their own API key) arrive as Poisson traffic at
+--interactive-rate. Three setups share the same capacity:
+
+- fifo: everyone on one key without a priority header, so calls are served
+  in arrival order (one shared queue, the previous behaviour)
+- tenant_fair: distinct keys, no priority header; tenants share the pool
+- lanes: the batch also sends `X-Priority: bulk`
+
+Reports interactive latency percentiles and bulk throughput for each.
+
+Usage:
+    python -m benchmarks.bench_scheduler --bulk-clients 12 --interactive-rate 1 --duration 30 --latency-ms 300
+    python -m benchmarks.bench_scheduler --bulk-clients 12 --bulk-tenants 12 --setups tenant_fair,lanes
+"""
+import os
+
+os.environ.setdefault("MODEL_NAME", "fake")
+# Measure uncached work; a warm shared cache from an earlier run would skew it
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
+# Repeated corpus entries must not coalesce into one pipeline run
+os.environ.setdefault("SINGLEFLIGHT_ENABLED", "false")
+# The batch alone exceeds any per-key quota; this measures scheduling, not admission
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+
+import argparse
+import io
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, List
+
+logging.basicConfig(level=logging.ERROR)
+
+from benchmarks.pdf_corpus import make_pdf_corpus
+from benchmarks.stats import summarize
+
+JOB_DESCRIPTION = "Backend engineer with Python, Django and AWS experience building REST APIs."
+SETUPS = ("fifo", "tenant_fair", "lanes")
+
+def post(client, pdf_content: bytes, headers: Dict[str, str]) -> int:
+    response = client.post(
+        "/process-resume",
+        headers=headers,
+        data={"resume": (io.BytesIO(pdf_content), "resume.pdf"), "job_description": JOB_DESCRIPTION},
+        content_type="multipart/form-data"
+    )
+    response.close()
+    return response.status_code
+
+def run_setup(app, corpus: List[bytes], setup: str, bulk_clients: int, bulk_tenants: int,
+              rate: float, duration: float, seed: int) -> Dict[str, Any]:
+    interactive: List[float] = []
+    bulk: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def headers(role: str, user: int) -> Dict[str, str]:
+        if setup == "fifo":
+            return {"X-API-Key": "shared"}
+        if role == "bulk":
+            return {"X-API-Key": f"recruiter-{user}", **({"X-Priority": "bulk"} if setup == "lanes" else {})}
+        return {"X-API-Key": f"user-{user}"}
+
+    def record(latencies: List[float], start: float, status: int) -> None:
+        nonlocal errors
+        with lock:
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    def bulk_client(index: int) -> None:
+        client = app.test_client()
+        request_index = index
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            record(bulk, start, post(client, corpus[request_index % len(corpus)], headers("bulk", index % bulk_tenants)))
+            request_index += bulk_clients
+
+    def interactive_user(user: int) -> None:
+        start = time.perf_counter()
+        record(interactive, start, post(app.test_client(), corpus[user % len(corpus)], headers("interactive", user)))
+
+    rng = random.Random(seed)
+    threads = [threading.Thread(target=bulk_client, args=(i,)) for i in range(bulk_clients)]
+    for thread in threads:
+        thread.start()
+    # Let the batch fill the pool before interactive traffic starts
+    time.sleep(min(2.0, duration / 4))
+    user = 0
+    next_arrival = time.perf_counter()
+    while next_arrival < stop:
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        thread = threading.Thread(target=interactive_user, args=(user,))
+        thread.start()
+        threads.append(thread)
+        user += 1
+        next_arrival += rng.expovariate(rate)
+    for thread in threads:
+        thread.join()
+
+    return {
+        "setup": setup,
+        "errors": errors,
+        "interactive": {"requests": len(interactive), "latency": summarize(interactive)},
+        "bulk": {"requests": len(bulk), "throughput_rps": round(len(bulk) / duration, 3), "latency": summarize(bulk)}
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bulk-clients", type=int, default=12, help="Batch requests kept in flight")
+    parser.add_argument("--bulk-tenants", type=int, default=1, help="API keys the batch requests are spread over")
+    parser.add_argument("--interactive-rate", type=float, default=1.0, help="Interactive arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per setup")
+    parser.add_argument("--llm-concurrency", type=int, default=8, help="LLM calls allowed at once")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Fake model base latency")
+    parser.add_argument("--setups", default=",".join(SETUPS))
+    parser.add_argument("--corpus-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-output", action="store_true", help="Keep the files app.py writes to temp/output")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LLM_MAX_CONCURRENCY"] = str(args.llm_concurrency)
+    import app as app_module
+
+    corpus = make_pdf_corpus(args.corpus_size, seed=args.seed)
+    existing_outputs = set(os.listdir(app_module.OUTPUT_DIR)) if os.path.isdir(app_module.OUTPUT_DIR) else set()
+    results = []
+    for setup in args.setups.split(","):
+        result = run_setup(app_module.app, corpus, setup, args.bulk_clients, args.bulk_tenants,
+                           args.interactive_rate, args.duration, args.seed)
+        print(json.dumps(result))
+        results.append(result)
+
+    if not args.keep_output and os.path.isdir(app_module.OUTPUT_DIR):
+        for name in set(os.listdir(app_module.OUTPUT_DIR)) - existing_outputs:
+            os.remove(os.path.join(app_module.OUTPUT_DIR, name))
+
+    report = {"config": vars(args), "setups": results}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
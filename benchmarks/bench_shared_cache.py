@@ -0,0 +1,92 @@
+"""
+Shared cache across worker processes.
+
+Runs the full pipeline (extract -> enhance -> render) over the same corpus
+in separate processes that share one cache file, the way several workers on
+one host would: first a single cold worker, then --workers warm workers at
+once. Reports per-resume latency for each phase and the per-namespace cache
+stats accumulated by all processes.
+
+Usage:
+    python -m benchmarks.bench_shared_cache --corpus-size 10 --workers 4 --latency-ms 300
+"""
+import os
+
+os.environ["MODEL_NAME"] = "fake"
+os.environ["SHARED_CACHE_ENABLED"] = "true"
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import tempfile
+import time
+from typing import Any, Dict, List
+
+logging.basicConfig(level=logging.WARNING)
+
+from benchmarks.pdf_corpus import make_pdf_corpus
+from benchmarks.stats import summarize
+
+JOB_DESCRIPTION = "Backend engineer with Python, Django and AWS experience building REST APIs."
+
+def run_worker(corpus: List[bytes]) -> List[float]:
+    """Process body: run the pipeline over the corpus; returns per-resume seconds"""
+    from utils.enhance import enhance_resume_with_model
+    from utils.extract import convert_pdf_to_json_schema
+    from utils.render import generate_resume_pdf
+    from utils.shared_cache import get_shared_cache
+
+    async def pipeline(pdf_content: bytes) -> None:
+        json_data = await convert_pdf_to_json_schema(pdf_content)
+        enhanced = await enhance_resume_with_model(json_data, JOB_DESCRIPTION, "software_engineer")
+        generate_resume_pdf(enhanced)
+
+    timings = []
+    for pdf_content in corpus:
+        start = time.perf_counter()
+        asyncio.run(pipeline(pdf_content))
+        timings.append(time.perf_counter() - start)
+    get_shared_cache().flush_stats()
+    return timings
+
+def run_phase(pool_size: int, corpus: List[bytes]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(pool_size) as pool:
+        timings = [t for worker in pool.map(run_worker, [corpus] * pool_size) for t in worker]
+    return {"workers": pool_size, "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+            "per_resume": summarize(timings)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus-size", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4, help="Warm worker processes")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Fake model base latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    corpus = make_pdf_corpus(args.corpus_size, seed=args.seed)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Spawned workers read the cache location from the environment
+        os.environ["SHARED_CACHE_PATH"] = os.path.join(cache_dir, "shared_cache.sqlite3")
+        from utils import shared_cache
+        shared_cache.SHARED_CACHE_PATH = os.environ["SHARED_CACHE_PATH"]
+
+        cold = run_phase(1, corpus)
+        print(json.dumps({"cold": cold}))
+        warm = run_phase(args.workers, corpus)
+        print(json.dumps({"warm": warm}))
+        stats = shared_cache.SharedCache(path=os.environ["SHARED_CACHE_PATH"]).stats()
+
+    report = {"config": vars(args), "cold": cold, "warm": warm, "cache": stats}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
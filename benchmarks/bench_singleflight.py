@@ -0,0 +1,129 @@
+"""
+Single-flight coalescing of duplicate /process-resume requests.
+
+Sends bursts of identical requests (the same PDF and job description, as
+produced by double-clicks and client retries) to app.py in-process through
+the Flask test client, with coalescing disabled and enabled. Reports the
+burst wall time, per-request latency, and how many LLM calls and Typst
+compiles actually ran.
+
+Usage:
+    python -m benchmarks.bench_singleflight --duplicates 1,2,4,8 --latency-ms 300
+"""
+import os
+
+os.environ.setdefault("MODEL_NAME", "fake")
+# Measure uncached work; a warm shared cache from an earlier run would skew it
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
+
+import argparse
+import io
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List
+
+logging.basicConfig(level=logging.WARNING)
+
+from benchmarks.pdf_corpus import make_resume_pdf
+from benchmarks.stats import summarize
+from benchmarks.synthetic import make_job_description, make_resume_json
+from utils import render, singleflight
+from utils.local_models import FakeChatModel
+
+class WorkCounter:
+    """Counts the LLM calls and Typst compiles that actually run"""
+
+    def __init__(self):
+        self.counts = {"llm_calls": 0, "typst_compiles": 0}
+        self._lock = threading.Lock()
+        ainvoke = FakeChatModel.ainvoke
+        compile_resume = render.process_resume_with_custom_typst
+
+        async def counted_ainvoke(model, *a, **kw):
+            self._add("llm_calls")
+            return await ainvoke(model, *a, **kw)
+
+        def counted_compile(*a, **kw):
+            self._add("typst_compiles")
+            return compile_resume(*a, **kw)
+
+        FakeChatModel.ainvoke = counted_ainvoke
+        render.process_resume_with_custom_typst = counted_compile
+
+    def _add(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+def send_burst(app, pdf_content: bytes, job_description: str, duplicates: int) -> Dict[str, Any]:
+    """Send `duplicates` identical requests at once; returns statuses, latencies and wall time"""
+    barrier = threading.Barrier(duplicates)
+    latencies: List[float] = []
+    statuses: List[int] = []
+    lock = threading.Lock()
+
+    def client() -> None:
+        barrier.wait()
+        start = time.perf_counter()
+        response = app.test_client().post(
+            "/process-resume",
+            data={"resume": (io.BytesIO(pdf_content), "resume.pdf"), "job_description": job_description}
+        )
+        with lock:
+            latencies.append(time.perf_counter() - start)
+            statuses.append(response.status_code)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(duplicates)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"wall": time.perf_counter() - start, "latencies": latencies, "statuses": statuses}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duplicates", default="1,2,4,8", help="Comma-separated burst sizes")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Fake model base latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    from app import app
+
+    counter = WorkCounter()
+    resume = make_resume_json(args.seed, work_entries=6)
+    results = []
+    for duplicates in (int(d) for d in args.duplicates.split(",")):
+        row: Dict[str, Any] = {"duplicates": duplicates}
+        for enabled in (False, True):
+            singleflight.SINGLEFLIGHT_ENABLED = enabled
+            # A distinct job description per burst, so no result is reused across bursts
+            job_description = make_job_description(args.seed * 1000 + duplicates * 2 + enabled)
+            before = counter.snapshot()
+            burst = send_burst(app, make_resume_pdf(resume, seed=args.seed), job_description, duplicates)
+            after = counter.snapshot()
+            row["coalesced" if enabled else "baseline"] = {
+                "wall_ms": round(burst["wall"] * 1000, 1),
+                "latency": summarize(burst["latencies"]),
+                "errors": sum(status != 200 for status in burst["statuses"]),
+                "work": {name: after[name] - before[name] for name in after}
+            }
+        results.append(row)
+        print(json.dumps(row))
+
+    report = {"config": vars(args), "bursts": results, "singleflight": singleflight.get_singleflight_stats()}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
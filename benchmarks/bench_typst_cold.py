@@ -0,0 +1,101 @@
+"""
+Cold `typst compile` time, host fonts versus the hermetic render environment.
+
+Each compile is a fresh Typst process, as in the render path, so font
+discovery and package resolution are paid every time. The same resume is
+compiled --runs times with the host's system fonts (the previous behaviour)
+and with the bundled fonts only (--font-path, --ignore-system-fonts and the
+local package directory). With --drop-caches (root on Linux) the page cache
+is dropped before every compile, as on a freshly booted machine. Also
+reports how many system font files the host has, since discovery cost grows
+with that number.
+
+Usage:
+    python -m benchmarks.bench_typst_cold --runs 20
+    sudo python -m benchmarks.bench_typst_cold --runs 10 --drop-caches
+"""
+import argparse
+import json
+import os
+import subprocess
+import time
+from typing import Any, Dict, List
+
+from benchmarks.stats import summarize
+from benchmarks.synthetic import make_resume_json
+from utils.converter import EnhancedJSONToConfigConverter
+from utils.custom_typst import build_config_inputs, input_file_name, remove_input_file, serialize_config, typst_environment_args
+from utils.template_registry import get_template
+from utils.typst_assets import TYPST_FONT_DIR, missing_fonts, missing_packages
+
+SYSTEM_FONT_DIRS = ("/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"),
+                    os.path.expanduser("~/.local/share/fonts"), "/System/Library/Fonts", "/Library/Fonts")
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc", ".otc")
+
+def count_system_fonts() -> int:
+    count = 0
+    for directory in SYSTEM_FONT_DIRS:
+        for _, _, files in os.walk(directory):
+            count += sum(1 for name in files if name.lower().endswith(FONT_EXTENSIONS))
+    return count
+
+def drop_caches() -> None:
+    subprocess.run(["sync"], check=True)
+    with open("/proc/sys/vm/drop_caches", "w") as f:
+        f.write("3")
+
+def time_compiles(work_dir: str, entry: str, config_inputs: List[str], hermetic: bool, runs: int, cold: bool) -> List[float]:
+    cmd = ["typst", "compile", *typst_environment_args(hermetic), *config_inputs, entry]
+    timings = []
+    for index in range(runs):
+        if cold:
+            drop_caches()
+        output_path = os.path.join(work_dir, f"out_{index}.pdf")
+        start = time.perf_counter()
+        subprocess.run([*cmd, output_path], cwd=work_dir, check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+        os.remove(output_path)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="Compiles per mode")
+    parser.add_argument("--drop-caches", action="store_true", help="Drop the page cache before every compile (root, Linux)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    # Without the bundled fonts both modes keep the system fonts, so there is nothing to compare
+    if missing_fonts():
+        parser.error(f"Bundled fonts missing from {TYPST_FONT_DIR}; run `python -m utils.typst_assets` first")
+
+    config = EnhancedJSONToConfigConverter(make_resume_json(args.seed, work_entries=4)).convert()
+    template = get_template()
+    input_name = input_file_name()
+    config_inputs = build_config_inputs(serialize_config(config), template.root, input_name)
+    try:
+        # One warm-up compile per mode so the first measured run does not also pay for the binary itself
+        modes: Dict[str, Any] = {}
+        for name, hermetic in (("system_fonts", False), ("hermetic", True)):
+            time_compiles(template.root, template.entry, config_inputs, hermetic, 1, cold=False)
+            timings = time_compiles(template.root, template.entry, config_inputs, hermetic, args.runs, cold=args.drop_caches)
+            modes[name] = summarize(timings)
+            print(json.dumps({name: modes[name]}))
+    finally:
+        remove_input_file(template, input_name)
+
+    report = {
+        "config": vars(args),
+        "system_font_files": count_system_fonts(),
+        "bundled_fonts_missing": missing_fonts(),
+        "packages_missing": [f"@{n}/{p}:{v}" for n, p, v in missing_packages()],
+        "font_dir": TYPST_FONT_DIR,
+        "compile": modes
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Peak server RSS per upload, buffered versus streamed.
+
+Starts app.py in a server subprocess and posts scanned-style resume PDFs of
+increasing size, streamed from disk, to two routes: /process-resume, which
+reads the spooled upload in place, and a route added by this script that
+buffers the whole upload in memory first (the previous behaviour). Before
+each request the server's peak RSS is reset through /proc/<pid>/clear_refs,
+so the reported peak is that request's own. Linux only.
+
+Usage:
+    python -m benchmarks.bench_upload_memory --sizes-mb 1,10,25,50
+"""
+import os
+
+os.environ.setdefault("MODEL_NAME", "fake")
+# Measure uncached work; a warm shared cache from an earlier run would skew it
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
+
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Any
+
+import requests
+
+from benchmarks.pdf_corpus import make_resume_pdf
+from benchmarks.synthetic import make_resume_json
+
+SERVER = """
+import asyncio, io, sys
+from flask import request, jsonify
+import app as app_module
+from utils.uploads import PdfUpload
+
+@app_module.app.route('/process-resume-buffered', methods=['POST'])
+def process_resume_buffered():
+    pdf_content = request.files['resume'].read()
+    upload = PdfUpload(io.BytesIO(pdf_content), len(pdf_content), 0, app_module.content_key(pdf_content))
+    result = asyncio.run(app_module.run_pipeline(upload, request.form.get('job_description'), float('inf')))
+    return jsonify({"error": result.get("error")}), result.get("status", 200)
+
+app_module.app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)
+"""
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for_server(base_url: str) -> None:
+    for _ in range(300):
+        try:
+            requests.get(base_url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    fields = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                name, value = line.split(":")
+                fields[name] = int(value.split()[0])
+    return fields
+
+def measure(pid: int, url: str, pdf_path: str) -> Dict[str, Any]:
+    with open(f"/proc/{pid}/clear_refs", "w") as f:
+        f.write("5")
+    baseline = memory_kb(pid)["VmRSS"]
+    start = time.perf_counter()
+    with open(pdf_path, "rb") as pdf_file:
+        response = requests.post(url, files={"resume": ("resume.pdf", pdf_file, "application/pdf")},
+                                 data={"job_description": "Python"}, timeout=600)
+    elapsed = time.perf_counter() - start
+    peak = memory_kb(pid)["VmHWM"]
+    return {"status": response.status_code, "latency_ms": round(elapsed * 1000, 1),
+            "peak_rss_delta_mb": round((peak - baseline) / 1024, 1)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-mb", default="1,10,25,50", help="Comma-separated scanned image sizes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    sizes = [float(size) for size in args.sizes_mb.split(",")]
+    env = dict(os.environ, MAX_UPLOAD_BYTES=str(int((max(sizes) + 8) * 1024 * 1024)))
+    resume = make_resume_json(args.seed, work_entries=4)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_paths = []
+        for size in sizes:
+            pdf_path = os.path.join(directory, f"scan_{size}.pdf")
+            with open(pdf_path, "wb") as f:
+                f.write(make_resume_pdf(resume, seed=args.seed, scan_bytes=int(size * 1024 * 1024)))
+            pdf_paths.append(pdf_path)
+            results.append({"size_mb": round(os.path.getsize(pdf_path) / (1024 * 1024), 1)})
+
+        # One server per route, so memory one route's requests leave behind
+        # in the heap does not hide the other's allocations
+        for name, route in (("buffered", "/process-resume-buffered"), ("streamed", "/process-resume")):
+            port = free_port()
+            server = subprocess.Popen([sys.executable, "-c", SERVER, str(port)], env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                url = f"http://127.0.0.1:{port}{route}"
+                wait_for_server(f"http://127.0.0.1:{port}")
+                # Warm up so imports and first-use allocations are not counted
+                measure(server.pid, url, pdf_paths[0])
+                for row, pdf_path in zip(results, pdf_paths):
+                    row[name] = measure(server.pid, url, pdf_path)
+            finally:
+                server.terminate()
+                server.wait()
+    for row in results:
+        print(json.dumps(row))
+
+    report = {"config": vars(args), "uploads": results}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Load generator for the /process-resume endpoint.
+
+Sends synthetic resume PDFs of varying length and link density either to a
+running server (--url) or to app.py in-process through the Flask test client
+(the default, fully offline against the fake model). Closed-loop mode keeps a
+fixed number of clients busy; open-loop mode sends Poisson arrivals at fixed
+rates regardless of how fast responses come back. Each step reports latency
+percentiles, error rate and throughput, and the report names the knee of the
+curve: the first step where throughput stops scaling or errors appear.
+
+Usage:
+    python -m benchmarks.load_test --mode closed --concurrency 1,2,4,8,16 --requests-per-step 40
+    python -m benchmarks.load_test --mode open --rates 0.5,1,2,4 --duration 30 --latency-ms 800
+    python -m benchmarks.load_test --url http://localhost:5000/process-resume --mode closed --concurrency 4
+"""
+import os
+
+# Measure uncached work; a warm shared cache from an earlier run would skew it
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Tuple
+
+logging.basicConfig(level=logging.WARNING)
+
+from benchmarks.pdf_corpus import make_pdf_corpus
+from benchmarks.stats import summarize
+
+JOB_DESCRIPTION = "Backend engineer with Python, Django and AWS experience building REST APIs."
+
+class Target:
+    """Sends one resume to the endpoint and returns (status_code, latency_seconds)"""
+
+    def __init__(self, url: Optional[str], timeout: float):
+        self.url = url
+        self.timeout = timeout
+        self._local = threading.local()
+        if url:
+            import requests
+            self._requests = requests
+        else:
+            from app import app
+            self._app = app
+
+    def send(self, pdf_content: bytes) -> Tuple[int, float]:
+        start = time.perf_counter()
+        if self.url:
+            response = self._requests.post(
+                self.url,
+                files={"resume": ("resume.pdf", pdf_content, "application/pdf")},
+                data={"job_description": JOB_DESCRIPTION},
+                timeout=self.timeout
+            )
+            status = response.status_code
+        else:
+            import io
+            if not hasattr(self._local, "client"):
+                self._local.client = self._app.test_client()
+            response = self._local.client.post(
+                "/process-resume",
+                data={"resume": (io.BytesIO(pdf_content), "resume.pdf"), "job_description": JOB_DESCRIPTION},
+                content_type="multipart/form-data"
+            )
+            status = response.status_code
+            response.close()
+        return status, time.perf_counter() - start
+
+class StepRecorder:
+    """Thread-safe collection of request outcomes for one load step"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.status_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, target: Target, pdf_content: bytes) -> None:
+        try:
+            status, latency = target.send(pdf_content)
+        except Exception as e:
+            status, latency = type(e).__name__, None
+        with self._lock:
+            self.status_counts[str(status)] = self.status_counts.get(str(status), 0) + 1
+            if status == 200:
+                self.latencies.append(latency)
+            else:
+                self.errors += 1
+
+    def report(self, wall_seconds: float, **extra) -> Dict[str, Any]:
+        total = len(self.latencies) + self.errors
+        return {
+            **extra,
+            "requests": total,
+            "errors": self.errors,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+            "throughput_rps": round(len(self.latencies) / wall_seconds, 3) if wall_seconds else 0.0,
+            "wall_seconds": round(wall_seconds, 3),
+            "status_counts": self.status_counts,
+            "latency": summarize(self.latencies)
+        }
+
+def run_closed_step(target: Target, corpus: List[bytes], concurrency: int, requests_per_step: int) -> Dict[str, Any]:
+    """Keep `concurrency` clients busy until `requests_per_step` requests have completed"""
+    recorder = StepRecorder()
+    counter = iter(range(requests_per_step))
+    counter_lock = threading.Lock()
+
+    def client() -> None:
+        while True:
+            with counter_lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            recorder.record(target, corpus[index % len(corpus)])
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder.report(time.perf_counter() - start, concurrency=concurrency)
+
+def run_open_step(target: Target, corpus: List[bytes], rate: float, duration: float,
+                  max_inflight: int, rng: random.Random) -> Dict[str, Any]:
+    """Send Poisson arrivals at `rate` requests/sec for `duration` seconds"""
+    recorder = StepRecorder()
+    futures = []
+    start = time.perf_counter()
+    next_arrival = start
+    index = 0
+
+    with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+        while next_arrival - start < duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(recorder.record, target, corpus[index % len(corpus)]))
+            index += 1
+            next_arrival += rng.expovariate(rate)
+        wait(futures)
+
+    return recorder.report(time.perf_counter() - start, offered_rps=rate)
+
+def find_knee(steps: List[Dict[str, Any]], mode: str, min_gain: float, max_error_rate: float) -> Optional[Dict[str, Any]]:
+    """
+    Return the last step before saturation.
+
+    Closed loop: saturation is the first step whose throughput improves by less
+    than `min_gain` over the previous one. Open loop: it is the first step that
+    achieves less than (1 - min_gain) of its offered rate. In both modes an
+    error rate above `max_error_rate` also counts as saturated.
+    """
+    previous = None
+    for step in steps:
+        saturated = step["error_rate"] > max_error_rate
+        if mode == "closed" and previous:
+            saturated = saturated or step["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain)
+        if mode == "open":
+            saturated = saturated or step["throughput_rps"] < step["offered_rps"] * (1 - min_gain)
+        if saturated:
+            return previous
+        previous = step
+    return previous
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Endpoint of a running server; default is in-process against app.py")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Closed loop: comma-separated client counts")
+    parser.add_argument("--requests-per-step", type=int, default=40, help="Closed loop: requests per step")
+    parser.add_argument("--rates", default="0.5,1,2,4", help="Open loop: comma-separated arrival rates (req/s)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Open loop: seconds per step")
+    parser.add_argument("--max-inflight", type=int, default=256, help="Open loop: client-side cap on outstanding requests")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout for --url")
+    parser.add_argument("--corpus-size", type=int, default=30)
+    parser.add_argument("--min-work-entries", type=int, default=1)
+    parser.add_argument("--max-work-entries", type=int, default=8)
+    parser.add_argument("--max-extra-links", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="In-process: median fake model latency")
+    parser.add_argument("--latency-distribution", default="lognormal", choices=["fixed", "uniform", "lognormal", "exponential"])
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="In-process: fake model output token rate")
+    parser.add_argument("--knee-min-gain", type=float, default=0.1)
+    parser.add_argument("--knee-max-error-rate", type=float, default=0.01)
+    parser.add_argument("--keep-output", action="store_true", help="In-process: keep the files app.py writes to temp/output")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "temp", "output")
+    existing_outputs = set(os.listdir(output_dir)) if os.path.isdir(output_dir) else set()
+
+    if not args.url:
+        # In-process runs always use the fake model, whatever MODEL_NAME is
+        # set to, so a load test never sends traffic to a paid provider. This
+        # must happen before utils.modelmanager is first imported.
+        os.environ["MODEL_NAME"] = "fake"
+        from benchmarks.synthetic import make_resume_json
+        from utils.modelmanager import MODEL_CONFIGS
+        MODEL_CONFIGS["fake"].update({
+            "latency_ms": args.latency_ms,
+            "latency_distribution": args.latency_distribution,
+            "tokens_per_second": args.tokens_per_second,
+            "canned_response": make_resume_json(args.seed),
+            "seed": args.seed
+        })
+
+    corpus = make_pdf_corpus(
+        args.corpus_size,
+        seed=args.seed,
+        min_work_entries=args.min_work_entries,
+        max_work_entries=args.max_work_entries,
+        max_extra_links=args.max_extra_links
+    )
+    target = Target(args.url, args.timeout)
+    rng = random.Random(args.seed)
+
+    steps = []
+    if args.mode == "closed":
+        for level in args.concurrency.split(","):
+            steps.append(run_closed_step(target, corpus, int(level), args.requests_per_step))
+            print(json.dumps(steps[-1]))
+    else:
+        for rate in args.rates.split(","):
+            steps.append(run_open_step(target, corpus, float(rate), args.duration, args.max_inflight, rng))
+            print(json.dumps(steps[-1]))
+
+    if not args.url and not args.keep_output and os.path.isdir(output_dir):
+        for name in set(os.listdir(output_dir)) - existing_outputs:
+            path = os.path.join(output_dir, name)
+            if os.path.isfile(path):
+                os.remove(path)
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "steps": steps,
+        "knee": find_knee(steps, args.mode, args.knee_min_gain, args.knee_max_error_rate)
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
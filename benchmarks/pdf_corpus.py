@@ -0,0 +1,185 @@
+"""
+Synthetic resume PDFs for the benchmark and load-test scripts.
+
+The PDFs are written by hand (Helvetica text plus URI link annotations) so no
+PDF library is needed to produce them; PyPDF2 extracts both the text and the
+hyperlinks exactly like it does for real uploads.
+"""
+import random
+import textwrap
+from typing import Dict, Any, List, Optional
+
+from benchmarks.synthetic import make_resume_json
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 50
+LINE_HEIGHT = 13
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+WRAP_WIDTH = 95
+SCAN_WIDTH = 1000
+
+def _escape(text: str) -> str:
+    """Escape a string for use as a PDF literal string"""
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def resume_lines(resume: Dict[str, Any]) -> List[str]:
+    """Lay a resume dict out as plain text lines, the way a typical CV reads"""
+    basics = resume["basics"]
+    lines = [basics["name"], basics["label"], f"{basics['email']} | {basics['phone']} | {basics['url']}"]
+    lines += [profile["url"] for profile in basics.get("profiles", [])]
+    lines += ["", "SUMMARY"] + textwrap.wrap(basics["summary"], WRAP_WIDTH)
+
+    lines += ["", "EXPERIENCE"]
+    for job in resume["work"]:
+        lines.append(f"{job['position']} - {job['name']}, {job['location']} ({job['startDate']} - {job['endDate']})")
+        for highlight in job["highlights"]:
+            lines += textwrap.wrap(f"- {highlight}", WRAP_WIDTH)
+
+    lines += ["", "EDUCATION"]
+    for edu in resume["education"]:
+        lines.append(f"{edu['studyType']} {edu['area']}, {edu['institution']} ({edu['startDate']} - {edu['endDate']})")
+
+    lines += ["", "PROJECTS"]
+    for project in resume["projects"]:
+        lines.append(project["name"])
+        lines += textwrap.wrap(project["description"], WRAP_WIDTH)
+
+    lines += ["", "SKILLS"]
+    for group in resume["skills"]:
+        lines.append(f"{group['name']}: {', '.join(group['keywords'])}")
+
+    lines += ["", "AWARDS"]
+    for award in resume["awards"]:
+        lines.append(f"{award['title']} - {award['awarder']}")
+    return lines
+
+def build_pdf(lines: List[str], links: Optional[List[str]] = None, scan_bytes: int = 0) -> bytes:
+    """
+    Build a PDF with the given text lines and URI link annotations.
+
+    Args:
+        lines: Text lines, paginated automatically
+        links: URLs to attach as link annotations, spread over the pages
+        scan_bytes: Total size of uncompressed grayscale images drawn behind
+            the text, spread over the pages, to mimic scanned resumes
+
+    Returns:
+        The PDF file content
+    """
+    links = links or []
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    objects = []  # object bodies; object number = index + 1
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # patched below
+    page_tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    scan_rng = random.Random(len(lines))
+    page_ids = []
+    for page_index, page_lines in enumerate(pages):
+        text_ops = [f"BT /F1 10 Tf {LINE_HEIGHT} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td"]
+        xobjects = ""
+        if scan_bytes:
+            height = max(1, scan_bytes // len(pages) // SCAN_WIDTH)
+            pixels = scan_rng.randbytes(SCAN_WIDTH * height)
+            image = add(
+                f"<< /Type /XObject /Subtype /Image /Width {SCAN_WIDTH} /Height {height} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Length {len(pixels)} >>\nstream\n".encode("latin-1")
+                + pixels + b"\nendstream"
+            )
+            xobjects = f" /XObject << /Im1 {image} 0 R >>"
+            text_ops.insert(0, f"q {PAGE_WIDTH} 0 0 {PAGE_HEIGHT} 0 0 cm /Im1 Do Q")
+        for line in page_lines:
+            text_ops.append(f"({_escape(line)}) Tj T*")
+        text_ops.append("ET")
+        stream = "\n".join(text_ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+        annot_ids = []
+        for link_index, url in enumerate(links[page_index::len(pages)]):
+            y = PAGE_HEIGHT - MARGIN - LINE_HEIGHT * (link_index + 1)
+            annot_ids.append(add(
+                f"<< /Type /Annot /Subtype /Link /Rect [{MARGIN} {y} {MARGIN + 200} {y + 10}] "
+                f"/Border [0 0 0] /A << /S /URI /URI ({_escape(url)}) >> >>".encode("latin-1")
+            ))
+
+        annots = f" /Annots [{' '.join(f'{i} 0 R' for i in annot_ids)}]" if annot_ids else ""
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {page_tree} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {font} 0 R >>{xobjects} >> /Contents {content} 0 R{annots} >>".encode("latin-1")
+        ))
+
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {page_tree} 0 R >>".encode("latin-1")
+    objects[page_tree - 1] = (
+        f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+    ).encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref_offset)
+    return bytes(output)
+
+def make_resume_pdf(resume: Dict[str, Any], extra_links: int = 0, seed: int = 0, scan_bytes: int = 0) -> bytes:
+    """
+    Render a resume dict as a PDF.
+
+    Args:
+        resume: Resume data in the extraction JSON shape
+        extra_links: Additional portfolio/project links beyond the contact links
+        seed: Seed for the generated link targets
+        scan_bytes: Size of the scanned page images (see build_pdf)
+
+    Returns:
+        The PDF file content
+    """
+    rng = random.Random(seed)
+    basics = resume["basics"]
+    links = [f"mailto:{basics['email']}", basics["url"]] + [p["url"] for p in basics.get("profiles", [])]
+    links += [f"https://github.com/{basics['name'].split()[0].lower()}/repo-{rng.randint(1, 9999)}" for _ in range(extra_links)]
+    return build_pdf(resume_lines(resume), links, scan_bytes)
+
+def make_pdf_corpus(
+    size: int,
+    seed: int = 0,
+    min_work_entries: int = 1,
+    max_work_entries: int = 6,
+    max_extra_links: int = 10
+) -> List[bytes]:
+    """
+    Build a corpus of resume PDFs of varying length and link density.
+
+    Args:
+        size: Number of PDFs
+        seed: Seed for the corpus
+        min_work_entries: Smallest number of work entries per resume
+        max_work_entries: Largest number of work entries per resume
+        max_extra_links: Largest number of extra link annotations per resume
+
+    Returns:
+        List of PDF file contents
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(size):
+        resume = make_resume_json(
+            seed * 100003 + index,
+            work_entries=rng.randint(min_work_entries, max_work_entries),
+            highlights_per_entry=rng.randint(2, 8)
+        )
+        corpus.append(make_resume_pdf(resume, extra_links=rng.randint(0, max_extra_links), seed=index))
+    return corpus
@@ -0,0 +1,36 @@
+"""
+Small statistics helpers shared by the benchmark scripts.
+"""
+import math
+from typing import Dict, List, Sequence
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a sequence (0 for an empty sequence)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(values: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    """Summarize durations in seconds as milliseconds (count, mean, p50, p95, p99, max)"""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * scale, 3),
+        "p50_ms": round(percentile(values, 50) * scale, 3),
+        "p95_ms": round(percentile(values, 95) * scale, 3),
+        "p99_ms": round(percentile(values, 99) * scale, 3),
+        "max_ms": round(max(values) * scale, 3)
+    }
+
+def compare(current: Dict[str, float], baseline: Dict[str, float]) -> Dict[str, str]:
+    """Relative change of every numeric metric present in both summaries"""
+    changes = {}
+    for key, value in current.items():
+        previous = baseline.get(key)
+        if key == "count" or not isinstance(value, (int, float)) or not previous:
+            continue
+        changes[key] = f"{(value - previous) / previous * 100:+.1f}%"
+    return changes
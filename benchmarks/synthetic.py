@@ -0,0 +1,143 @@
+"""
+Deterministic synthetic resume data shared by the benchmark scripts.
+"""
+import random
+from typing import Dict, Any, List
+
+FIRST_NAMES = ["Asha", "Balaji", "Chen", "Diego", "Elif", "Farah", "Goran", "Hana", "Ivan", "Jaya"]
+LAST_NAMES = ["Iyer", "Kumar", "Li", "Lopez", "Demir", "Khan", "Petrov", "Sato", "Novak", "Rao"]
+COMPANIES = ["Entrans Technologies", "Acme Cloud", "Northwind Labs", "Globex Systems", "Initech", "Umbrella Data"]
+POSITIONS = ["Software Engineer", "Backend Developer", "Data Engineer", "ML Engineer", "Platform Engineer"]
+INSTITUTIONS = ["Anna University", "State Technical College", "Prestigious University", "City Institute of Technology"]
+CITIES = [("Chennai", "IN"), ("Berlin", "DE"), ("Austin", "US"), ("Toronto", "CA"), ("Singapore", "SG")]
+TECHNOLOGIES = ["Python", "Django", "Flask", "AWS", "Docker", "Kubernetes", "PostgreSQL", "Redis",
+                "React", "TypeScript", "Kafka", "Spark", "Terraform", "FastAPI", "Go", "Java"]
+VERBS = ["Developed", "Implemented", "Optimized", "Designed", "Led", "Automated", "Migrated", "Built"]
+OUTCOMES = ["reducing latency by {n}%", "improving throughput by {n}%", "cutting costs by {n}%",
+            "increasing test coverage to {n}%", "serving {n}k daily users"]
+
+def make_highlight(rng: random.Random) -> str:
+    """Build a single achievement bullet"""
+    tech_a, tech_b = rng.sample(TECHNOLOGIES, 2)
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(10, 90))
+    return f"{rng.choice(VERBS)} REST APIs using {tech_a} and {tech_b}, {outcome} across core services."
+
+def make_resume_json(seed: int, work_entries: int = 3, highlights_per_entry: int = 5) -> Dict[str, Any]:
+    """
+    Build a synthetic resume in the JSON shape produced by convert_pdf_to_json_schema.
+
+    Args:
+        seed: Seed for the per-resume random generator
+        work_entries: Number of work experience entries
+        highlights_per_entry: Number of bullets per work entry
+
+    Returns:
+        Resume data dict
+    """
+    rng = random.Random(seed)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    username = f"{first}{last}".lower()
+    city, country = rng.choice(CITIES)
+
+    work = []
+    for index in range(work_entries):
+        start_year = 2023 - 2 * (index + 1)
+        work.append({
+            "name": rng.choice(COMPANIES),
+            "position": rng.choice(POSITIONS),
+            "location": city,
+            "startDate": f"{start_year}-{rng.randint(1, 12):02d}",
+            "endDate": "present" if index == 0 else f"{start_year + 2}-{rng.randint(1, 12):02d}",
+            "highlights": [make_highlight(rng) for _ in range(highlights_per_entry)]
+        })
+
+    return {
+        "basics": {
+            "name": f"{first} {last}",
+            "label": rng.choice(POSITIONS),
+            "email": f"{username}@example.com",
+            "phone": f"+91 9{rng.randint(100000000, 999999999)}",
+            "url": f"https://{username}.dev",
+            "summary": " ".join(make_highlight(rng) for _ in range(2)),
+            "location": {"city": city, "countryCode": country},
+            "profiles": [
+                {"network": "LinkedIn", "username": username, "url": f"https://www.linkedin.com/in/{username}/"},
+                {"network": "GitHub", "username": username, "url": f"https://github.com/{username}"}
+            ]
+        },
+        "work": work,
+        "education": [{
+            "institution": rng.choice(INSTITUTIONS),
+            "area": "Computer Science",
+            "studyType": "BE",
+            "startDate": "2015-08",
+            "endDate": "2019-05",
+            "courses": ["Data Structures", "Distributed Systems"]
+        }],
+        "skills": [
+            {"name": "Technical Languages", "keywords": rng.sample(TECHNOLOGIES, 4)},
+            {"name": "Tools", "keywords": rng.sample(TECHNOLOGIES, 4)},
+            {"name": "Methodology", "keywords": ["Agile", "TDD", "Code Review"]},
+            {"name": "Soft Skills", "keywords": ["Mentoring", "Communication"]}
+        ],
+        "projects": [
+            {"name": f"Project {rng.choice(TECHNOLOGIES)}", "description": make_highlight(rng),
+             "startDate": "2022-01", "endDate": "2022-06"}
+            for _ in range(rng.randint(1, 3))
+        ],
+        "publications": [],
+        "awards": [{"title": "Hackathon Winner", "awarder": rng.choice(COMPANIES)}]
+    }
+
+def make_corpus(size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Build a list of synthetic resumes with varying sizes"""
+    rng = random.Random(seed)
+    return [
+        make_resume_json(seed * 100003 + index, work_entries=rng.randint(1, 6), highlights_per_entry=rng.randint(2, 6))
+        for index in range(size)
+    ]
+
+JD_ABOUT = [
+    "{company} is a fast-growing company building products used by millions of people every day.",
+    "Our mission is to make data infrastructure simple, reliable and affordable for teams of every size.",
+    "We value ownership, curiosity and kindness, and we believe the best ideas can come from anyone.",
+    "You will join a distributed team spread across several time zones with a strong writing culture.",
+]
+JD_REQUIREMENTS = [
+    "{years}+ years of experience building production services in {tech_a} and {tech_b}.",
+    "Strong proficiency with {tech_a} and hands-on experience operating {tech_b} at scale.",
+    "Experience with {tech_a}, {tech_b} and event-driven architectures.",
+    "Knowledge of {tech_a} internals and familiarity with {tech_b} deployment pipelines.",
+    "Ability to mentor engineers and lead design reviews for {tech_a} services.",
+]
+JD_BENEFITS = [
+    "Competitive salary, equity and an annual learning budget.",
+    "Remote-friendly work with quarterly in-person offsites.",
+    "Comprehensive health insurance for you and your family, plus generous parental leave.",
+    "Thirty days of paid time off and a flexible public holiday policy.",
+]
+
+def make_job_description(seed: int, paragraphs: int = 3) -> str:
+    """
+    Build a synthetic job posting: title, company blurb, requirements and benefits.
+
+    Args:
+        seed: Seed for the per-posting random generator
+        paragraphs: How many times the blurb/requirements/benefits block repeats;
+            each adds roughly 250 tokens
+
+    Returns:
+        Job description text
+    """
+    rng = random.Random(seed)
+    company = rng.choice(COMPANIES)
+    lines = [f"{rng.choice(['Senior', 'Staff', 'Lead', ''])} {rng.choice(POSITIONS)}".strip(), ""]
+    for _ in range(paragraphs):
+        lines.append(" ".join(sentence.format(company=company) for sentence in rng.sample(JD_ABOUT, 3)))
+        lines.append("Requirements:")
+        for template in rng.sample(JD_REQUIREMENTS, 4):
+            tech_a, tech_b = rng.sample(TECHNOLOGIES, 2)
+            lines.append("- " + template.format(years=rng.randint(2, 8), tech_a=tech_a, tech_b=tech_b))
+        lines.append("Benefits: " + " ".join(rng.sample(JD_BENEFITS, 3)))
+        lines.append("")
+    return "\n".join(lines)
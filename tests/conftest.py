@@ -0,0 +1,6 @@
+import os
+
+# Tests never reach a real provider, and a shared cache left by an earlier run
+# must not answer for the code under test
+os.environ["MODEL_NAME"] = "fake"
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
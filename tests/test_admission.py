@@ -0,0 +1,94 @@
+import io
+import threading
+import time
+
+import pytest
+
+from utils import admission
+from utils.admission import AdmissionController, AdmissionRejected
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.001)
+
+def test_full_queue_is_rejected():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5, key_limit=10)
+    running = controller.acquire("a")
+    queued = threading.Thread(target=lambda: controller.release(controller.acquire("b")))
+    queued.start()
+    wait_for(lambda: controller.snapshot()["waiting"] == 1)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("c")
+    assert rejected.value.reason == "queue_full"
+    # Nothing has completed yet, so the queue timeout is the best guess
+    assert rejected.value.retry_after == 5
+
+    controller.release(running)
+    queued.join()
+    assert controller.snapshot()["completed"] == 2
+
+def test_queued_request_times_out():
+    controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=0.05, key_limit=10)
+    running = controller.acquire("a")
+    start = time.monotonic()
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("b")
+    assert rejected.value.reason == "timeout"
+    assert time.monotonic() - start >= 0.05
+    snapshot = controller.snapshot()
+    assert snapshot["waiting"] == 0 and snapshot["rejected_timeout"] == 1
+    controller.release(running)
+
+def test_key_quota_applies_per_key():
+    controller = AdmissionController(max_in_flight=8, max_queue=8, queue_timeout=1, key_limit=2)
+    tickets = [controller.acquire("key:a"), controller.acquire("key:a")]
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("key:a")
+    assert rejected.value.reason == "key_quota"
+    # Other keys are unaffected, and a released slot is available to the key again
+    tickets.append(controller.acquire("key:b"))
+    controller.release(tickets.pop(0))
+    tickets.append(controller.acquire("key:a"))
+    for ticket in tickets:
+        controller.release(ticket)
+
+def test_retry_after_follows_drain_rate():
+    controller = AdmissionController(max_in_flight=2, max_queue=0, queue_timeout=30, key_limit=10)
+    tickets = [controller.acquire("a"), controller.acquire("b")]
+    # Two slots at 4 s each drain one request every 2 s
+    controller._service_time = 4.0
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("c")
+    assert rejected.value.reason == "queue_full"
+    assert rejected.value.retry_after == 2
+    for ticket in tickets:
+        controller.release(ticket)
+
+@pytest.fixture
+def client():
+    import app as app_module
+    return app_module.app.test_client()
+
+def test_rejection_is_a_429_with_retry_after(client, monkeypatch):
+    import app as app_module
+    controller = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=30, key_limit=10)
+    controller._service_time = 7.0
+    monkeypatch.setattr(app_module, "get_admission_controller", lambda: controller)
+    running = controller.acquire("elsewhere")
+
+    response = client.post("/process-resume", data={"resume": (io.BytesIO(b"%PDF-1.4"), "r.pdf")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+    assert response.get_json()["reason"] == "queue_full"
+    controller.release(running)
+
+def test_unknown_api_key_is_a_401(client, monkeypatch):
+    monkeypatch.setattr(admission, "API_KEYS", frozenset({"good"}))
+    assert client.get("/templates", headers={"X-API-Key": "guessed"}).status_code == 401
+    assert client.get("/templates", headers={"X-API-Key": "good"}).status_code == 200
+    assert client.get("/templates").status_code == 200
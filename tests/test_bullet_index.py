@@ -0,0 +1,70 @@
+import pytest
+
+from utils import bullet_index
+from utils.bullet_index import BulletReuseStore, apply_bullet_reuse, restore_bullet_reuse
+
+KEY = "software_engineer:test"
+MIGRATION = "Led the Kubernetes migration of 12 billing services, cutting deploy time by 60%"
+MENTORING = "Mentored 4 junior engineers, halving review turnaround"
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch):
+    monkeypatch.setattr(bullet_index, "BULLET_REUSE_ENABLED", True)
+    store = BulletReuseStore(threshold=0.7)
+    monkeypatch.setattr(bullet_index, "_store", store)
+    store.add(KEY, "Led the migration of billing services to Kubernetes", MIGRATION)
+    store.add(KEY, "Mentored four junior engineers on code review", MENTORING)
+    return store
+
+RESUME = {
+    "work": [
+        {"name": "Acme", "highlights": ["Built an internal metrics dashboard",
+                                        "Led the migration of billing services to Kubernetes",
+                                        "Wrote the on-call runbook"]},
+        {"name": "Globex", "highlights": ["Mentored four junior engineers on code review"]}
+    ],
+    "skills": [{"name": "Python"}]
+}
+
+def test_reused_bullet_is_restored_at_its_original_index(store):
+    reduced, plan = apply_bullet_reuse(RESUME, KEY)
+    # Globex is fully reused and not sent; Acme is sent with its novel bullets only
+    assert reduced["work"] == [{"name": "Acme", "highlights": ["Built an internal metrics dashboard",
+                                                               "Wrote the on-call runbook"]}]
+    assert (plan.reused_bullets, plan.novel_bullets) == (2, 2)
+
+    enhanced = {"work": [{"name": "Acme", "highlights": ["Built a metrics dashboard used by 40 teams",
+                                                         "Wrote the on-call runbook, cutting MTTR by 30%"]}],
+                "skills": RESUME["skills"]}
+    restored = restore_bullet_reuse(enhanced, plan)
+    assert restored["work"] == [
+        {"name": "Acme", "highlights": ["Built a metrics dashboard used by 40 teams",
+                                        MIGRATION,
+                                        "Wrote the on-call runbook, cutting MTTR by 30%"]},
+        {"name": "Globex", "highlights": [MENTORING]}
+    ]
+    # The novel bullets were indexed for the next resume
+    assert store.stats["inserts"] == 4
+
+@pytest.mark.parametrize("enhanced_work, expected_acme, expected_degraded", [
+    # Wrapped as {section: [...]}, unwrapped and restored
+    ({"work": [{"name": "Acme", "highlights": ["Dashboard+", "Runbook+"]}]},
+     ["Dashboard+", MIGRATION, "Runbook+"], []),
+    # One entry sent, two returned: the sent entry keeps its original bullets
+    ([{"name": "Acme", "highlights": ["Dashboard+"]}, {"name": "Extra", "highlights": ["Invented"]}],
+     RESUME["work"][0]["highlights"], ["work"]),
+    # Not a list at all
+    ("Sorry, I cannot help with that", RESUME["work"][0]["highlights"], ["work"])
+])
+def test_enhanced_section_shapes(store, enhanced_work, expected_acme, expected_degraded):
+    _, plan = apply_bullet_reuse(RESUME, KEY)
+    inserts = store.stats["inserts"]
+    degraded = []
+    restored = restore_bullet_reuse({"work": enhanced_work}, plan, degraded)
+
+    assert restored["work"][0]["highlights"] == expected_acme
+    # The fully reused entry keeps its reused bullets either way
+    assert restored["work"][1]["highlights"] == [MENTORING]
+    assert degraded == expected_degraded
+    # Nothing is learned from a section that could not be matched up
+    assert store.stats["inserts"] == inserts + (0 if expected_degraded else 2)
@@ -0,0 +1,50 @@
+import pytest
+
+from utils import contacts
+from utils.contacts import extract_contacts, extract_phone, merge_profiles
+
+LINKEDIN = {"network": "LinkedIn", "username": "jane-doe", "url": "https://www.linkedin.com/in/jane-doe"}
+GITHUB = {"network": "GitHub", "username": "janedoe", "url": "https://github.com/janedoe"}
+
+@pytest.fixture(autouse=True)
+def no_default_region(monkeypatch):
+    monkeypatch.setattr(contacts, "PHONE_DEFAULT_REGION", None)
+
+@pytest.mark.parametrize("text, links, expected", [
+    # Only in a tel: link
+    ("Jane Doe | Call me", ["tel:+16502530000"], "+1 650-253-0000"),
+    # The link wins over a number in the text
+    ("Phone: +44 20 7946 0018", ["https://janedoe.dev", "tel:+1 650 253 0000"], "+1 650-253-0000"),
+    ("Phone: +44 20 7946 0018", [], "+44 20 7946 0018"),
+    # An invalid link falls back to the text
+    ("Phone: +44 20 7946 0018", ["tel:12"], "+44 20 7946 0018"),
+    # Without a default region a national number is not guessed
+    ("Phone: 650 253 0000", [], None)
+])
+def test_extract_phone(text, links, expected):
+    assert extract_phone(text, links) == expected
+
+def test_extract_contacts_consumes_matched_links():
+    text = "Jane Doe\nhttps://janedoe.dev | Jane@Example.com | github.com/janedoe\n\nExperience\nAcme"
+    hyperlinks = [{"url": "https://www.linkedin.com/in/jane-doe/", "page": 0},
+                  {"url": "tel:+1 650 253 0000", "page": 0},
+                  {"url": "https://github.com/janedoe/resume-builder", "page": 1}]
+    found, remaining = extract_contacts(text, hyperlinks)
+    assert found == {"email": "Jane@example.com", "phone": "+1 650-253-0000",
+                     "url": "https://janedoe.dev", "profiles": [LINKEDIN, GITHUB]}
+    # A repository link is not a profile and is left for the model
+    assert remaining == [hyperlinks[2]]
+
+@pytest.mark.parametrize("model_profiles, local_profiles, expected", [
+    # The local profile replaces the model's on the same network, case-insensitively
+    ([{"network": "linkedin", "username": "jane", "url": "linkedin.com/in/jane"}], [LINKEDIN], [LINKEDIN]),
+    # Networks only the model found are kept, in its order, local-only ones appended
+    ([{"network": "Kaggle", "username": "jd"}, {"network": "GitHub", "username": "jd"}], [GITHUB, LINKEDIN],
+     [{"network": "Kaggle", "username": "jd"}, GITHUB, LINKEDIN]),
+    # A missing or malformed model answer leaves the local profiles
+    (None, [GITHUB], [GITHUB]),
+    (["github.com/jd"], [GITHUB], ["github.com/jd", GITHUB]),
+    ([{"network": "GitHub", "username": "jd"}], [], [{"network": "GitHub", "username": "jd"}])
+])
+def test_merge_profiles(model_profiles, local_profiles, expected):
+    assert merge_profiles(model_profiles, local_profiles) == expected
@@ -0,0 +1,65 @@
+import os
+import json
+
+import pytest
+import yaml
+
+from utils.converter import EnhancedJSONToConfigConverter, convert_many
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# An enhanced resume and the configuration rendered from it
+SAMPLE_JSON = os.path.join(BASE_DIR, 'temp', 'output', 'c51aa556-c6be-4bdf-9859-f46a1ae67c4c.json')
+SAMPLE_CONFIG = os.path.join(BASE_DIR, 'temp', 'output', '7b636e2e-66f5-4e56-af44-88af5487cd99_resume.yaml')
+
+@pytest.fixture
+def sample():
+    with open(SAMPLE_JSON, encoding='utf-8') as f:
+        return json.load(f)
+
+@pytest.fixture
+def expected_config():
+    with open(SAMPLE_CONFIG, encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+def test_converts_sample_resume(sample, expected_config):
+    config = EnhancedJSONToConfigConverter(sample).convert()
+
+    # The sample configuration predates deterministic tags, which are now the
+    # first three distinct capitalized terms, acronyms or quoted terms
+    assert [job.pop("tags") for job in config["jobs"]] == [["Implemented", "RAG", "AI"]]
+    for job in expected_config["jobs"]:
+        del job["tags"]
+    assert config == expected_config
+
+def test_converts_sections():
+    config = EnhancedJSONToConfigConverter({
+        "basics": {"name": "Jane Doe", "label": "Engineer", "url": "https://janedoe.dev",
+                   "location": {"city": "Berlin"},
+                   "profiles": [{"network": "GitHub", "username": "janedoe", "url": "https://github.com/janedoe"}]},
+        "work": [{"name": "Acme Corp", "position": "Engineer", "startDate": "2020-03", "endDate": "Present",
+                  "highlights": ["Moved \"billing\" to Kubernetes"]}],
+        "education": {"education": [{"institution": "TU Berlin", "studyType": "MSc", "date": "June 2019"}]},
+        "skills": [{"name": "Tools", "keywords": ["Docker"]}, {"name": "Soft skills", "keywords": ["Mentoring"]}],
+        "certifications": [{"title": "CKA", "awarder": "CNCF"}]
+    }).convert()
+
+    assert config["contacts"]["address"] == "Berlin"
+    assert config["contacts"]["github"] == {"url": "https://github.com/janedoe", "displayText": "@janedoe"}
+    assert config["contacts"]["website"] == {"url": "https://janedoe.dev", "displayText": "janedoe.dev"}
+    job = config["jobs"][0]
+    assert (job["from"], job["to"], job["tags"]) == ("2020 Mar.", "present", ["Moved", "billing", "Kubernetes"])
+    assert job["company"]["link"] == "https://acmecorp.com/"
+    education = config["education"][0]
+    assert (education["degree"], education["from"], education["to"]) == ("MSc", "2019", "2019")
+    assert (config["tools"], config["skills"]) == (["Docker"], ["Mentoring"])
+    assert config["achievements"] == [{"name": "CKA", "description": "Issued by CNCF"}]
+
+def test_convert_many_skips_errors(sample):
+    resumes = [sample, {"basics": "Jane Doe"}, {}]
+    with pytest.raises(AttributeError):
+        convert_many(resumes)
+
+    configs = convert_many(resumes, skip_errors=True)
+    assert configs[1] is None
+    assert configs[0]["contacts"]["name"] == "Balaji V"
+    assert configs[2]["contacts"]["name"] == "" and configs[2]["jobs"] == []
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+from typing import Callable, List
+
+import pytest
+
+from utils import scheduler
+from utils.scheduler import FairScheduler, BULK, INTERACTIVE, set_work_class
+
+MODES = ("async", "sync")
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(scheduler, "SCHEDULER_ENABLED", True)
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.001)
+
+def waiting(pool: FairScheduler, priority: str) -> int:
+    return pool.snapshot()["classes"][priority]["waiting"]
+
+def running(pool: FairScheduler, priority: str) -> int:
+    return pool.snapshot()["classes"][priority]["running"]
+
+def start_worker(pool: FairScheduler, mode: str, priority: str, tenant: str,
+                 body: Callable[[], None]) -> threading.Thread:
+    """Run `body` inside a slot on a thread of its own, through slot() or slot_sync()"""
+    def run_sync() -> None:
+        set_work_class(priority, tenant)
+        with pool.slot_sync():
+            body()
+
+    async def run_async() -> None:
+        set_work_class(priority, tenant)
+        async with pool.slot():
+            await asyncio.to_thread(body)
+
+    thread = threading.Thread(target=run_sync if mode == "sync" else lambda: asyncio.run(run_async()))
+    thread.start()
+    return thread
+
+def hold_slot(pool: FairScheduler, mode: str, priority: str = INTERACTIVE):
+    """Occupy one slot until the returned event is set"""
+    release = threading.Event()
+    thread = start_worker(pool, mode, priority, "holder", lambda: release.wait(5))
+    return release, thread
+
+@pytest.mark.parametrize("mode", MODES)
+def test_tenants_share_slots_in_turn(mode):
+    pool = FairScheduler("test", capacity=1)
+    release, holder = hold_slot(pool, mode)
+    wait_for(lambda: running(pool, INTERACTIVE) == 1)
+
+    order: List[str] = []
+    threads = []
+    for tenant, count in (("heavy", 8), ("light", 3)):
+        for _ in range(count):
+            threads.append(start_worker(pool, mode, INTERACTIVE, tenant, lambda t=tenant: order.append(t)))
+    wait_for(lambda: waiting(pool, INTERACTIVE) == 11)
+    release.set()
+    for thread in [holder, *threads]:
+        thread.join()
+
+    # The light tenant is served every other slot until it runs out, however
+    # many calls the heavy tenant has queued
+    assert order[:6] in (["heavy", "light"] * 3, ["light", "heavy"] * 3)
+    assert order[6:] == ["heavy"] * 5
+
+@pytest.mark.parametrize("mode", MODES)
+def test_bulk_lane_stays_within_its_share(mode):
+    pool = FairScheduler("test", capacity=4, bulk_max_share=0.75)
+    release = threading.Event()
+    peak = {"bulk": 0}
+
+    def bulk_work() -> None:
+        peak["bulk"] = max(peak["bulk"], running(pool, BULK))
+        release.wait(5)
+
+    threads = [start_worker(pool, mode, BULK, f"recruiter-{i % 2}", bulk_work) for i in range(6)]
+    wait_for(lambda: running(pool, BULK) == 3 and waiting(pool, BULK) == 3)
+
+    # The slot bulk may not take stays free for interactive work, which
+    # runs while every bulk call still holds its slot
+    interactive_done = threading.Event()
+    threads.append(start_worker(pool, mode, INTERACTIVE, "user", interactive_done.set))
+    assert interactive_done.wait(5)
+    assert running(pool, BULK) == 3
+
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert peak["bulk"] == 3
+    assert pool.snapshot()["classes"][BULK]["granted"] == 6
+
+@pytest.mark.parametrize("mode", MODES)
+def test_cancelled_waiter_is_withdrawn(mode):
+    pool = FairScheduler("test", capacity=1)
+    release, holder = hold_slot(pool, mode)
+    wait_for(lambda: running(pool, INTERACTIVE) == 1)
+
+    async def cancelled_waiter() -> None:
+        set_work_class(INTERACTIVE, "impatient")
+        # wait_for cancels the slot() still waiting when its timeout expires
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.slot().__aenter__(), 0.05)
+
+    asyncio.run(cancelled_waiter())
+    assert waiting(pool, INTERACTIVE) == 0
+
+    # The next waiter, through either interface, gets the slot the withdrawn one never took
+    served = threading.Event()
+    worker = start_worker(pool, mode, INTERACTIVE, "patient", served.set)
+    wait_for(lambda: waiting(pool, INTERACTIVE) == 1)
+    release.set()
+    assert served.wait(5)
+    for thread in (holder, worker):
+        thread.join()
+    assert running(pool, INTERACTIVE) == 0
+
+@pytest.mark.parametrize("mode", MODES)
+def test_waiter_cancelled_after_grant_returns_the_slot(mode):
+    pool = FairScheduler("test", capacity=1)
+    next_served = threading.Event()
+    worker = None
+
+    async def scenario() -> None:
+        nonlocal worker
+        set_work_class(INTERACTIVE, "holder")
+        holder = pool.slot()
+        await holder.__aenter__()
+
+        async def wait_for_slot() -> None:
+            set_work_class(INTERACTIVE, "granted-then-cancelled")
+            async with pool.slot():
+                raise AssertionError("cancelled before it could run")
+
+        task = asyncio.create_task(wait_for_slot())
+        await asyncio.sleep(0)
+        assert waiting(pool, INTERACTIVE) == 1
+        worker = start_worker(pool, mode, INTERACTIVE, "next", next_served.set)
+        await asyncio.to_thread(wait_for, lambda: waiting(pool, INTERACTIVE) == 2)
+        # Releasing grants the slot to the task, which is cancelled before it wakes
+        await holder.__aexit__(None, None, None)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert next_served.wait(5)
+    worker.join()
+    assert running(pool, INTERACTIVE) == 0
@@ -0,0 +1,55 @@
+import pytest
+
+from utils.section_planner import EnhancementCall, _pack_sections, merge_call_results
+
+RESUME = {
+    "work": [{"name": "Acme"}, {"name": "Globex"}, {"name": "Initech"}],
+    "skills": [{"name": "Python"}],
+    "awards": [{"title": "Best paper"}]
+}
+
+@pytest.mark.parametrize("sizes, capacity, max_sections, expected", [
+    # First fit, largest first
+    ([("a", 5), ("b", 4), ("c", 3), ("d", 2)], 7, 3, [["a", "d"], ["b", "c"]]),
+    # Capacity allows everything together, the section limit does not
+    ([("a", 1), ("b", 1), ("c", 1), ("d", 1)], 100, 2, [["a", "b"], ["c", "d"]]),
+    # A section larger than capacity still gets a call of its own
+    ([("big", 50), ("small", 5)], 10, 3, [["big"], ["small"]]),
+    ([], 10, 3, [])
+])
+def test_pack_sections(sizes, capacity, max_sections, expected):
+    calls = _pack_sections(sizes, capacity, max_sections)
+    assert [call.sections for call in calls] == expected
+    assert [call.tokens for call in calls] == [sum(dict(sizes)[name] for name in group) for group in expected]
+
+@pytest.mark.parametrize("calls, results, expected_work, expected_degraded", [
+    # Entry slices merged in entry order, one wrapped as {section: [...]}
+    ([EnhancementCall(["work"], 10, (1, 3)), EnhancementCall(["work"], 10, (0, 1))],
+     [{"work": [{"name": "Globex+"}, {"name": "Initech+"}]}, [{"name": "Acme+"}]],
+     [{"name": "Acme+"}, {"name": "Globex+"}, {"name": "Initech+"}], []),
+    # A whole section wrapped as {section: [...]}
+    ([EnhancementCall(["work"], 10)],
+     [{"work": [{"name": "Acme+"}]}],
+     [{"name": "Acme+"}], []),
+    # A slice with the wrong number of entries keeps its original entries
+    ([EnhancementCall(["work"], 10, (0, 2)), EnhancementCall(["work"], 10, (2, 3))],
+     [[{"name": "Acme+"}], [{"name": "Initech+"}]],
+     [{"name": "Acme"}, {"name": "Globex"}, {"name": "Initech+"}], ["work"]),
+    # So does a failed slice
+    ([EnhancementCall(["work"], 10, (0, 3))], [None], RESUME["work"], ["work"])
+])
+def test_merge_entry_results(calls, results, expected_work, expected_degraded):
+    degraded = []
+    merged = merge_call_results(RESUME, calls, results, degraded)
+    assert merged["work"] == expected_work
+    assert degraded == expected_degraded
+    # Sections no call was planned for keep their original content
+    assert merged["skills"] == RESUME["skills"]
+
+def test_merge_batch_keeps_missing_sections():
+    calls = [EnhancementCall(["skills", "awards"], 10)]
+    degraded = []
+    merged = merge_call_results(RESUME, calls, [{"skills": [{"name": "Python 3"}]}], degraded)
+    assert merged["skills"] == [{"name": "Python 3"}]
+    assert merged["awards"] == RESUME["awards"]
+    assert degraded == ["awards"]
@@ -0,0 +1,67 @@
+import pytest
+
+from utils import segmenter
+from utils.segmenter import classify_heading, plan_extraction_segments, split_sections
+
+@pytest.fixture(autouse=True)
+def small_segments(monkeypatch):
+    monkeypatch.setattr(segmenter, "SEGMENTED_EXTRACTION", True)
+    monkeypatch.setattr(segmenter, "SEGMENT_MIN_CHARS", 200)
+
+WORK = "Acme Corp, Senior Engineer, 2019-2024\n" + "- Built and ran the billing platform\n" * 8
+PROJECTS = "resume-builder: turns PDFs into typeset resumes\n" * 6
+RESUME = (
+    "Jane Doe\njane@example.com\n\n"
+    "Professional Summary\nBackend engineer.\n\n"
+    "WORK EXPERIENCE:\n" + WORK + "\n"
+    "Education & Training\nBSc Computer Science, 2015\n\n"
+    "Open Source Projects\n" + PROJECTS + "\n"
+    "Languages\nEnglish, French\n"
+)
+
+@pytest.mark.parametrize("line, expected", [
+    ("Experience", "work"),
+    ("WORK EXPERIENCE:", "work"),
+    ("  Professional Summary  ", "basics"),
+    ("Education & Training", "education"),
+    ("Awards and Honours", "awards"),
+    ("Tools & Technologies", "skills"),
+    ("Languages", "other"),
+    ("Experience building distributed systems at scale for ten years", None),
+    ("Acme Corp", None),
+    ("", None)
+])
+def test_classify_heading(line, expected):
+    assert classify_heading(line) == expected
+
+def test_split_sections_keeps_header_and_other_text():
+    parts = split_sections(RESUME)
+    assert list(parts) == ["header", "basics", "work", "education", "projects", "other"]
+    assert parts["header"] == "Jane Doe\njane@example.com"
+    assert parts["work"].startswith("WORK EXPERIENCE:\nAcme Corp")
+    assert parts["other"] == "Languages\nEnglish, French"
+
+def test_large_sections_get_their_own_segment():
+    segments = plan_extraction_segments(RESUME, min_chars=100)
+    by_label = {segment.label: segment for segment in segments}
+    assert set(by_label) == {"work", "projects", "basics+education+skills+publications+awards"}
+
+    remainder = by_label["basics+education+skills+publications+awards"]
+    # The remainder carries the header, small sections and unrecognised text
+    for text in ("Jane Doe", "Backend engineer.", "BSc Computer Science", "English, French"):
+        assert text in remainder.text
+    assert "Acme Corp" not in remainder.text and "resume-builder" not in remainder.text
+    assert by_label["work"].text.startswith("WORK EXPERIENCE:")
+    # Largest first
+    assert [len(s.text) for s in segments] == sorted((len(s.text) for s in segments), reverse=True)
+
+@pytest.mark.parametrize("text, min_chars", [
+    # Too short to be worth splitting
+    (RESUME, 100000),
+    # No recognised section is large enough
+    ("Jane Doe\nExperience\nAcme\nEducation\nBSc\n" * 3, 10),
+    # No headings at all
+    ("Jane Doe " * 200, 10)
+])
+def test_single_call_fallback(text, min_chars):
+    assert plan_extraction_segments(text, min_chars=min_chars) is None
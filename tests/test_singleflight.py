@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils import singleflight
+from utils.singleflight import SingleFlight
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(singleflight, "SINGLEFLIGHT_ENABLED", True)
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.001)
+
+def run_in_thread(coroutine_fn, outcomes: dict, name: str) -> threading.Thread:
+    """Run a coroutine on its own thread and event loop, as each request does"""
+    def target():
+        try:
+            outcomes[name] = asyncio.run(coroutine_fn())
+        except BaseException as e:
+            outcomes[name] = e
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread
+
+def test_follower_gets_copy_of_leader_result():
+    group = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.to_thread(release.wait)
+        return {"sections": ["work"]}
+
+    outcomes = {}
+    leader = run_in_thread(lambda: group.do("key", work), outcomes, "leader")
+    wait_for(lambda: group.snapshot()["in_flight"] == 1)
+    follower = run_in_thread(lambda: group.do("key", work), outcomes, "follower")
+    wait_for(lambda: group.stats["coalesced"] == 1)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert calls == [1]
+    assert outcomes["leader"] == outcomes["follower"] == {"sections": ["work"]}
+    assert outcomes["follower"] is not outcomes["leader"]
+    assert group.snapshot() == {"executions": 1, "coalesced": 1, "errors": 0, "in_flight": 0}
+
+def test_cancelled_leader_makes_follower_retry():
+    group = SingleFlight("test")
+    started = threading.Event()
+
+    async def leader_work():
+        started.set()
+        await asyncio.sleep(60)
+
+    async def follower_work():
+        return "follower"
+
+    async def cancelled_leader():
+        task = asyncio.create_task(group.do("key", leader_work))
+        await asyncio.to_thread(wait_for, lambda: group.stats["coalesced"] == 1)
+        task.cancel()
+        await task
+
+    outcomes = {}
+    leader = run_in_thread(cancelled_leader, outcomes, "leader")
+    started.wait(5)
+    follower = run_in_thread(lambda: group.do("key", follower_work), outcomes, "follower")
+    leader.join()
+    follower.join()
+
+    assert isinstance(outcomes["leader"], asyncio.CancelledError)
+    assert outcomes["follower"] == "follower"
+    # The follower re-ran the work as the new leader
+    assert group.stats["executions"] == 2
+
+def test_leader_exception_reaches_every_waiter():
+    group = SingleFlight("test")
+    release = threading.Event()
+
+    async def failing():
+        await asyncio.to_thread(release.wait)
+        raise ValueError("model unavailable")
+
+    outcomes = {}
+    leader = run_in_thread(lambda: group.do("key", failing), outcomes, "leader")
+    wait_for(lambda: group.snapshot()["in_flight"] == 1)
+    followers = [run_in_thread(lambda: group.do("key", failing), outcomes, f"follower{i}") for i in range(3)]
+    wait_for(lambda: group.stats["coalesced"] == 3)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(outcomes) == 4
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes.values())
+    assert group.snapshot() == {"executions": 1, "coalesced": 3, "errors": 1, "in_flight": 0}
+
+def test_do_sync_shares_result_and_exception():
+    group = SingleFlight("test")
+    release = threading.Event()
+    outcomes = {}
+
+    def work():
+        release.wait(5)
+        return ["page"]
+
+    def call(name):
+        outcomes[name] = group.do_sync("key", work)
+
+    threads = [threading.Thread(target=call, args=("leader",))]
+    threads[0].start()
+    wait_for(lambda: group.snapshot()["in_flight"] == 1)
+    threads.append(threading.Thread(target=call, args=("follower",)))
+    threads[1].start()
+    wait_for(lambda: group.stats["coalesced"] == 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes["leader"] == outcomes["follower"] == ["page"]
+    assert outcomes["leader"] is not outcomes["follower"]
+
+def test_content_key_ignores_dict_order():
+    assert singleflight.content_key({"a": 1, "b": 2}) == singleflight.content_key({"b": 2, "a": 1})
+    assert singleflight.content_key("ab", "c") != singleflight.content_key("a", "bc")
@@ -0,0 +1,210 @@
+import os
+import math
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Admission control in front of the pipeline. At most ADMISSION_MAX_IN_FLIGHT
+# requests run at once; up to ADMISSION_MAX_QUEUE more wait in FIFO order for
+# at most ADMISSION_QUEUE_TIMEOUT_SECONDS. Anything beyond that is shed with
+# 429 and a Retry-After computed from how fast the queue is currently
+# draining, as is a request whose predicted wait already exceeds the queue
+# timeout, so admitted requests keep their latency instead of everyone
+# slowing down together. Each API key (or client address, without a key) may
+# hold at most API_KEY_MAX_CONCURRENCY running or queued requests.
+ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv('ADMISSION_MAX_IN_FLIGHT', '8'))
+ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', '16'))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_SECONDS', '10'))
+API_KEY_MAX_CONCURRENCY = int(os.getenv('API_KEY_MAX_CONCURRENCY', '4'))
+API_KEY_HEADER = os.getenv('API_KEY_HEADER', 'X-API-Key')
+# What counts as an API key. With API_KEYS set (comma-separated), only those
+# keys get their own quota and scheduling tenant and any other value is
+# rejected with 401. Without it the header is taken as is, which is only
+# safe behind a gateway that authenticates it: otherwise a client can rotate
+# the header to get a fresh quota on every request.
+API_KEYS = frozenset(key.strip() for key in os.getenv('API_KEYS', '').split(',') if key.strip())
+# Completions within this window set the observed drain rate
+DRAIN_WINDOW_SECONDS = 10.0
+MAX_RETRY_AFTER_SECONDS = 120
+SERVICE_TIME_SMOOTHING = 0.2
+
+class AdmissionRejected(Exception):
+    """A request shed by admission control; answered with 429 and Retry-After"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Server is busy ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class UnknownApiKey(Exception):
+    """An API key header that is not among API_KEYS; answered with 401"""
+
+    def __init__(self):
+        super().__init__(f"Unknown API key in {API_KEY_HEADER}")
+
+def validate_api_key(api_key: str) -> str:
+    """Return the key if it counts as an API key; raises UnknownApiKey"""
+    if API_KEYS and api_key not in API_KEYS:
+        raise UnknownApiKey()
+    return api_key
+
+class AdmissionTicket:
+    """An admitted request; pass it back to release()"""
+    __slots__ = ("key", "admitted_at", "queue_wait")
+
+    def __init__(self, key: str, admitted_at: float, queue_wait: float):
+        self.key = key
+        self.admitted_at = admitted_at
+        self.queue_wait = queue_wait
+
+class AdmissionController:
+    """Bounded in-flight limit with a FIFO wait queue and per-key quotas"""
+
+    def __init__(self,
+                 max_in_flight: int = ADMISSION_MAX_IN_FLIGHT,
+                 max_queue: int = ADMISSION_MAX_QUEUE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+                 key_limit: int = API_KEY_MAX_CONCURRENCY):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.key_limit = key_limit
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting: Deque[object] = deque()
+        self._per_key: Dict[str, int] = {}
+        self._completions: Deque[float] = deque()
+        self._service_time: Optional[float] = None
+        self.stats = {"admitted": 0, "queued": 0, "completed": 0, "rejected_key_quota": 0,
+                      "rejected_queue_full": 0, "rejected_predicted_wait": 0, "rejected_timeout": 0}
+
+    def _drain_rate(self, now: float) -> Optional[float]:
+        """
+        Requests per second leaving the queue, or None before anything completed.
+
+        The completions seen over the recent window, but never less than what
+        every slot busy at the smoothed service time would drain: after an
+        idle spell the window alone would understate it and shed needlessly.
+        """
+        while self._completions and now - self._completions[0] > DRAIN_WINDOW_SECONDS:
+            self._completions.popleft()
+        if self._service_time is None:
+            return None
+        rate = self.max_in_flight / max(self._service_time, 1e-3)
+        if len(self._completions) >= 2:
+            rate = max(rate, len(self._completions) / max(now - self._completions[0], 1e-3))
+        return rate
+
+    def _predicted_wait(self, position: int, now: float) -> Optional[float]:
+        """Seconds until the request at `position` in the queue (1 = head) is admitted"""
+        rate = self._drain_rate(now)
+        return position / rate if rate is not None else None
+
+    def _retry_after(self, position: int, now: float) -> int:
+        predicted = self._predicted_wait(position, now)
+        if predicted is None:
+            predicted = self.queue_timeout
+        return min(MAX_RETRY_AFTER_SECONDS, max(1, math.ceil(predicted)))
+
+    def _reject(self, reason: str, position: int, now: float) -> AdmissionRejected:
+        self.stats[f"rejected_{reason}"] += 1
+        retry_after = self._retry_after(position, now)
+        logger.warning(f"Shedding request ({reason}), in flight {self._in_flight}, "
+                       f"queued {len(self._waiting)}, retry after {retry_after}s")
+        return AdmissionRejected(reason, retry_after)
+
+    def acquire(self, key: str) -> AdmissionTicket:
+        """
+        Admit a request, waiting in the queue if every slot is taken.
+
+        Raises:
+            AdmissionRejected: the key is at its quota, the queue is full, the
+                predicted or actual wait exceeds the queue timeout
+        """
+        start = time.monotonic()
+        with self._cond:
+            if self._per_key.get(key, 0) >= self.key_limit:
+                # Waiting for this key's own requests; one service time is the best guess
+                raise self._reject("key_quota", self.max_in_flight, start)
+
+            if self._in_flight >= self.max_in_flight or self._waiting:
+                position = len(self._waiting) + 1
+                if position > self.max_queue:
+                    raise self._reject("queue_full", position, start)
+                predicted = self._predicted_wait(position, start)
+                if predicted is not None and predicted > self.queue_timeout:
+                    raise self._reject("predicted_wait", position, start)
+
+                token = object()
+                self._waiting.append(token)
+                self._per_key[key] = self._per_key.get(key, 0) + 1
+                self.stats["queued"] += 1
+                deadline = start + self.queue_timeout
+                while self._waiting[0] is not token or self._in_flight >= self.max_in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._waiting.remove(token)
+                        self._release_key(key)
+                        self._cond.notify_all()
+                        raise self._reject("timeout", len(self._waiting) + 1, time.monotonic())
+                    self._cond.wait(remaining)
+                self._waiting.popleft()
+                # The next waiter may fit too if several slots freed at once
+                self._cond.notify_all()
+            else:
+                self._per_key[key] = self._per_key.get(key, 0) + 1
+
+            self._in_flight += 1
+            self.stats["admitted"] += 1
+            now = time.monotonic()
+            return AdmissionTicket(key, now, now - start)
+
+    def _release_key(self, key: str) -> None:
+        count = self._per_key.get(key, 0) - 1
+        if count > 0:
+            self._per_key[key] = count
+        else:
+            self._per_key.pop(key, None)
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        """Free the ticket's slot and record its service time"""
+        now = time.monotonic()
+        with self._cond:
+            self._in_flight -= 1
+            self._release_key(ticket.key)
+            self._completions.append(now)
+            service_time = now - ticket.admitted_at
+            self._service_time = service_time if self._service_time is None else (
+                SERVICE_TIME_SMOOTHING * service_time + (1 - SERVICE_TIME_SMOOTHING) * self._service_time
+            )
+            self.stats["completed"] += 1
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            rate = self._drain_rate(time.monotonic())
+            return {**self.stats, "in_flight": self._in_flight, "waiting": len(self._waiting),
+                    "drain_rate_rps": round(rate, 3) if rate is not None else None,
+                    "service_time_ms": round(self._service_time * 1000, 1) if self._service_time else None}
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """The process-wide controller, or None when ADMISSION_ENABLED is off"""
+    global _controller
+    if not ADMISSION_ENABLED:
+        return None
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController()
+        return _controller
+
+def get_admission_stats() -> Dict[str, Any]:
+    controller = get_admission_controller()
+    return controller.snapshot() if controller is not None else {}
@@ -0,0 +1,338 @@
+import os
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Previously enhanced bullets are reused for near-identical new ones, so
+# only novel bullets are sent to the model. Similarity is the Jaccard index
+# of word shingles; MinHash with LSH banding finds candidates and the exact
+# Jaccard decides. A candidate is only reused if both bullets mention the
+# same numbers and proper nouns, so "using Django, 40%" is never rewritten
+# as "using Flask, 60%". Indexes are kept per template type and job
+# description, since the same bullet is enhanced differently for each.
+BULLET_REUSE_ENABLED = os.getenv('BULLET_REUSE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+BULLET_REUSE_THRESHOLD = float(os.getenv('BULLET_REUSE_THRESHOLD', '0.7'))
+BULLET_SHINGLE_SIZE = int(os.getenv('BULLET_SHINGLE_SIZE', '2'))
+BULLET_INDEX_MAX_ENTRIES = int(os.getenv('BULLET_INDEX_MAX_ENTRIES', '5000'))
+BULLET_INDEX_MAX_KEYS = int(os.getenv('BULLET_INDEX_MAX_KEYS', '64'))
+BULLET_FIELDS = ('highlights',)
+
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+MINHASH_PERMUTATIONS = MINHASH_BANDS * MINHASH_ROWS
+_MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.sha256(f"a{i}".encode()).digest()[:8], 'little') % _MERSENNE_PRIME or 1,
+     int.from_bytes(hashlib.sha256(f"b{i}".encode()).digest()[:8], 'little') % _MERSENNE_PRIME)
+    for i in range(MINHASH_PERMUTATIONS)
+]
+
+_WORD_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#.%/-]*")
+
+def _words(text: str) -> List[str]:
+    return [word.rstrip('.') for word in _WORD_PATTERN.findall(text)]
+
+def shingles(text: str, size: int = BULLET_SHINGLE_SIZE) -> frozenset:
+    """Lowercased word n-grams of a bullet"""
+    words = [word.lower() for word in _words(text)]
+    if len(words) <= size:
+        return frozenset([" ".join(words)])
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+def salient_terms(text: str) -> frozenset:
+    """Numbers and proper nouns/technologies (any capitalized word after the first)"""
+    words = _words(text)
+    return frozenset(
+        word for index, word in enumerate(words)
+        if any(ch.isdigit() for ch in word) or (index > 0 and word[0].isupper()) or any(ch in word for ch in '+#')
+    )
+
+def minhash(shingle_set: frozenset) -> List[int]:
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little') for s in shingle_set]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+def _band_keys(signature: List[int]) -> List[Tuple[int, ...]]:
+    return [(band,) + tuple(signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]) for band in range(MINHASH_BANDS)]
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+class BulletIndex:
+    """MinHash-LSH index of (original bullet -> enhanced bullet) for one key, oldest evicted first"""
+
+    def __init__(self, max_entries: int = BULLET_INDEX_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[frozenset, frozenset, str, List[Tuple[int, ...]], str]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, ...], set] = {}
+        self._exact: Dict[str, int] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, original: str, enhanced: str) -> int:
+        """Index a bullet; returns the number of entries evicted to make room"""
+        if original in self._exact:
+            self._remove(self._exact[original])
+        shingle_set = shingles(original)
+        bands = _band_keys(minhash(shingle_set))
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (shingle_set, salient_terms(original), enhanced, bands, original)
+        self._exact[original] = entry_id
+        for band in bands:
+            self._buckets.setdefault(band, set()).add(entry_id)
+
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            evicted += 1
+        return evicted
+
+    def _remove(self, entry_id: int) -> None:
+        _, _, _, bands, original = self._entries.pop(entry_id)
+        if self._exact.get(original) == entry_id:
+            del self._exact[original]
+        for band in bands:
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[band]
+
+    def query(self, text: str, threshold: float) -> Tuple[Optional[str], bool]:
+        """
+        Find the enhancement of the most similar indexed bullet.
+
+        Returns:
+            (enhanced bullet or None, whether a similar bullet was rejected
+            because its numbers or names differ)
+        """
+        entry_id = self._exact.get(text)
+        if entry_id is not None:
+            return self._entries[entry_id][2], False
+
+        shingle_set = shingles(text)
+        candidates = set()
+        for band in _band_keys(minhash(shingle_set)):
+            candidates.update(self._buckets.get(band, ()))
+        if not candidates:
+            return None, False
+
+        terms = salient_terms(text)
+        best, best_score, rejected = None, threshold, False
+        for candidate in candidates:
+            candidate_shingles, candidate_terms, enhanced, _, _ = self._entries[candidate]
+            score = jaccard(shingle_set, candidate_shingles)
+            if score < best_score:
+                continue
+            if candidate_terms != terms:
+                rejected = True
+                continue
+            best, best_score = enhanced, score
+        return best, rejected and best is None
+
+class BulletReuseStore:
+    """Per-key bullet indexes (least recently used keys evicted) with hit-rate counters"""
+
+    def __init__(self, max_keys: int = BULLET_INDEX_MAX_KEYS, threshold: float = BULLET_REUSE_THRESHOLD):
+        self.max_keys = max_keys
+        self.threshold = threshold
+        self._indexes: "OrderedDict[str, BulletIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "rejected_mismatch": 0,
+                      "inserts": 0, "evicted_entries": 0, "evicted_keys": 0}
+
+    def lookup(self, key: str, text: str) -> Optional[str]:
+        with self._lock:
+            self.stats["lookups"] += 1
+            index = self._indexes.get(key)
+            enhanced, rejected = (None, False) if index is None else index.query(text, self.threshold)
+            if index is not None:
+                self._indexes.move_to_end(key)
+            if enhanced is None:
+                self.stats["misses"] += 1
+                self.stats["rejected_mismatch"] += int(rejected)
+            else:
+                self.stats["hits"] += 1
+            return enhanced
+
+    def add(self, key: str, original: str, enhanced: str) -> None:
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = BulletIndex()
+                while len(self._indexes) > self.max_keys:
+                    self._indexes.popitem(last=False)
+                    self.stats["evicted_keys"] += 1
+            self._indexes.move_to_end(key)
+            self.stats["evicted_entries"] += index.add(original, enhanced)
+            self.stats["inserts"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["lookups"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "keys": len(self._indexes),
+                "entries": sum(len(index) for index in self._indexes.values()),
+                "threshold": self.threshold
+            }
+
+_store = BulletReuseStore()
+
+def get_bullet_index_stats() -> Dict[str, Any]:
+    """Process-wide bullet reuse counters and hit rate"""
+    return _store.snapshot()
+
+def bullet_reuse_key(template_type: str, job_description: Optional[str]) -> str:
+    """Index key for a template type and (digested) job description"""
+    jd_hash = hashlib.sha256((job_description or "").encode('utf-8')).hexdigest()[:16]
+    return f"{template_type}:{jd_hash}"
+
+class ReusePlan:
+    """
+    How a resume was reduced before enhancement and how to restore it.
+
+    For each section with bullets, one item per original entry: either
+    ("reused", entry) for an entry whose bullets were all found in the index,
+    or ("sent", position in the reduced list, original bullets, {bullet index:
+    reused enhancement}) for an entry sent to the model with only its novel
+    bullets. `originals` keeps each such section's original entries, in the
+    same order, as the fallback when the model's section cannot be matched up.
+    """
+    __slots__ = ("key", "sections", "originals", "reused_bullets", "novel_bullets")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.sections: Dict[str, List[Tuple]] = {}
+        self.originals: Dict[str, List[Any]] = {}
+        self.reused_bullets = 0
+        self.novel_bullets = 0
+
+def _bullet_field(entry: Any) -> Optional[str]:
+    if isinstance(entry, dict):
+        for field in BULLET_FIELDS:
+            value = entry.get(field)
+            if isinstance(value, list) and value and all(isinstance(item, str) for item in value):
+                return field
+    return None
+
+def apply_bullet_reuse(resume_data: Dict[str, Any], key: str) -> Tuple[Dict[str, Any], ReusePlan]:
+    """
+    Replace known bullets with their previous enhancements before planning calls.
+
+    Entries whose bullets are all known are taken out of the resume sent to
+    the model; other entries are sent with only their novel bullets.
+
+    Returns:
+        (reduced resume data to enhance, plan for restore_bullet_reuse)
+    """
+    plan = ReusePlan(key)
+    if not BULLET_REUSE_ENABLED:
+        return resume_data, plan
+
+    reduced = dict(resume_data)
+    for section_name, section_data in resume_data.items():
+        if not isinstance(section_data, list) or not any(_bullet_field(entry) for entry in section_data):
+            continue
+        items, sent = [], []
+        for entry in section_data:
+            field = _bullet_field(entry)
+            if field is None:
+                items.append(("sent", len(sent), None, {}))
+                sent.append(entry)
+                continue
+            bullets = entry[field]
+            reused = {}
+            for position, bullet in enumerate(bullets):
+                enhanced = _store.lookup(key, bullet)
+                if enhanced is not None:
+                    reused[position] = enhanced
+            plan.reused_bullets += len(reused)
+            plan.novel_bullets += len(bullets) - len(reused)
+            if len(reused) == len(bullets):
+                items.append(("reused", {**entry, field: [reused[i] for i in range(len(bullets))]}))
+            else:
+                items.append(("sent", len(sent), bullets, reused))
+                sent.append({**entry, field: [b for i, b in enumerate(bullets) if i not in reused]})
+        plan.sections[section_name] = items
+        plan.originals[section_name] = section_data
+        reduced[section_name] = sent
+
+    if plan.reused_bullets:
+        logger.info(f"Reusing {plan.reused_bullets} previously enhanced bullets, {plan.novel_bullets} novel")
+    return reduced, plan
+
+def restore_bullet_reuse(enhanced_data: Dict[str, Any],
+                         plan: ReusePlan,
+                         degraded: Optional[List[str]] = None,
+                         learn: bool = True) -> Dict[str, Any]:
+    """
+    Put reused entries and bullets back in their original positions and index
+    the newly enhanced bullets.
+
+    A sent entry whose enhancement returned a different number of bullets is
+    kept as the model wrote it (its reused bullets are dropped), and is not
+    indexed, since its bullets cannot be paired with the originals. Sections
+    listed in `degraded` are not indexed either, nor is anything when `learn`
+    is false. Only sections present in `enhanced_data` are restored.
+
+    A section wrapped as {section: [...]} is unwrapped first. If it is then
+    not a list with one entry per sent entry, the sent entries keep their
+    original content, reused ones keep their reused bullets, and the section
+    is added to `degraded`.
+    """
+    if not plan.sections:
+        return enhanced_data
+
+    restored = dict(enhanced_data)
+    if degraded is None:
+        degraded = []
+    for section_name, items in plan.sections.items():
+        if section_name not in enhanced_data:
+            continue
+        enhanced_entries = enhanced_data[section_name] or []
+        if isinstance(enhanced_entries, dict) and isinstance(enhanced_entries.get(section_name), list):
+            enhanced_entries = enhanced_entries[section_name]
+        sent_count = sum(1 for item in items if item[0] == "sent")
+        if not isinstance(enhanced_entries, list) or len(enhanced_entries) != sent_count:
+            logger.warning(f"Enhanced {section_name} does not match the {sent_count} entries sent, keeping original entries")
+            restored[section_name] = [item[1] if item[0] == "reused" else original
+                                      for item, original in zip(items, plan.originals[section_name])]
+            if section_name not in degraded:
+                degraded.append(section_name)
+            continue
+        learn_section = learn and section_name not in degraded
+        entries = []
+        for item in items:
+            if item[0] == "reused":
+                entries.append(item[1])
+                continue
+            _, position, bullets, reused = item
+            entry = enhanced_entries[position]
+            field = _bullet_field(entry) if bullets is not None else None
+            if field is None:
+                entries.append(entry)
+                continue
+            novel_positions = [i for i in range(len(bullets)) if i not in reused]
+            new_bullets = entry[field]
+            if len(new_bullets) != len(novel_positions):
+                entries.append(entry)
+                continue
+            merged = dict(reused)
+            for i, bullet in zip(novel_positions, new_bullets):
+                merged[i] = bullet
+                if learn_section:
+                    _store.add(plan.key, bullets[i], bullet)
+            entries.append({**entry, field: [merged[i] for i in range(len(bullets))]})
+        restored[section_name] = entries
+    return restored
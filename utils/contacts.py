@@ -0,0 +1,169 @@
+import os
+import re
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, unquote
+
+import phonenumbers
+from email_validator import validate_email, EmailNotValidError
+
+logger = logging.getLogger(__name__)
+
+# Contact details are recovered from the text and link annotations without
+# the LLM, and removed from what the extraction prompt asks it to generate.
+# Phone numbers without a country code are only parsed when
+# PHONE_DEFAULT_REGION is set, since guessing the region is not deterministic.
+CONTACT_PREEXTRACTION = os.getenv('CONTACT_PREEXTRACTION', 'true').lower() in ('1', 'true', 'yes')
+PHONE_DEFAULT_REGION = os.getenv('PHONE_DEFAULT_REGION', '') or None
+# Links in the first characters of the text are treated as the header, where
+# a personal website would be listed
+HEADER_CHARS = 600
+
+EMAIL_PATTERN = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+URL_PATTERN = re.compile(
+    r'(?:https?://|www\.)[^\s<>()"\']+|\b(?:[a-z0-9-]+\.)+[a-z]{2,}/[^\s<>()"\']+', re.IGNORECASE
+)
+
+# Network name, hosts, and the profile page path whose first group is the
+# username; deeper links (repositories, posts) are left for the LLM
+PROFILE_NETWORKS: List[Tuple[str, Tuple[str, ...], str]] = [
+    ("LinkedIn", ("linkedin.com",), r'^/(?:in|pub)/([^/?#]+)/?$'),
+    ("GitHub", ("github.com",), r'^/([^/?#]+)/?$'),
+    ("GitLab", ("gitlab.com",), r'^/([^/?#]+)/?$'),
+    ("Twitter", ("twitter.com", "x.com"), r'^/@?([^/?#]+)/?$'),
+    ("StackOverflow", ("stackoverflow.com",), r'^/users/\d+/([^/?#]+)/?$'),
+    ("Medium", ("medium.com",), r'^/@([^/?#]+)/?$'),
+    ("Kaggle", ("kaggle.com",), r'^/([^/?#]+)/?$'),
+    ("LeetCode", ("leetcode.com",), r'^/(?:u/)?([^/?#]+)/?$'),
+    ("Behance", ("behance.net",), r'^/([^/?#]+)/?$'),
+    ("Dribbble", ("dribbble.com",), r'^/([^/?#]+)/?$'),
+]
+_PROFILE_PATTERNS = [(network, hosts, re.compile(path)) for network, hosts, path in PROFILE_NETWORKS]
+
+def _normalize_url(url: str) -> str:
+    url = url.strip().rstrip('.,;:)')
+    if not re.match(r'^[a-z][a-z0-9+.-]*:', url, re.IGNORECASE):
+        url = "https://" + url
+    return url
+
+def _host(url: str) -> str:
+    host = urlparse(url).netloc.lower().split('@')[-1].split(':')[0]
+    return host[4:] if host.startswith("www.") else host
+
+def match_profile(url: str) -> Optional[Dict[str, str]]:
+    """Profile entry for a link to a known network, or None"""
+    host = _host(url)
+    for network, hosts, pattern in _PROFILE_PATTERNS:
+        if any(host == h or host.endswith("." + h) for h in hosts):
+            match = pattern.match(urlparse(url).path)
+            if match:
+                username = unquote(match.group(1))
+                return {"network": network, "username": username, "url": url.split('?')[0].rstrip('/')}
+    return None
+
+def extract_email(text: str, links: List[str]) -> Optional[str]:
+    candidates = [link[len("mailto:"):].split('?')[0] for link in links if link.lower().startswith("mailto:")]
+    candidates.extend(EMAIL_PATTERN.findall(text))
+    for candidate in candidates:
+        try:
+            return validate_email(candidate, check_deliverability=False).normalized
+        except EmailNotValidError:
+            continue
+    return None
+
+def extract_phone(text: str, links: List[str]) -> Optional[str]:
+    candidates = [link[len("tel:"):] for link in links if link.lower().startswith("tel:")]
+    for candidate in candidates:
+        try:
+            number = phonenumbers.parse(candidate, PHONE_DEFAULT_REGION)
+            if phonenumbers.is_valid_number(number):
+                return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+        except phonenumbers.NumberParseException:
+            continue
+    for match in phonenumbers.PhoneNumberMatcher(text, PHONE_DEFAULT_REGION, leniency=phonenumbers.Leniency.VALID):
+        return phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+    return None
+
+def extract_contacts(resume_text: str, hyperlinks: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Deterministically extract contact fields for the `basics` section.
+
+    Args:
+        resume_text: Text extracted from the PDF
+        hyperlinks: Link annotations from extract_text_and_hyperlinks
+
+    Returns:
+        (found fields among email, phone, url and profiles; the hyperlinks
+        that were not consumed and still need to go to the LLM)
+    """
+    if not CONTACT_PREEXTRACTION:
+        return {}, hyperlinks
+
+    annotation_urls = [str(link.get("url", "")) for link in hyperlinks]
+    text_urls = URL_PATTERN.findall(resume_text)
+    contacts: Dict[str, Any] = {}
+
+    email = extract_email(resume_text, annotation_urls)
+    if email:
+        contacts["email"] = email
+    phone = extract_phone(resume_text, annotation_urls)
+    if phone:
+        contacts["phone"] = phone
+
+    profiles: List[Dict[str, str]] = []
+    seen_networks = set()
+    consumed = set()
+    header = resume_text[:HEADER_CHARS].lower()
+    website = None
+    for raw_url in annotation_urls + text_urls:
+        if raw_url.lower().startswith(("mailto:", "tel:")):
+            consumed.add(raw_url)
+            continue
+        url = _normalize_url(raw_url)
+        profile = match_profile(url)
+        if profile:
+            consumed.add(raw_url)
+            if profile["network"] not in seen_networks:
+                seen_networks.add(profile["network"])
+                profiles.append(profile)
+        elif website is None and _host(url) and _host(url) in header and urlparse(url).path in ("", "/"):
+            # A bare domain in the header is the candidate's own site
+            website = url.rstrip('/')
+            consumed.add(raw_url)
+
+    if website:
+        contacts["url"] = website
+    if profiles:
+        contacts["profiles"] = profiles
+
+    remaining = [link for link in hyperlinks if str(link.get("url", "")) not in consumed]
+    return contacts, remaining
+
+def prefilled_fields(contacts: Dict[str, Any]) -> List[str]:
+    """Basics fields the model need not generate; profiles stay requested for networks found only by the model"""
+    return [field for field in contacts if field != "profiles"]
+
+def known_networks(contacts: Dict[str, Any]) -> List[str]:
+    """Networks whose profiles were extracted locally"""
+    return [profile["network"] for profile in contacts.get("profiles", [])]
+
+def merge_profiles(model_profiles: Any, local_profiles: List[Dict[str, str]]) -> List[Any]:
+    """The model's profiles with those on locally matched networks replaced, plus the remaining local ones"""
+    local_by_network = {profile["network"].lower(): profile for profile in local_profiles}
+    merged = []
+    for profile in model_profiles if isinstance(model_profiles, list) else []:
+        network = str(profile.get("network", "")).lower() if isinstance(profile, dict) else ""
+        merged.append(local_by_network.pop(network, profile))
+    merged.extend(local_by_network.values())
+    return merged
+
+def merge_contacts(resume_json: Dict[str, Any], contacts: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay locally extracted contact fields on the LLM's `basics`; profiles are merged by network"""
+    if not contacts:
+        return resume_json
+    basics = resume_json.get("basics")
+    if not isinstance(basics, dict):
+        basics = resume_json["basics"] = {}
+    for field, value in contacts.items():
+        basics[field] = merge_profiles(basics.get("profiles"), value) if field == "profiles" else value
+    return resume_json
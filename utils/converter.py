@@ -0,0 +1,379 @@
+import re
+import random
+import logging
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Patterns are compiled once at import time; the converter runs for every
+# rendered resume and bulk jobs convert thousands of them per batch.
+TAG_PATTERN = re.compile(r'\b([A-Z][a-zA-Z]+)\b|\b([A-Z][A-Z]+)\b|"([^"]+)"')
+YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
+
+MONTH_ABBREVIATIONS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                       "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+DEFAULT_OBJECTIVE = "Seeking to leverage my skills and experience to contribute to innovative projects and advance my career in a dynamic environment."
+
+DEFAULT_TECHNICAL_EXPERTISE = (
+    ("Skill 1", 4),
+    ("Skill 2", 5)
+)
+
+class JobRecord:
+    """A single entry of the jobs section"""
+    __slots__ = ("position", "company_name", "company_slug", "description", "start", "end", "location", "tags")
+
+    def __init__(self, position: str, company_name: str, description: List[str],
+                 start: str, end: str, location: str, tags: List[str]):
+        self.position = position
+        self.company_name = company_name
+        self.company_slug = company_name.lower().replace(' ', '')
+        self.description = description
+        self.start = start
+        self.end = end
+        self.location = location
+        self.tags = tags
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "position": self.position,
+            "company": {
+                "name": self.company_name,
+                "link": f"https://{self.company_slug}.com/"
+            },
+            "product": {
+                "name": self.company_name,
+                "link": f"https://{self.company_slug}.com"
+            },
+            "description": self.description,
+            "from": self.start,
+            "to": self.end,
+            "location": self.location,
+            "tags": self.tags
+        }
+
+class EducationRecord:
+    """A single entry of the education section"""
+    __slots__ = ("institution", "degree", "major", "start", "end", "location")
+
+    def __init__(self, institution: str, degree: str, major: str, start: str, end: str, location: str):
+        self.institution = institution
+        self.degree = degree
+        self.major = major
+        self.start = start
+        self.end = end
+        self.location = location
+
+    def to_dict(self) -> Dict[str, Any]:
+        institution = self.institution
+        return {
+            "place": {
+                "name": institution,
+                "link": f"http://{institution.lower().replace(' ', '')}.edu" if institution else ""
+            },
+            "degree": self.degree,
+            "major": self.major,
+            "track": self.major,
+            "from": self.start,
+            "to": self.end,
+            "location": self.location
+        }
+
+class AchievementRecord:
+    """A single entry of the achievements section"""
+    __slots__ = ("name", "description")
+
+    def __init__(self, name: str, description: Any):
+        self.name = name
+        self.description = description
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description
+        }
+
+def format_date(date_str: str) -> str:
+    """Format date string to the required format: 'YYYY Mon.' or 'present'"""
+    if not date_str:
+        return ""
+
+    if date_str.lower() == "present":
+        return "present"
+
+    if "-" not in date_str:
+        # Just a year
+        return date_str
+
+    parts = date_str.split("-")
+    if len(parts) != 2 or not parts[1].isdigit():
+        return date_str
+
+    month_int = int(parts[1])
+    if not 1 <= month_int <= 12:
+        return date_str
+    return f"{parts[0]} {MONTH_ABBREVIATIONS[month_int - 1]}."
+
+def extract_year_from_date(date_str: str) -> str:
+    """Extract the year from a date string"""
+    if not date_str:
+        return ""
+
+    if date_str.lower() == "present":
+        return "present"
+
+    if "-" in date_str:
+        return date_str.split("-", 1)[0]
+
+    year_match = YEAR_PATTERN.search(date_str)
+    if year_match:
+        return year_match.group(0)
+
+    return date_str
+
+def extract_tags_from_highlights(highlights: List[str]) -> List[str]:
+    """Extract potential tags from work highlights"""
+    if not highlights:
+        return []
+
+    # Capitalized terms, acronyms or quoted terms; first three distinct ones
+    unique_tags = []
+    for match in TAG_PATTERN.finditer(" ".join(highlights)):
+        tag = match.group(1) or match.group(2) or match.group(3)
+        if tag and tag not in unique_tags:
+            unique_tags.append(tag)
+            if len(unique_tags) == 3:
+                break
+
+    # If we couldn't extract tags, create some generic ones
+    if not unique_tags:
+        words = highlights[0].split()
+        if len(words) >= 3:
+            unique_tags = [words[0], words[2], "Development"]
+        else:
+            unique_tags = ["Development", "Implementation", "Design"]
+
+    return unique_tags
+
+class EnhancedJSONToConfigConverter:
+    """
+    Converts enhanced JSON resume schema to the configuration format
+    required by the custom Typst template.
+    """
+
+    def __init__(self, json_data: Dict[str, Any]):
+        self.json_data = json_data
+        self.config_data = {
+            "contacts": {},
+            "jobs": [],
+            "education": [],
+            "skills": [],
+            "technical_expertise": [],
+            "methodology": [],
+            "tools": [],
+            "achievements": []
+        }
+
+    def convert_contacts(self) -> None:
+        """Convert basic information to contacts section"""
+        basics = self.json_data.get("basics", {})
+        label = basics.get("label", "")
+        contacts = {
+            "name": basics.get("name", ""),
+            "title": label,
+            "email": basics.get("email", "")
+        }
+
+        # Handle location
+        location = basics.get("location", {})
+        if isinstance(location, dict):
+            city = location.get("city", "")
+            country = location.get("countryCode", "")
+            contacts["address"] = f"{city}, {country}" if city and country else city or country
+            contacts["location"] = country or city
+
+        # Handle profiles (LinkedIn, GitHub, etc.)
+        for profile in basics.get("profiles", []):
+            if not isinstance(profile, dict):
+                continue
+
+            network = profile.get("network", "").lower()
+            if network == "linkedin":
+                contacts["linkedin"] = {
+                    "url": profile.get("url", ""),
+                    "displayText": profile.get("username", "")
+                }
+            elif network == "github":
+                contacts["github"] = {
+                    "url": profile.get("url", ""),
+                    "displayText": f"@{profile.get('username', '')}"
+                }
+
+        # Handle website
+        url = basics.get("url")
+        if url:
+            contacts["website"] = {
+                "url": url,
+                "displayText": url.replace("https://", "").replace("http://", "")
+            }
+
+        self.config_data["contacts"] = contacts
+        # Set position from label and tagline from summary
+        self.config_data["position"] = label
+        self.config_data["tagline"] = basics.get("summary", "")
+
+    def convert_work_experience(self) -> None:
+        """Convert work experience to jobs section"""
+        records = []
+        for entry in self.json_data.get("work", []):
+            if not isinstance(entry, dict):
+                continue
+
+            highlights = entry.get("highlights", [])
+            records.append(JobRecord(
+                position=entry.get("position", ""),
+                company_name=entry.get("name", ""),
+                description=highlights,
+                start=format_date(entry.get("startDate", "")),
+                end=format_date(entry.get("endDate", "")),
+                location=entry.get("location", ""),
+                tags=extract_tags_from_highlights(highlights)
+            ))
+
+        self.config_data["jobs"].extend(record.to_dict() for record in records)
+
+    def convert_education(self) -> None:
+        """Convert education entries"""
+        education_entries = self.json_data.get("education", [])
+
+        # Handle different education formats
+        if isinstance(education_entries, dict) and "education" in education_entries:
+            education_entries = education_entries.get("education", [])
+
+        records = []
+        for entry in education_entries:
+            if not isinstance(entry, dict):
+                continue
+
+            single_date = entry.get("date", "")
+            records.append(EducationRecord(
+                institution=entry.get("institution", ""),
+                degree=entry.get("degree", "") or entry.get("studyType", ""),
+                major=entry.get("area", ""),
+                start=extract_year_from_date(entry.get("startDate", "") or single_date),
+                end=extract_year_from_date(entry.get("endDate", "") or single_date),
+                location=entry.get("location", "")
+            ))
+
+        self.config_data["education"].extend(record.to_dict() for record in records)
+
+    def convert_skills(self) -> None:
+        """Convert skills section"""
+        all_skills = []
+        methodology = []
+        tools = []
+        technical_expertise = []
+
+        for skill_group in self.json_data.get("skills", []):
+            if not isinstance(skill_group, dict):
+                continue
+
+            keywords = skill_group.get("keywords", [])
+            if not keywords:
+                continue
+
+            category = skill_group.get("name", "").lower()
+            if "method" in category or "approach" in category:
+                methodology.extend(keywords)
+            elif "tool" in category or "environment" in category:
+                tools.extend(keywords)
+            elif "technical" in category or "language" in category or "framework" in category:
+                # Add to technical expertise with random level between 3-5
+                technical_expertise.extend(
+                    {"name": tech, "level": random.randint(3, 5)} for tech in keywords
+                )
+            else:
+                all_skills.extend(keywords)
+
+        self.config_data["skills"] = all_skills
+        self.config_data["methodology"] = methodology
+        self.config_data["tools"] = tools
+        self.config_data["technical_expertise"] = technical_expertise or [
+            {"name": name, "level": level} for name, level in DEFAULT_TECHNICAL_EXPERTISE
+        ]
+
+    def convert_projects_to_achievements(self) -> None:
+        """Convert projects to achievements section"""
+        records = []
+        for project in self.json_data.get("projects", []):
+            if not isinstance(project, dict):
+                continue
+
+            # Get description from either a string or the first item in a list
+            description = project.get("description", "")
+            if isinstance(description, list) and description:
+                description = description[0]
+
+            records.append(AchievementRecord(project.get("name", ""), description))
+
+        self.config_data["achievements"].extend(record.to_dict() for record in records)
+
+    def convert_certifications(self) -> None:
+        """Convert certifications to achievements section"""
+        records = []
+        for cert in self.json_data.get("certifications", []):
+            if not isinstance(cert, dict):
+                continue
+
+            description = cert.get("description", "") or f"Issued by {cert.get('awarder', '')}"
+            records.append(AchievementRecord(cert.get("title", ""), description))
+
+        self.config_data["achievements"].extend(record.to_dict() for record in records)
+
+    def add_objective(self) -> None:
+        """Add a default objective if none exists"""
+        self.config_data["objective"] = DEFAULT_OBJECTIVE
+
+    def _format_date(self, date_str: str) -> str:
+        return format_date(date_str)
+
+    def _extract_year_from_date(self, date_str: str) -> str:
+        return extract_year_from_date(date_str)
+
+    def _extract_tags_from_highlights(self, highlights: List[str]) -> List[str]:
+        return extract_tags_from_highlights(highlights)
+
+    def convert(self) -> Dict[str, Any]:
+        """Convert the JSON resume to the template configuration format"""
+        self.convert_contacts()
+        self.convert_work_experience()
+        self.convert_education()
+        self.convert_skills()
+        self.convert_projects_to_achievements()
+        self.convert_certifications()
+        self.add_objective()
+
+        return self.config_data
+
+def convert_many(json_list: List[Dict[str, Any]], skip_errors: bool = False) -> List[Optional[Dict[str, Any]]]:
+    """
+    Convert a batch of JSON resumes to template configurations.
+
+    Args:
+        json_list: Enhanced JSON resume data, one dict per resume
+        skip_errors: Return None for resumes that fail to convert instead of raising
+
+    Returns:
+        Configurations in the same order as json_list
+    """
+    configs = []
+    for index, json_data in enumerate(json_list):
+        try:
+            configs.append(EnhancedJSONToConfigConverter(json_data).convert())
+        except Exception as e:
+            if not skip_errors:
+                raise
+            logger.error(f"Failed to convert resume {index}: {str(e)}")
+            configs.append(None)
+    return configs
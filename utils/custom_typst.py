@@ -1,313 +1,43 @@
 import yaml
+import orjson
 import os
 import json
 import logging
 import uuid
 import subprocess
-import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
+from PyPDF2 import PdfReader, PdfWriter
+from .converter import EnhancedJSONToConfigConverter, convert_many
+from .tracing import span
+from .typst_assets import TYPST_FONT_DIR, TYPST_PACKAGE_DIR, missing_fonts
+from .template_registry import INPUTS_DIR, ResumeTemplate, get_template
 
 logger = logging.getLogger(__name__)
 
-class EnhancedJSONToConfigConverter:
-    """
-    Converts enhanced JSON resume schema to the configuration.yaml format
-    required by the custom Typst template.
-    """
-    
-    def __init__(self, json_data: Dict[str, Any]):
-        self.json_data = json_data
-        self.config_data = {
-            "contacts": {},
-            "jobs": [],
-            "education": [],
-            "skills": [],
-            "technical_expertise": [],
-            "methodology": [],
-            "tools": [],
-            "achievements": []
-        }
-    
-    def convert_contacts(self) -> None:
-        """Convert basic information to contacts section"""
-        basics = self.json_data.get("basics", {})
-        
-        self.config_data["contacts"]["name"] = basics.get("name", "")
-        self.config_data["contacts"]["title"] = basics.get("label", "")
-        self.config_data["contacts"]["email"] = basics.get("email", "")
-        
-        # Handle location
-        location = basics.get("location", {})
-        if isinstance(location, dict):
-            city = location.get("city", "")
-            country = location.get("countryCode", "")
-            self.config_data["contacts"]["address"] = f"{city}, {country}" if city and country else city or country
-            self.config_data["contacts"]["location"] = country or city
-        
-        # Set position from label
-        self.config_data["position"] = basics.get("label", "")
-        
-        # Handle profiles (LinkedIn, GitHub, etc.)
-        profiles = basics.get("profiles", [])
-        for profile in profiles:
-            if not isinstance(profile, dict):
-                continue
-                
-            network = profile.get("network", "").lower()
-            if network == "linkedin":
-                self.config_data["contacts"]["linkedin"] = {
-                    "url": profile.get("url", ""),
-                    "displayText": profile.get("username", "")
-                }
-            elif network == "github":
-                self.config_data["contacts"]["github"] = {
-                    "url": profile.get("url", ""),
-                    "displayText": f"@{profile.get('username', '')}"
-                }
-        
-        # Handle website
-        if basics.get("url"):
-            self.config_data["contacts"]["website"] = {
-                "url": basics.get("url", ""),
-                "displayText": basics.get("url", "").replace("https://", "").replace("http://", "")
-            }
-        
-        # Set tagline from summary
-        self.config_data["tagline"] = basics.get("summary", "")
-    
-    def convert_work_experience(self) -> None:
-        """Convert work experience to jobs section"""
-        work_entries = self.json_data.get("work", [])
-        
-        for entry in work_entries:
-            if not isinstance(entry, dict):
-                continue
-                
-            job = {
-                "position": entry.get("position", ""),
-                "company": {
-                    "name": entry.get("name", ""),
-                    "link": f"https://{entry.get('name', '').lower().replace(' ', '')}.com/"
-                },
-                "product": {
-                    "name": entry.get("name", ""),
-                    "link": f"https://{entry.get('name', '').lower().replace(' ', '')}.com"
-                },
-                "description": entry.get("highlights", []),
-                "from": self._format_date(entry.get("startDate", "")),
-                "to": self._format_date(entry.get("endDate", "")),
-                "location": entry.get("location", ""),
-                "tags": self._extract_tags_from_highlights(entry.get("highlights", []))
-            }
-            
-            self.config_data["jobs"].append(job)
-    
-    def convert_education(self) -> None:
-        """Convert education entries"""
-        education_entries = self.json_data.get("education", [])
-        
-        # Handle different education formats
-        if isinstance(education_entries, dict) and "education" in education_entries:
-            education_entries = education_entries.get("education", [])
-        
-        for entry in education_entries:
-            if not isinstance(entry, dict):
-                continue
-                
-            institution = entry.get("institution", "")
-            degree = entry.get("degree", "") or entry.get("studyType", "")
-            major = entry.get("area", "")
-            
-            edu = {
-                "place": {
-                    "name": institution,
-                    "link": f"http://{institution.lower().replace(' ', '')}.edu" if institution else ""
-                },
-                "degree": degree,
-                "major": major,
-                "track": major,
-                "from": self._extract_year_from_date(entry.get("startDate", "") or entry.get("date", "")),
-                "to": self._extract_year_from_date(entry.get("endDate", "") or entry.get("date", "")),
-                "location": entry.get("location", "")
-            }
-            
-            self.config_data["education"].append(edu)
-    
-    def convert_skills(self) -> None:
-        """Convert skills section"""
-        skills_entries = self.json_data.get("skills", [])
-        
-        all_skills = []
-        methodology = []
-        tools = []
-        technical_expertise = []
-        
-        for skill_group in skills_entries:
-            if not isinstance(skill_group, dict):
-                continue
-                
-            category = skill_group.get("name", "").lower()
-            keywords = skill_group.get("keywords", [])
-            
-            if not keywords:
-                continue
-                
-            if "method" in category or "approach" in category:
-                methodology.extend(keywords)
-            elif "tool" in category or "environment" in category:
-                tools.extend(keywords)
-            elif "technical" in category or "language" in category or "framework" in category:
-                # Add to technical expertise with random level between 3-5
-                import random
-                for tech in keywords:
-                    technical_expertise.append({
-                        "name": tech,
-                        "level": random.randint(3, 5)
-                    })
-            else:
-                all_skills.extend(keywords)
-        
-        self.config_data["skills"] = all_skills
-        self.config_data["methodology"] = methodology
-        self.config_data["tools"] = tools
-        self.config_data["technical_expertise"] = technical_expertise or [
-            {"name": "Skill 1", "level": 4},
-            {"name": "Skill 2", "level": 5}
-        ]
-    
-    def convert_projects_to_achievements(self) -> None:
-        """Convert projects to achievements section"""
-        projects = self.json_data.get("projects", [])
-        
-        for project in projects:
-            if not isinstance(project, dict):
-                continue
-                
-            name = project.get("name", "")
-            
-            # Get description from either a string or the first item in a list
-            description = project.get("description", "")
-            if isinstance(description, list) and description:
-                description = description[0]
-                
-            achievement = {
-                "name": name,
-                "description": description
-            }
-            
-            self.config_data["achievements"].append(achievement)
-    
-    def convert_certifications(self) -> None:
-        """Convert certifications to achievements section"""
-        certifications = self.json_data.get("certifications", [])
-        
-        for cert in certifications:
-            if not isinstance(cert, dict):
-                continue
-                
-            name = cert.get("title", "")
-            description = cert.get("description", "") or f"Issued by {cert.get('awarder', '')}"
-            
-            achievement = {
-                "name": name,
-                "description": description
-            }
-            
-            self.config_data["achievements"].append(achievement)
-    
-    def add_objective(self) -> None:
-        """Add a default objective if none exists"""
-        self.config_data["objective"] = "Seeking to leverage my skills and experience to contribute to innovative projects and advance my career in a dynamic environment."
-    
-    def _format_date(self, date_str: str) -> str:
-        """Format date string to the required format: 'YYYY Mon.' or 'present'"""
-        if not date_str:
-            return ""
-            
-        if date_str.lower() == "present":
-            return "present"
-            
-        try:
-            # Try parsing YYYY-MM format
-            if "-" in date_str:
-                year, month = date_str.split("-")
-                month_int = int(month)
-                month_abbr = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", 
-                             "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"][month_int - 1]
-                return f"{year} {month_abbr}."
-            else:
-                # Just a year
-                return date_str
-        except Exception:
-            return date_str
-    
-    def _extract_year_from_date(self, date_str: str) -> str:
-        """Extract the year from a date string"""
-        if not date_str:
-            return ""
-            
-        if date_str.lower() == "present":
-            return "present"
-            
-        try:
-            # Try to extract year from various formats
-            if "-" in date_str:
-                return date_str.split("-")[0]
-            
-            # Extract 4-digit year using regex
-            import re
-            year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
-            if year_match:
-                return year_match.group(0)
-                
-            return date_str
-        except Exception:
-            return date_str
-    
-    def _extract_tags_from_highlights(self, highlights: List[str]) -> List[str]:
-        """Extract potential tags from work highlights"""
-        if not highlights:
-            return []
-            
-        # Extract technical terms that could be tags
-        all_text = " ".join(highlights)
-        import re
-        
-        # Look for capitalized terms or terms in quotes
-        potential_tags = re.findall(r'\b([A-Z][a-zA-Z]+)\b|\b([A-Z][A-Z]+)\b|"([^"]+)"', all_text)
-        
-        # Flatten the list of tuples and remove empty strings
-        tags = [t for tup in potential_tags for t in tup if t]
-        
-        # Only keep unique values and limit to 3
-        unique_tags = list(set(tags))[:3]
-        
-        # If we couldn't extract tags, create some generic ones
-        if not unique_tags and len(highlights) > 0:
-            words = highlights[0].split()
-            if len(words) >= 3:
-                unique_tags = [words[0], words[2], "Development"]
-            else:
-                unique_tags = ["Development", "Implementation", "Design"]
-        
-        return unique_tags
-    
-    def convert(self) -> Dict[str, Any]:
-        """Convert the JSON resume to configuration.yaml format"""
-        self.convert_contacts()
-        self.convert_work_experience()
-        self.convert_education()
-        self.convert_skills()
-        self.convert_projects_to_achievements()
-        self.convert_certifications()
-        self.add_objective()
-        
-        return self.config_data
+# Configurations up to this size are handed to Typst on the command line
+# (sys.inputs) instead of being written to the working directory.
+MAX_INLINE_CONFIG_BYTES = 64 * 1024
+
+# Keep a YAML copy of every rendered configuration in the output directory
+SAVE_CONFIG_YAML = os.getenv('SAVE_CONFIG_YAML', '').lower() in ('1', 'true', 'yes')
+
+# Hermetic renders: Typst loads only the fonts bundled in TYPST_FONT_DIR
+# instead of discovering the host's system fonts on every compile, and
+# resolves package imports from the pre-populated TYPST_PACKAGE_DIR rather
+# than the network, so a resume renders the same on every host.
+# `python -m utils.typst_assets` fetches both. System fonts are only ignored
+# once every bundled font is present; until then they stay available so
+# the templates' fonts are not silently replaced.
+TYPST_HERMETIC = os.getenv('TYPST_HERMETIC', 'true').lower() in ('1', 'true', 'yes')
+
+_bundled_fonts_checked = False
+_bundled_fonts_complete = False
+_typst_available = False
 
 def save_yaml_config(data: Dict[str, Any], output_path: str) -> None:
-    """Save the configuration data as YAML"""
+    """Save the configuration data as YAML (debugging artifact only; Typst reads JSON)"""
     try:
         with open(output_path, 'w', encoding='utf-8') as file:
             yaml.dump(data, file, default_flow_style=False, sort_keys=False, allow_unicode=True)
@@ -316,119 +46,142 @@ def save_yaml_config(data: Dict[str, Any], output_path: str) -> None:
         logger.error(f"Error saving YAML configuration: {str(e)}")
         raise
 
-def prepare_typst_environment(template_dir: str, output_dir: str) -> str:
+def check_typst_installed() -> None:
+    """Raise a RuntimeError if the Typst CLI is not available; checked once per process"""
+    global _typst_available
+    if _typst_available:
+        return
+    try:
+        version_cmd = ["typst", "--version"]
+        subprocess.run(version_cmd, check=True, capture_output=True, text=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        logger.error("Typst is not installed or not in PATH")
+        raise RuntimeError("Typst is not installed or not in PATH. Please install Typst: https://github.com/typst/typst")
+    _typst_available = True
+
+def typst_environment_args(hermetic: Optional[bool] = None) -> List[str]:
     """
-    Prepares a working directory for Typst by copying necessary files
-    
+    Font and package arguments for `typst compile`.
+
     Args:
-        template_dir: Source directory with Typst templates
-        output_dir: Target directory for processing
-        
+        hermetic: Use only the bundled fonts and packages; defaults to the
+            TYPST_HERMETIC environment variable
+
     Returns:
-        Path to the working directory
+        Extra arguments for `typst compile`, empty when not hermetic;
+        without --ignore-system-fonts while bundled fonts are missing
     """
-    # Create a unique working directory
-    work_dir = os.path.join(output_dir, f"typst_work_{uuid.uuid4()}")
-    os.makedirs(work_dir, exist_ok=True)
-    
-    # Copy all template files to working directory
-    source_files = [
-        "example.typ",
-        "vantage-typst.typ",
+    if hermetic is None:
+        hermetic = TYPST_HERMETIC
+    if not hermetic:
+        return []
+    args = [
+        "--font-path", TYPST_FONT_DIR,
+        "--package-path", TYPST_PACKAGE_DIR,
+        "--package-cache-path", TYPST_PACKAGE_DIR,
     ]
+    if bundled_fonts_complete():
+        args.append("--ignore-system-fonts")
+    return args
+
+def bundled_fonts_complete() -> bool:
+    """Whether every font in FONT_FILES is in TYPST_FONT_DIR; checked once per process"""
+    global _bundled_fonts_checked, _bundled_fonts_complete
+    if not _bundled_fonts_checked:
+        missing = missing_fonts()
+        _bundled_fonts_complete = not missing
+        _bundled_fonts_checked = True
+        if missing:
+            logger.warning(f"Bundled fonts missing from {TYPST_FONT_DIR} ({', '.join(missing)}); "
+                           "Typst keeps using system fonts. Run `python -m utils.typst_assets` to fetch them")
+    return _bundled_fonts_complete
+
+def serialize_config(data: Any) -> bytes:
+    """Serialize configuration data to the JSON bytes read by the Typst templates"""
+    return orjson.dumps(data)
+
+def build_config_inputs(config_json: bytes, work_dir: str, file_name: str = "configuration.json") -> List[str]:
+    """
+    Build the typst CLI arguments that hand the configuration to example.typ.
     
-    for file_name in source_files:
-        src = os.path.join(template_dir, file_name)
-        dst = os.path.join(work_dir, file_name)
-        try:
-            shutil.copy2(src, dst)
-            logger.info(f"Copied {file_name} to {work_dir}")
-        except FileNotFoundError:
-            logger.error(f"Template file not found: {src}")
-            raise FileNotFoundError(f"Template file not found: {src}")
-    
-    # Create icons directory
-    icons_dir = os.path.join(work_dir, "icons")
-    os.makedirs(icons_dir, exist_ok=True)
-    
-    # Create minimalist SVG icons for the required icons
-    icons = {
-        "calendar": '<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="3" y="4" width="18" height="18" rx="2" ry="2"></rect><line x1="16" y1="2" x2="16" y2="6"></line><line x1="8" y1="2" x2="8" y2="6"></line><line x1="3" y1="10" x2="21" y2="10"></line></svg>',
-        "location": '<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M21 10c0 7-9 13-9 13s-9-6-9-13a9 9 0 0 1 18 0z"></path><circle cx="12" cy="10" r="3"></circle></svg>',
-        "email": '<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M4 4h16c1.1 0 2 .9 2 2v12c0 1.1-.9 2-2 2H4c-1.1 0-2-.9-2-2V6c0-1.1.9-2 2-2z"></path><polyline points="22,6 12,13 2,6"></polyline></svg>',
-        "website": '<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><circle cx="12" cy="12" r="10"></circle><line x1="2" y1="12" x2="22" y2="12"></line><path d="M12 2a15.3 15.3 0 0 1 4 10 15.3 15.3 0 0 1-4 10 15.3 15.3 0 0 1-4-10 15.3 15.3 0 0 1 4-10z"></path></svg>',
-        "github": '<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M9 19c-5 1.5-5-2.5-7-3m14 6v-3.87a3.37 3.37 0 0 0-.94-2.61c3.14-.35 6.44-1.54 6.44-7A5.44 5.44 0 0 0 20 4.77 5.07 5.07 0 0 0 19.91 1S18.73.65 16 2.48a13.38 13.38 0 0 0-7 0C6.27.65 5.09 1 5.09 1A5.07 5.07 0 0 0 5 4.77a5.44 5.44 0 0 0-1.5 3.78c0 5.42 3.3 6.61 6.44 7A3.37 3.37 0 0 0 9 18.13V22"></path></svg>',
-        "linkedin": '<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2 2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6z"></path><rect x="2" y="9" width="4" height="12"></rect><circle cx="4" cy="4" r="2"></circle></svg>'
-    }
+    Small configurations are passed in memory through `--input`; larger ones
+    are written to the working directory so the command line stays well below
+    the per-argument size limit of the OS.
     
-    # Save the icons
-    for icon_name, svg_content in icons.items():
-        icon_path = os.path.join(icons_dir, f"{icon_name}.svg")
-        with open(icon_path, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
-        logger.info(f"Created icon: {icon_path}")
+    Args:
+        config_json: Serialized configuration
+        work_dir: Typst working directory (the project root)
+        file_name: Path under work_dir for a configuration too large to inline
+        
+    Returns:
+        Extra arguments for `typst compile`
+    """
+    if len(config_json) <= MAX_INLINE_CONFIG_BYTES:
+        return ["--input", f"configuration={config_json.decode('utf-8')}"]
     
-    return work_dir
+    with open(os.path.join(work_dir, file_name), 'wb') as f:
+        f.write(config_json)
+    return ["--input", f"configuration-file={file_name}"]
+
+def input_file_name() -> str:
+    """A fresh path, relative to a template's root, for one render's configuration file"""
+    return f"{INPUTS_DIR}/{uuid.uuid4()}.json"
 
-def generate_pdf_from_typst(yaml_path: str, typst_template_dir: str, output_dir: str) -> str:
+def remove_input_file(template: ResumeTemplate, file_name: str) -> None:
+    try:
+        os.remove(os.path.join(template.root, file_name))
+    except FileNotFoundError:
+        pass
+
+def check_required_fields(template: ResumeTemplate, config_data: Dict[str, Any]) -> None:
+    """Raise a ValueError naming the fields the template needs that config_data lacks"""
+    missing = template.missing_fields(config_data)
+    if missing:
+        raise ValueError(f"Configuration lacks fields required by template {template.name}: {', '.join(missing)}")
+
+def generate_pdf_from_typst(config_data: Dict[str, Any], template: ResumeTemplate, output_dir: str) -> str:
     """
-    Generate a PDF from the Typst template and the configuration YAML
+    Generate a PDF from the Typst template and the configuration data
     
     Args:
-        yaml_path: Path to the configuration.yaml file
-        typst_template_dir: Directory containing Typst templates
+        config_data: Configuration produced by EnhancedJSONToConfigConverter
+        template: Registered template to render with
         output_dir: Directory to save the generated PDF
         
     Returns:
         Path to the generated PDF
     """
+    input_name = input_file_name()
     try:
+        check_required_fields(template, config_data)
+        
         # Create a unique output filename
         output_filename = f"{uuid.uuid4()}_resume.pdf"
-        output_path = os.path.join(output_dir, output_filename)
-        
-        # Prepare working directory with all necessary files
-        work_dir = prepare_typst_environment(typst_template_dir, output_dir)
-        
-        # Copy configuration.yaml to working directory
-        work_yaml_path = os.path.join(work_dir, "configuration.yaml")
-        shutil.copy2(yaml_path, work_yaml_path)
-        
-        # Path to example.typ in the working directory
-        typst_template_path = os.path.join(work_dir, "example.typ")
+        output_path = os.path.abspath(os.path.join(output_dir, output_filename))
         
         # Check if Typst is installed
-        try:
-            version_cmd = ["typst", "--version"]
-            subprocess.run(version_cmd, check=True, capture_output=True, text=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            logger.error("Typst is not installed or not in PATH")
-            raise RuntimeError("Typst is not installed or not in PATH. Please install Typst: https://github.com/typst/typst")
-        
-        # Compile the Typst template to PDF
-        cmd = ["typst", "compile", typst_template_path, output_path]
-        logger.info(f"Running command: {' '.join(cmd)}")
-        
-        result = subprocess.run(
-            cmd,
-            cwd=work_dir,  # Run in the working directory
-            check=True,
-            capture_output=True,
-            text=True
-        )
+        check_typst_installed()
+        
+        # Compile straight from the template's directory; only an oversized
+        # configuration is written there, under a name of its own
+        config_inputs = build_config_inputs(serialize_config(config_data), template.root, input_name)
+        cmd = ["typst", "compile", *typst_environment_args(), *config_inputs, template.entry, output_path]
+        logger.info(f"Running command: typst compile {template.entry} {output_path} (template {template.name})")
+        
+        with span("render.typst"):
+            result = subprocess.run(
+                cmd,
+                cwd=template.root,
+                check=True,
+                capture_output=True,
+                text=True
+            )
         
         if result.returncode != 0:
             logger.error(f"Error compiling Typst template: {result.stderr}")
             raise RuntimeError(f"Typst compilation failed: {result.stderr}")
         
         logger.info(f"PDF generated successfully at {output_path}")
-        
-        # Clean up working directory
-        try:
-            shutil.rmtree(work_dir)
-        except Exception as e:
-            logger.warning(f"Failed to clean up working directory: {str(e)}")
-        
         return output_path
         
     except subprocess.CalledProcessError as e:
@@ -437,48 +190,187 @@ def generate_pdf_from_typst(yaml_path: str, typst_template_dir: str, output_dir:
     except Exception as e:
         logger.error(f"Error generating PDF from Typst: {str(e)}")
         raise
+    finally:
+        remove_input_file(template, input_name)
 
 def process_resume_with_custom_typst(
     json_data: Dict[str, Any],
-    typst_template_dir: str,
-    output_dir: str
+    template: Optional[ResumeTemplate],
+    output_dir: str,
+    save_yaml: Optional[bool] = None
 ) -> str:
     """
-    Process a resume by converting the JSON data to the configuration.yaml format
+    Process a resume by converting the JSON data to the template configuration
     and generating a PDF using the custom Typst template.
     
     Args:
         json_data: Enhanced JSON resume data
-        typst_template_dir: Directory containing the Typst templates
+        template: Registered template to render with; None for the default
         output_dir: Directory to save the generated files
+        save_yaml: Also write the configuration as YAML next to the PDF for
+            debugging; defaults to the SAVE_CONFIG_YAML environment variable
         
     Returns:
         Path to the generated PDF
     """
     try:
-        # Convert JSON to configuration.yaml format
-        converter = EnhancedJSONToConfigConverter(json_data)
-        config_data = converter.convert()
+        # Convert JSON to the template configuration format
+        with span("render.convert"):
+            converter = EnhancedJSONToConfigConverter(json_data)
+            config_data = converter.convert()
         
-        # Create file paths
         os.makedirs(output_dir, exist_ok=True)
-        yaml_filename = f"{uuid.uuid4()}_resume.yaml"
-        yaml_path = os.path.join(output_dir, yaml_filename)
         
-        # Save the configuration.yaml
-        save_yaml_config(config_data, yaml_path)
+        if save_yaml is None:
+            save_yaml = SAVE_CONFIG_YAML
+        if save_yaml:
+            save_yaml_config(config_data, os.path.join(output_dir, f"{uuid.uuid4()}_resume.yaml"))
         
         # Generate PDF using Typst
-        pdf_path = generate_pdf_from_typst(yaml_path, typst_template_dir, output_dir)
+        return generate_pdf_from_typst(config_data, template or get_template(), output_dir)
+    except Exception as e:
+        logger.error(f"Error processing resume with custom Typst: {str(e)}")
+        raise
+
+def find_resume_page_ranges(reader: PdfReader, expected_count: int) -> List[range]:
+    """
+    Work out which pages of a bulk-compiled PDF belong to which resume.
+    
+    bulk.typ starts every resume on a new page and each resume has exactly one
+    level-1 heading (the candidate's name), so the top-level entries of the PDF
+    outline mark the first page of every resume in document order.
+    
+    Args:
+        reader: Reader over the combined PDF
+        expected_count: Number of resumes that were compiled
+        
+    Returns:
+        One page range per resume, in input order
+    """
+    start_pages = [
+        reader.get_destination_page_number(entry)
+        for entry in reader.outline
+        if not isinstance(entry, list)
+    ]
+    
+    if len(start_pages) != expected_count:
+        raise RuntimeError(
+            f"Expected {expected_count} resumes in bulk PDF but found {len(start_pages)} top-level bookmarks"
+        )
+    if start_pages and start_pages[0] != 0:
+        raise RuntimeError(f"First resume starts on page {start_pages[0] + 1} instead of page 1")
+    if any(later <= earlier for earlier, later in zip(start_pages, start_pages[1:])):
+        raise RuntimeError(f"Resume start pages are not strictly increasing: {start_pages}")
+    
+    end_pages = start_pages[1:] + [len(reader.pages)]
+    return [range(start, end) for start, end in zip(start_pages, end_pages)]
+
+def split_bulk_pdf(pdf_path: str, output_dir: str, expected_count: int) -> List[str]:
+    """
+    Split a bulk-compiled PDF into one PDF per resume
+    
+    Args:
+        pdf_path: Path to the combined PDF produced from bulk.typ
+        output_dir: Directory to save the per-resume PDFs
+        expected_count: Number of resumes that were compiled
+        
+    Returns:
+        Paths to the per-resume PDFs, in input order
+    """
+    reader = PdfReader(pdf_path)
+    page_ranges = find_resume_page_ranges(reader, expected_count)
+    
+    pdf_paths = []
+    for page_range in page_ranges:
+        writer = PdfWriter()
+        for page_num in page_range:
+            writer.add_page(reader.pages[page_num])
+        
+        output_path = os.path.join(output_dir, f"{uuid.uuid4()}_resume.pdf")
+        with open(output_path, 'wb') as f:
+            writer.write(f)
+        pdf_paths.append(output_path)
+    
+    logger.info(f"Split bulk PDF into {len(pdf_paths)} resumes")
+    return pdf_paths
+
+def generate_pdfs_from_typst_bulk(
+    configs: List[Dict[str, Any]],
+    template: ResumeTemplate,
+    output_dir: str
+) -> List[str]:
+    """
+    Compile many resumes with a single Typst invocation and split the result
+    
+    Args:
+        configs: Configurations produced by EnhancedJSONToConfigConverter
+        template: Registered template to render with; must have a bulk entry
+        output_dir: Directory to save the generated PDFs
+        
+    Returns:
+        Paths to the per-resume PDFs, in input order
+    """
+    if template.bulk_entry is None:
+        raise ValueError(f"Template {template.name} does not support bulk rendering")
+    for config_data in configs:
+        check_required_fields(template, config_data)
+    
+    input_name = input_file_name()
+    combined_path = os.path.abspath(os.path.join(output_dir, f"{uuid.uuid4()}_bulk.pdf"))
+    try:
+        with open(os.path.join(template.root, input_name), 'wb') as f:
+            f.write(serialize_config(configs))
+        
+        check_typst_installed()
+        
+        cmd = ["typst", "compile", *typst_environment_args(), "--input", f"configurations-file={input_name}",
+               template.bulk_entry, combined_path]
+        logger.info(f"Running command: {' '.join(cmd)}")
         
-        # Clean up the temporary YAML file
+        subprocess.run(
+            cmd,
+            cwd=template.root,
+            check=True,
+            capture_output=True,
+            text=True
+        )
+        
+        return split_bulk_pdf(combined_path, output_dir, len(configs))
+        
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Error calling Typst: {e.stderr}")
+        raise RuntimeError(f"Typst compilation failed: {e.stderr}")
+    finally:
+        remove_input_file(template, input_name)
         try:
-            os.remove(yaml_path)
-            logger.info(f"Removed temporary YAML file: {yaml_path}")
-        except Exception as e:
-            logger.warning(f"Failed to remove temporary YAML file: {str(e)}")
+            os.remove(combined_path)
+        except FileNotFoundError:
+            pass
+
+def process_resumes_with_custom_typst_bulk(
+    json_list: List[Dict[str, Any]],
+    template: Optional[ResumeTemplate],
+    output_dir: str
+) -> List[str]:
+    """
+    Convert many JSON resumes and render them all in one Typst process.
+    
+    Args:
+        json_list: Enhanced JSON resume data, one dict per resume
+        template: Registered template to render with; None for the default
+        output_dir: Directory to save the generated files
         
-        return pdf_path
+    Returns:
+        Paths to the generated PDFs, in the same order as json_list
+    """
+    if not json_list:
+        return []
+    
+    try:
+        configs = convert_many(json_list)
+        
+        os.makedirs(output_dir, exist_ok=True)
+        return generate_pdfs_from_typst_bulk(configs, template or get_template(), output_dir)
     except Exception as e:
-        logger.error(f"Error processing resume with custom Typst: {str(e)}")
-        raise
\ No newline at end of file
+        logger.error(f"Error bulk processing resumes with custom Typst: {str(e)}")
+        raise
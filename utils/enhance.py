@@ -1,15 +1,37 @@
 import json
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List
-from langchain_core.language_models.base import BaseLanguageModel
-from langchain_openai import ChatOpenAI, OpenAI
-from langchain_google_genai import GoogleGenerativeAI
-from langchain_deepseek import ChatDeepSeek
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
 import os
 import re
-from .modelmanager import SimpleModelManager
+import time
+from .modelmanager import SimpleModelManager, get_model_type
+from .llm_logger import LLMLogger, extract_token_usage
+from .section_planner import EnhancementCall, plan_enhancement_calls, prioritize_calls, merge_call_results
+from .jd_digest import get_jd_digest, record_digest_use
+from .bullet_index import bullet_reuse_key, apply_bullet_reuse, restore_bullet_reuse
+from .tracing import span, set_attribute
+from .progress import ProgressCallback, notify_progress
+from .singleflight import get_flight_group, content_key
+from .shared_cache import get_shared_cache
+from .scheduler import get_scheduler
 logger = logging.getLogger(__name__)
+llm_logger = LLMLogger()
+enhancement_flight = get_flight_group("enhance")
+llm_scheduler = get_scheduler("llm")
+
+# Upper bound on concurrent enhancement calls per request; calls beyond it
+# wait their turn in priority order. The default equals ENHANCE_MAX_CALLS, so
+# on its own it never queues: an idle service issues every call at once,
+# since holding some back would only lengthen the request. The priority
+# order (prioritize_calls) takes effect when calls wait: under load, calls
+# join the shared LLM scheduler's FIFO tenant queue in that order, and
+# setting this below ENHANCE_MAX_CALLS makes the most relevant sections go
+# first within the request as well.
+ENHANCE_MAX_CONCURRENCY = int(os.getenv('ENHANCE_MAX_CONCURRENCY', '8'))
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.base import BaseLanguageModel
 
 TEMPLATE_PROMPTS = {
     "simple": {
@@ -242,51 +264,150 @@ def create_section_prompt(
     
     return section_prompt
 
-def extract_response_text(response: Any, model: BaseLanguageModel) -> str:
-    """Extract the response text based on model type."""
-    if isinstance(model, GoogleGenerativeAI):
-        return response.text if hasattr(response, 'text') else str(response)
-    elif isinstance(model, (ChatOpenAI, ChatDeepSeek, OpenAI)):
-        return response.content if hasattr(response, 'content') else str(response)
-    return str(response)
+def section_instructions(section_name: str, template_type: str = "simple") -> str:
+    """The instruction part of a section prompt, without job description or content."""
+    template_prompts = TEMPLATE_PROMPTS.get(template_type, TEMPLATE_PROMPTS['simple'])
+    if section_name not in SECTION_PROMPTS:
+        return f"""
+            Enhance the {section_name} section.
+            - Transform content to be more impactful and relevant to the target position.
+            - Use strong, action-oriented language.
+            - Add specific details and metrics where possible.
+        """
+    prompt = SECTION_PROMPTS[section_name].format(**template_prompts, job_description="", original_content="")
+    return prompt.split("JOB DESCRIPTION CONTEXT:")[0]
 
-async def enhance_resume_section(
-    section_name: str,
-    section_data: Any,
-    model: BaseLanguageModel,
+def create_batch_prompt(
+    sections: Dict[str, Any],
     job_description: Optional[str] = None,
     template_type: str = "simple"
+) -> str:
+    """Create one prompt enhancing several small sections, answered as a JSON object keyed by section."""
+    instructions = "\n".join(
+        f"SECTION \"{section_name}\":{section_instructions(section_name, template_type)}"
+        for section_name in sections
+    )
+    return f"""
+        Enhance each of the following resume sections independently, following the instructions for each section.
+        
+        {instructions}
+        
+        JOB DESCRIPTION CONTEXT:
+        {job_description or "Not provided"}
+        
+        ORIGINAL CONTENT:
+        {json.dumps(sections, indent=2)}
+        
+        Return ONLY a JSON object with exactly these keys: {", ".join(sections)}.
+        Maintain the EXACT SAME structure for each section but enhance the content.
+    """
+
+def extract_response_text(response: Any, model: Optional["BaseLanguageModel"] = None) -> str:
+    """Extract the response text from a model response."""
+    # Completion models such as GoogleGenerativeAI return plain strings; chat
+    # models (and the local/replay/recording models) return messages with content
+    if isinstance(response, str):
+        return response
+    return response.content if hasattr(response, 'content') else str(response)
+
+async def invoke_enhancement(
+    label: str,
+    prompt: str,
+    model: "BaseLanguageModel",
+    template_type: str = "simple"
+) -> Any:
+    """Send one enhancement prompt and return the parsed JSON result, or None on failure."""
+    # Results are shared with the other workers on the host, and concurrent
+    # requests sending the same prompt share one LLM call
+    cache_key = content_key(get_model_type(model), prompt)
+    cache = get_shared_cache()
+    if cache is not None:
+        cached = cache.get_json("enhance", cache_key)
+        if cached is not None:
+            return cached
+    return await enhancement_flight.do(
+        cache_key,
+        lambda: _invoke_enhancement(label, prompt, model, template_type, cache_key)
+    )
+
+async def _invoke_enhancement(
+    label: str,
+    prompt: str,
+    model: "BaseLanguageModel",
+    template_type: str,
+    cache_key: str
 ) -> Any:
-    """Enhance a single section of the resume using the LLM."""
     try:
+        async with llm_scheduler.slot():
+            with span(f"enhance.section.{label}"):
+                response = await model.ainvoke(prompt)
+
+        response_text = extract_response_text(response, model)
+        cleaned_response = clean_llm_response(response_text)
         
-        section_prompt = create_section_prompt(
-            section_name, 
-            section_data, 
-            job_description,
-            template_type
-        )
+        enhanced = parse_json_safely(cleaned_response)
 
-        response = await model.ainvoke(section_prompt)
+        llm_logger.log_interaction(
+            model_name=get_model_type(model),
+            input_text=prompt,
+            output_text=response_text,
+            metadata={"status": "success" if enhanced else "failed", "template_type": template_type},
+            usage=extract_token_usage(response),
+            stage=f"enhance.{label}"
+        )
 
-        cleaned_response = clean_llm_response(response.content)
-        
-        enhanced_section = parse_json_safely(cleaned_response)
+        if not enhanced:
+            logger.warning(f"Failed to enhance {label}, keeping original")
+            return None
 
-        if not enhanced_section:
-            logger.warning(f"Failed to enhance section {section_name}, keeping original")
-            return section_data
-            
-        return enhanced_section
+        cache = get_shared_cache()
+        if cache is not None:
+            cache.set_json("enhance", cache_key, enhanced)
+        return enhanced
     except Exception as e:
-        logger.error(f"Error enhancing section {section_name}: {str(e)}")
-        return section_data
+        logger.error(f"Error enhancing {label}: {str(e)}")
+        return None
+
+async def enhance_resume_section(
+    section_name: str,
+    section_data: Any,
+    model: "BaseLanguageModel",
+    job_description: Optional[str] = None,
+    template_type: str = "simple"
+) -> Any:
+    """Enhance a single section of the resume using the LLM."""
+    section_prompt = create_section_prompt(
+        section_name, 
+        section_data, 
+        job_description,
+        template_type
+    )
+    enhanced_section = await invoke_enhancement(section_name, section_prompt, model, template_type)
+    return enhanced_section if enhanced_section else section_data
+
+async def run_enhancement_call(
+    call: EnhancementCall,
+    resume_data: Dict[str, Any],
+    model: "BaseLanguageModel",
+    job_description: Optional[str] = None,
+    template_type: str = "simple"
+) -> Any:
+    """Run one planned call; returns the parsed result or None (see merge_call_results)."""
+    payload = call.payload(resume_data)
+    if call.is_batch:
+        prompt = create_batch_prompt(payload, job_description, template_type)
+    else:
+        prompt = create_section_prompt(call.sections[0], payload, job_description, template_type)
+    return await invoke_enhancement(call.label, prompt, model, template_type)
 
 async def enhance_resume_by_sections(
     json_data: Dict[str, Any],
-    model: BaseLanguageModel,
+    model: "BaseLanguageModel",
     job_description: Optional[str] = None,
-    template_type: str = "simple"
+    template_type: str = "simple",
+    deadline: Optional[float] = None,
+    report: Optional[Dict[str, Any]] = None,
+    progress: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Enhance each section of the resume asynchronously and combine results.
@@ -296,6 +417,13 @@ async def enhance_resume_by_sections(
         model: The LLM to use for enhancements
         job_description: Optional job description to tailor the resume
         template_type: Style template to use (simple or creative)
+        deadline: Optional time.monotonic() value; calls still running then
+            are cancelled and their sections keep the original content
+        report: Optional dict that receives `degraded_sections` (sections
+            that kept original content), `timed_out_sections`,
+            `jd_tokens_saved`, `reused_bullets` and `novel_bullets`
+        progress: Optional callback that receives a `section_enhanced` event
+            for each section as soon as all the calls covering it finish
     
     Returns:
         Dict containing the enhanced resume data
@@ -307,24 +435,95 @@ async def enhance_resume_by_sections(
         resume_data = json_data
         has_details_wrapper = False
         
-    enhancement_tasks = {}
-    for section_name, section_data in resume_data.items():
-        task = asyncio.create_task(
-            enhance_resume_section(
-                section_name, 
-                section_data, 
-                model, 
-                job_description,
-                template_type
-            )
-        )
-        enhancement_tasks[section_name] = task
-    
-    enhanced_sections = {}
-    for section_name, task in enhancement_tasks.items():
-        enhanced_sections[section_name] = await task
+    # Small sections share a call and large array sections are split per
+    # entry, so no single call dominates the request's wall-clock time.
+    # The calls most relevant to the job description are issued first.
+    # Prompts carry a cached digest of the job description, not the raw text
+    with span("enhance.jd_digest"):
+        digest_timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        digest = await get_jd_digest(job_description, model, timeout=digest_timeout)
+    prompt_job_description = digest.text if digest else job_description
 
-    enhanced_resume = enhanced_sections
+    # Bullets enhanced before for the same template and job description are
+    # reused; only novel ones are sent to the model
+    with span("enhance.bullet_reuse"):
+        reuse_key = bullet_reuse_key(template_type, prompt_job_description)
+        pending_data, reuse_plan = apply_bullet_reuse(resume_data, reuse_key)
+
+    calls = prioritize_calls(plan_enhancement_calls(pending_data), pending_data, job_description)
+    semaphore = asyncio.Semaphore(ENHANCE_MAX_CONCURRENCY)
+
+    jd_tokens_saved = record_digest_use(digest, len(calls)) if digest else 0
+    if jd_tokens_saved:
+        set_attribute("jd_tokens_saved", jd_tokens_saved)
+    if reuse_plan.reused_bullets:
+        set_attribute("reused_bullets", reuse_plan.reused_bullets)
+
+    async def run_call(call: EnhancementCall) -> Any:
+        async with semaphore:
+            return await run_enhancement_call(call, pending_data, model, prompt_job_description, template_type)
+
+    tasks = [asyncio.create_task(run_call(call)) for call in calls]
+    open_calls = {name: sum(name in call.sections for call in calls) for name in resume_data}
+    reported = set()
+
+    def report_section(name: str, content: Any, degraded: bool) -> None:
+        reported.add(name)
+        notify_progress(progress, "section_enhanced", {"section": name, "content": content, "degraded": degraded})
+
+    def report_finished_section(name: str) -> None:
+        section_calls = [(call, task) for call, task in zip(calls, tasks) if name in call.sections]
+        section_degraded: List[str] = []
+        merged = merge_call_results(pending_data, [call for call, _ in section_calls],
+                                    [task.result() for _, task in section_calls], section_degraded)
+        restored = restore_bullet_reuse({name: merged[name]}, reuse_plan, section_degraded, learn=False)
+        report_section(name, restored[name], name in section_degraded)
+
+    if progress is not None:
+        # Sections without calls (empty, or every bullet reused) are final already
+        for name in resume_data:
+            if not open_calls[name]:
+                report_finished_section(name)
+
+    timed_out: List[str] = []
+    if tasks:
+        pending = set(tasks)
+        return_when = asyncio.ALL_COMPLETED if progress is None else asyncio.FIRST_COMPLETED
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=return_when)
+            if not done:
+                break
+            if progress is not None:
+                for call, task in zip(calls, tasks):
+                    if task not in done:
+                        continue
+                    for name in call.sections:
+                        open_calls[name] -= 1
+                        if not open_calls[name]:
+                            report_finished_section(name)
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            timed_out = [name for call, task in zip(calls, tasks) if task in pending for name in call.sections]
+            logger.warning(f"Enhancement deadline reached, keeping original content for: {', '.join(dict.fromkeys(timed_out))}")
+
+    results = [None if task.cancelled() else task.result() for task in tasks]
+    degraded: List[str] = []
+    enhanced_resume = merge_call_results(pending_data, calls, results, degraded)
+    enhanced_resume = restore_bullet_reuse(enhanced_resume, reuse_plan, degraded)
+    if progress is not None:
+        for name in resume_data:
+            if name not in reported:
+                report_section(name, enhanced_resume[name], name in degraded)
+
+    if report is not None:
+        report["degraded_sections"] = degraded
+        report["timed_out_sections"] = [name for name in degraded if name in timed_out]
+        report["jd_tokens_saved"] = jd_tokens_saved
+        report["reused_bullets"] = reuse_plan.reused_bullets
+        report["novel_bullets"] = reuse_plan.novel_bullets
     
     if has_details_wrapper:
         result = {'details': enhanced_resume}
@@ -337,20 +536,30 @@ async def enhance_resume_by_sections(
 async def enhance_resume_with_model(
     json_data: Dict[str, Any],
     job_description: Optional[str] = None,
-    template_type: str = "simple"
-) -> Dict[str, Any]:
+    template_type: str = "simple",
+    deadline: Optional[float] = None,
+    return_metadata: bool = False,
+    progress: Optional[ProgressCallback] = None
+) -> Any:
     """
     Enhance resume data using the specified LLM model, section by section.
     
     Args:
         json_data: The resume data in JSON format
         job_description: Optional job description to tailor the resume
-        modelmanager: Optional SimpleModelManager instance
         template_type: Style template to use (simple or creative)
+        deadline: Optional time.monotonic() value by which enhancement must
+            finish; sections not enhanced by then keep their original content
+        return_metadata: Also return the report described in
+            enhance_resume_by_sections
+        progress: Optional callback for per-section `section_enhanced` events
     
     Returns:
-        Dict containing the enhanced resume data
+        Dict containing the enhanced resume data, or a (data, metadata)
+        tuple when return_metadata is set
     """
+    metadata: Dict[str, Any] = {"degraded_sections": [], "timed_out_sections": [], "jd_tokens_saved": 0,
+                                "reused_bullets": 0, "novel_bullets": 0}
     try:
 
         model = SimpleModelManager().get_model()
@@ -362,15 +571,23 @@ async def enhance_resume_with_model(
             json_data, 
             model, 
             jd,
-            template_type
+            template_type,
+            deadline=deadline,
+            report=metadata,
+            progress=progress
         )
         
         logger.info("Resume enhancement completed successfully")
-        return enhanced_json
         
     except Exception as e:
         logger.error(f"Resume enhancement failed: {str(e)}")
-        return json_data
+        enhanced_json = json_data
+        resume_data = json_data.get('details', json_data) if isinstance(json_data.get('details'), dict) else json_data
+        metadata["degraded_sections"] = list(resume_data)
+
+    if return_metadata:
+        return enhanced_json, metadata
+    return enhanced_json
 
 async def process_resume(
     json_data: Dict[str, Any],
@@ -1,20 +1,31 @@
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, List, Union, BinaryIO, TYPE_CHECKING
 import io
+import copy
 import json
+import asyncio
 import logging
-from langchain_core.language_models.base import BaseLanguageModel
-from langchain_google_genai import GoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-from langchain_deepseek import ChatDeepSeek
 from PyPDF2 import PdfReader
-from .llm_logger import LLMLogger
-from .modelmanager import SimpleModelManager
+from .llm_logger import LLMLogger, extract_token_usage
+from .contacts import extract_contacts, merge_contacts, prefilled_fields, known_networks
+from .segmenter import ExtractionSegment, plan_extraction_segments, SCHEMA_SECTIONS
+from .modelmanager import SimpleModelManager, get_model_type
+from .tracing import span
+from .progress import ProgressCallback, notify_progress
+from .singleflight import get_flight_group, content_key
+from .shared_cache import get_shared_cache
+from .scheduler import get_scheduler
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 llm_logger = LLMLogger()
 logger = logging.getLogger(__name__)
+# Identical extraction prompts in flight at the same time share one LLM call
+extraction_flight = get_flight_group("extract")
+llm_scheduler = get_scheduler("llm")
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.base import BaseLanguageModel
 
 def clean_text(text: str) -> str:
     """Clean and normalize extracted text"""
@@ -39,83 +50,115 @@ def extract_text_and_hyperlinks(pdf_file) -> Tuple[str, list]:
                         "page": page_num + 1,
                         "url": annot_obj["/A"]["/URI"]
                     })
-    print(text_content)
     return text_content, hyperlinks
 
 import json
 
-def create_extraction_prompt(resume_text: str, hyperlinks: list) -> str:
-    """Create the prompt for resume information extraction"""
-    schema_template = {
-        "basics": {
-            "name": "string",
-            "label": "string",
-            "email": "string",
-            "phone": "string",
-            "url": "string",
-            "summary": "string",
-            "location": {
-                "city": "string",
-                "countryCode": "string"
-            },
-            "profiles": [
-                {
-                    "network": "string",
-                    "username": "string",
-                    "url": "string"
-                }
-            ]
+EXTRACTION_SCHEMA = {
+    "basics": {
+        "name": "string",
+        "label": "string",
+        "email": "string",
+        "phone": "string",
+        "url": "string",
+        "summary": "string",
+        "location": {
+            "city": "string",
+            "countryCode": "string"
         },
-        "work": [
-            {
-                "name": "string",
-                "position": "string",
-                "location": "string",
-                "startDate": "string",
-                "endDate": "string",
-                "highlights": ["string"]
-            }
-        ],
-        "education": [
+        "profiles": [
             {
-                "institution": "string",
-                "area": "string",
-                "studyType": "string",
-                "startDate": "string",
-                "endDate": "string",
-                "courses": ["string"]
-            }
-        ],
-        "skills": [
-            {
-                "name": "string",
-                "keywords": ["string"]
-            }
-        ],
-        "projects": [
-            {
-                "name": "string",
-                "description": "string",
-                "startDate": "string",
-                "endDate": "string"
-            }
-        ],
-        "publications": [
-            {
-                "name": "string",
-                "releaseDate": "string",
-                "authors": ["string"],
-                "doi": "string",
+                "network": "string",
+                "username": "string",
                 "url": "string"
             }
-        ],
-        "awards": [
-            {
-                "title": "string",
-                "awarder": "string"
-            }
         ]
-    }
+    },
+    "work": [
+        {
+            "name": "string",
+            "position": "string",
+            "location": "string",
+            "startDate": "string",
+            "endDate": "string",
+            "highlights": ["string"]
+        }
+    ],
+    "education": [
+        {
+            "institution": "string",
+            "area": "string",
+            "studyType": "string",
+            "startDate": "string",
+            "endDate": "string",
+            "courses": ["string"]
+        }
+    ],
+    "skills": [
+        {
+            "name": "string",
+            "keywords": ["string"]
+        }
+    ],
+    "projects": [
+        {
+            "name": "string",
+            "description": "string",
+            "startDate": "string",
+            "endDate": "string"
+        }
+    ],
+    "publications": [
+        {
+            "name": "string",
+            "releaseDate": "string",
+            "authors": ["string"],
+            "doi": "string",
+            "url": "string"
+        }
+    ],
+    "awards": [
+        {
+            "title": "string",
+            "awarder": "string"
+        }
+    ]
+}
+
+def create_extraction_prompt(resume_text: str,
+                             hyperlinks: list,
+                             prefilled_fields: Optional[list] = None,
+                             sections: Optional[list] = None,
+                             known_networks: Optional[list] = None) -> str:
+    """
+    Create the prompt for resume information extraction.
+
+    Fields in `prefilled_fields` (basics keys such as email, phone and url
+    that were extracted locally) are left out of the requested structure, so
+    the model does not spend output tokens on them. Profiles stay requested,
+    but only on networks other than `known_networks`. With
+    `sections`, only those top-level sections are requested and the text is
+    treated as one segment of a longer resume.
+    """
+    schema_template = {section: copy.deepcopy(EXTRACTION_SCHEMA[section]) for section in (sections or EXTRACTION_SCHEMA)}
+
+    prefilled_fields = [field for field in (prefilled_fields or []) if field in schema_template.get("basics", {})]
+    for field in prefilled_fields:
+        del schema_template["basics"][field]
+    prefilled_instruction = (
+        f"\n- Do not output these basics fields, they are already known: {', '.join(prefilled_fields)}"
+        if prefilled_fields else ""
+    )
+    if known_networks and "profiles" in schema_template.get("basics", {}):
+        prefilled_instruction += (
+            f"\n- Profiles on these networks are already known, list only profiles on other networks: "
+            f"{', '.join(known_networks)}"
+        )
+    if sections:
+        prefilled_instruction += (
+            f"\n- The text is one part of a longer resume: extract only {', '.join(schema_template)} "
+            f"and return a JSON object with exactly these keys"
+        )
 
     return f"""Extract and structure resume information from the provided text into JSON format.
 Below is the resume content:
@@ -139,7 +182,7 @@ Follow this exact structure:
 - Map scattered work experience appropriately
 - Group similar skills under categories
 - Preserve exact text for important details
-- Break down compound information into appropriate fields
+- Break down compound information into appropriate fields{prefilled_instruction}
 - Return only valid JSON without additional text"""
 
 def remove_null_values(obj):
@@ -150,22 +193,17 @@ def remove_null_values(obj):
         return [remove_null_values(item) for item in obj]
     return "" if obj is None else obj
 
-def get_model_name(model: BaseLanguageModel) -> str:
+def get_model_name(model: "BaseLanguageModel") -> str:
     """Get the standardized name for the model type"""
-    model_mapping = {
-        GoogleGenerativeAI: "gemini",
-        ChatOpenAI: "openai",
-        ChatDeepSeek: "deepseek"
-    }
-    return model_mapping.get(type(model), "unknown")
-
-def extract_response_text(response: Any, model: BaseLanguageModel) -> str:
-    """Extract text content from model response based on model type"""
-    if isinstance(model, GoogleGenerativeAI):
-        return response.text if hasattr(response, 'text') else str(response)
-    elif isinstance(model, (ChatOpenAI, ChatDeepSeek)):
-        return response.content if hasattr(response, 'content') else str(response)
-    return str(response)
+    return get_model_type(model)
+
+def extract_response_text(response: Any, model: Optional["BaseLanguageModel"] = None) -> str:
+    """Extract text content from a model response"""
+    # Completion models such as GoogleGenerativeAI return plain strings; chat
+    # models (and the local/replay/recording models) return messages with content
+    if isinstance(response, str):
+        return response
+    return response.content if hasattr(response, 'content') else str(response)
 
 def save_input_json(json_data: Dict[str, Any], filename: str = "resume1input.json") -> None:
     """Save the input JSON to the specified file"""
@@ -180,17 +218,124 @@ def save_input_json(json_data: Dict[str, Any], filename: str = "resume1input.jso
     except Exception as e:
         logger.error(f"Error saving input JSON: {str(e)}")
 
+async def run_extraction_call(
+    model: "BaseLanguageModel",
+    model_type: str,
+    prompt: str,
+    stage: str = "extract",
+    require_basics: bool = True
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Send one extraction prompt and parse the JSON it returns.
+
+    Args:
+        model: Initialized language model
+        model_type: Provider name for the LLM log
+        prompt: Prompt from create_extraction_prompt
+        stage: LLM log stage
+        require_basics: Treat a response without `basics` as invalid
+
+    Returns:
+        (parsed resume data, None) on success or (None, error message)
+    """
+    return await extraction_flight.do(
+        content_key(model_type, prompt, require_basics),
+        lambda: _run_extraction_call(model, model_type, prompt, stage, require_basics)
+    )
+
+async def _run_extraction_call(
+    model: "BaseLanguageModel",
+    model_type: str,
+    prompt: str,
+    stage: str,
+    require_basics: bool
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    async with llm_scheduler.slot():
+        result = await model.ainvoke(prompt)
+    usage = extract_token_usage(result)
+    if usage:
+        logger.info(f"Extraction ({stage}) used {usage['input_tokens']} input / {usage['output_tokens']} output tokens")
+    
+    response_text = extract_response_text(result, model)
+    
+    cleaned_result = response_text.replace('```json', '').replace('```', '').strip()
+    
+    try:
+        response_json = json.loads(cleaned_result)
+        cleaned_json = remove_null_values(response_json)
+        error_msg = None
+        if not isinstance(cleaned_json, dict) or (require_basics and "basics" not in cleaned_json):
+            error_msg = "Invalid JSON structure - missing required steps (Step1, Step2, Step3)"
+    except json.JSONDecodeError as e:
+        cleaned_json = None
+        error_msg = f"Invalid JSON response: {str(e)}"
+
+    llm_logger.log_interaction(
+        model_name=model_type,
+        input_text=prompt,
+        output_text=cleaned_result,
+        metadata={"error": error_msg, "status": "failed"} if error_msg else {"status": "success"},
+        usage=usage,
+        stage=stage
+    )
+    if error_msg:
+        return None, error_msg
+    return cleaned_json, None
+
+async def extract_segmented(
+    model: "BaseLanguageModel",
+    model_type: str,
+    segments: List[ExtractionSegment],
+    hyperlinks: list,
+    prefilled_fields: list,
+    known_networks: Optional[list] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Extract each segment concurrently with a prompt scoped to its sections and merge the results.
+
+    Returns:
+        Resume data in the single-call output shape, or None if any segment failed
+    """
+    async def extract_segment(segment: ExtractionSegment) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        prompt = create_extraction_prompt(segment.text, hyperlinks, prefilled_fields, segment.sections, known_networks)
+        with span(f"extract.segment.{segment.label}"):
+            return await run_extraction_call(model, model_type, prompt, stage=f"extract.{segment.label}",
+                                             require_basics="basics" in segment.sections)
+
+    results = await asyncio.gather(*(extract_segment(segment) for segment in segments))
+
+    merged: Dict[str, Any] = {}
+    for segment, (data, error) in zip(segments, results):
+        if error:
+            logger.warning(f"Segment {segment.label} failed ({error}), falling back to single-call extraction")
+            return None
+        for section in segment.sections:
+            if section in data:
+                merged[section] = data[section]
+    if "basics" not in merged:
+        return None
+    return {section: merged[section] for section in SCHEMA_SECTIONS if section in merged}
+
 async def convert_pdf_to_json_schema(
-    pdf_content: bytes,
-    save_input: bool = False
+    pdf_content: Union[bytes, BinaryIO],
+    save_input: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    content_hash: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Convert PDF content to structured JSON schema.
+
+    Long resumes with recognisable section headings are extracted in
+    concurrent per-segment calls; others in a single call.
     
     Args:
-        pdf_content: Raw PDF file content in bytes
+        pdf_content: Raw PDF file content in bytes, or a seekable binary
+            stream (e.g. a spooled upload) that is read in place
         save_input: Whether to save the extracted JSON to a file
         model: Optional Modelmanager instance.
+        progress: Optional callback that receives a `text_extracted` event
+            once the PDF text has been read
+        content_hash: Hash identifying the PDF content; required for streams
     
     Returns:
         Dict containing the structured resume data or error message
@@ -200,61 +345,60 @@ async def convert_pdf_to_json_schema(
         instance = SimpleModelManager()
         model = instance.get_model()
         
-        resume_text, hyperlinks = extract_text_and_hyperlinks(io.BytesIO(pdf_content))
+        with span("extract.pdf_parse"):
+            pdf_file = io.BytesIO(pdf_content) if isinstance(pdf_content, bytes) else pdf_content
+            pdf_file.seek(0)
+            resume_text, hyperlinks = extract_text_and_hyperlinks(pdf_file)
         if not resume_text.strip():
             return {"error": "No text could be extracted from the PDF"}
+        notify_progress(progress, "text_extracted", {"characters": len(resume_text), "hyperlinks": len(hyperlinks)})
+
+        # Results are shared with the other workers on the host; the schema is
+        # part of the key so a schema change does not serve stale shapes
+        cache = get_shared_cache()
+        cache_key = content_key(content_hash or pdf_content, instance.current_model_type, EXTRACTION_SCHEMA)
+        cached_json = cache.get_json("extract", cache_key) if cache is not None else None
+        if cached_json is not None:
+            logger.info("Using cached extraction result")
+            if save_input:
+                save_input_json(cached_json)
+            return cached_json
 
-        prompt = create_extraction_prompt(resume_text, hyperlinks)
+        # Contacts and profile links are recovered locally; the model only
+        # generates the remaining fields
+        with span("extract.contacts"):
+            contacts, remaining_links = extract_contacts(resume_text, hyperlinks)
         
         try:
-            # Use the properly initialized model
-            result = await model.ainvoke(prompt)
-            logger.info(f"Extraction result: {result.response_metadata.get('token_usage').get('completion_tokens')}")
-            
-            response_text = extract_response_text(result, model)
-            
-            cleaned_result = response_text.replace('```json', '').replace('```', '').strip()
-            
-            try:
-                response_json = json.loads(cleaned_result)
-                cleaned_json = remove_null_values(response_json)
-
-                if not isinstance(cleaned_json, dict) or "basics" not in cleaned_json:
-                
-                    error_msg = "Invalid JSON structure - missing required steps (Step1, Step2, Step3)"
-                    llm_logger.log_interaction(
-                        model_name=instance.current_model_type,
-                        input_text=prompt,
-                        output_text=cleaned_result,
-                        metadata={"error": error_msg, "status": "failed"}
+            cleaned_json = None
+            segments = plan_extraction_segments(resume_text)
+            if segments:
+                with span("extract.llm"):
+                    cleaned_json = await extract_segmented(
+                        model, instance.current_model_type, segments, remaining_links,
+                        prefilled_fields(contacts), known_networks(contacts)
                     )
+
+            if cleaned_json is None:
+                prompt = create_extraction_prompt(resume_text, remaining_links, prefilled_fields(contacts),
+                                                  known_networks=known_networks(contacts))
+                with span("extract.llm"):
+                    cleaned_json, error_msg = await run_extraction_call(model, instance.current_model_type, prompt)
+                if error_msg:
                     return {"error": error_msg}
 
-                # Log success
-                llm_logger.log_interaction(
-                    model_name=instance.current_model_type,
-                    input_text=prompt,
-                    output_text=json.dumps(cleaned_json, indent=2),
-                    metadata={"status": "success"}
-                )
-
-                if save_input:
-                    save_input_json(cleaned_json)
-
-                return cleaned_json
-
-            except json.JSONDecodeError as e:
-                llm_logger.log_interaction(
-                    model_name=instance.current_model_type,
-                    input_text=prompt,
-                    output_text=cleaned_result,
-                    metadata={"error": str(e), "status": "failed"}
-                )
-                return {"error": f"Invalid JSON response: {str(e)}"}
+            cleaned_json = merge_contacts(cleaned_json, contacts)
+            if cache is not None:
+                cache.set_json("extract", cache_key, cleaned_json)
+
+            if save_input:
+                save_input_json(cleaned_json)
+
+            return cleaned_json
             
         except Exception as e:
             logger.error(f"PDF processing error: {str(e)}")
             return {"error": f"Extraction failed: {str(e)}"}
     except Exception as e:
         logger.error(f"PDF processing error: {str(e)}")
-        return {"error": f"Extraction failed: {str(e)}"}
\ No newline at end of file
+        return {"error": f"Extraction failed: {str(e)}"}
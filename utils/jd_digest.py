@@ -0,0 +1,253 @@
+import os
+import re
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Any, Optional, List
+
+from .shared_cache import get_shared_cache
+from .scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+llm_scheduler = get_scheduler("llm")
+
+# Section prompts carry a compact digest of the job description instead of
+# the raw posting. The digest is built once per distinct JD and cached; JDs
+# shorter than JD_DIGEST_MIN_CHARS are used as-is since a digest would not
+# be meaningfully smaller. The local digest is extractive and costs no LLM
+# round-trip; JD_DIGEST_MODE=llm asks the model instead and falls back to
+# the local digest if the answer is unusable.
+JD_DIGEST_ENABLED = os.getenv('JD_DIGEST_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+JD_DIGEST_MODE = os.getenv('JD_DIGEST_MODE', 'local')
+JD_DIGEST_MIN_CHARS = int(os.getenv('JD_DIGEST_MIN_CHARS', '600'))
+JD_DIGEST_CACHE_SIZE = int(os.getenv('JD_DIGEST_CACHE_SIZE', '256'))
+JD_DIGEST_MAX_REQUIREMENTS = int(os.getenv('JD_DIGEST_MAX_REQUIREMENTS', '6'))
+JD_DIGEST_MAX_KEYWORDS = int(os.getenv('JD_DIGEST_MAX_KEYWORDS', '15'))
+
+DIGEST_PROMPT = """
+    Condense the job description below into a digest used to tailor a resume.
+
+    Respond in exactly this format and stay under 120 words:
+    Role: <job title>
+    Seniority: <level and years of experience, or "Not stated">
+    Key requirements:
+    - <requirement, at most 6 bullets>
+    Keywords: <comma-separated skills, tools and domain terms>
+
+    JOB DESCRIPTION:
+    {job_description}
+"""
+
+SENIORITY_PATTERN = re.compile(
+    r'\b(intern|junior|entry[- ]level|mid[- ]level|senior|staff|principal|lead|head of|director)\b', re.IGNORECASE
+)
+YEARS_PATTERN = re.compile(r'(\d+)\s*\+?\s*(?:-\s*\d+\s*)?years?', re.IGNORECASE)
+REQUIREMENT_CUES = re.compile(
+    r'\b(must|required|requirements?|experience (?:with|in)|proficien\w*|knowledge of|familiar\w*|'
+    r'strong|expert\w*|degree|ability to|hands-on|you will|responsib\w*)\b',
+    re.IGNORECASE
+)
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?;])\s+|\n+|\s+[•\-*]\s+')
+TERM_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9+#./-]*[A-Za-z0-9+#]|[A-Za-z]')
+
+STOPWORDS = frozenset("""
+    a about above across after all also an and any are as at be been being both but by can could do does
+    each either etc for from has have having how if in including into is it its join looking may more most
+    must need needs new of on one or other our ours out over per plus role should so such team than that the
+    their them then there these they this those through to under up us using via we well what when where which
+    while who will with within work working would you your years year experience strong ability skills plus
+    required requirements preferred responsibilities knowledge understanding including company candidate ideal
+""".split())
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+def normalize_job_description(job_description: str) -> str:
+    """Collapse whitespace so formatting differences map to the same digest"""
+    return " ".join(job_description.split())
+
+def hash_job_description(job_description: str) -> str:
+    return hashlib.sha256(normalize_job_description(job_description).encode('utf-8')).hexdigest()
+
+def _keywords(text: str, limit: int, exclude: frozenset = frozenset()) -> List[str]:
+    """Most frequent non-stopword terms; capitalized and symbol-bearing terms (C++, Node.js, AWS) rank higher"""
+    counts: Counter = Counter()
+    display: Dict[str, str] = {}
+    for term in TERM_PATTERN.findall(text):
+        key = term.lower().rstrip('.')
+        if len(key) < 2 or key in STOPWORDS or key in exclude or key.isdigit():
+            continue
+        boost = 2 if (term[0].isupper() or any(ch in term for ch in '+#.')) else 1
+        counts[key] += boost
+        display.setdefault(key, term.rstrip('.'))
+    return [display[key] for key, _ in counts.most_common(limit)]
+
+def build_local_digest(job_description: str) -> str:
+    """
+    Extractive digest of a job description, without an LLM.
+
+    Picks the sentences that read like requirements, the most prominent
+    terms and any stated seniority or years of experience.
+    """
+    lines = [line.strip() for line in job_description.strip().splitlines() if line.strip()]
+    role = lines[0][:80] if lines else "Not stated"
+
+    seniority_match = SENIORITY_PATTERN.search(job_description)
+    years_match = YEARS_PATTERN.search(job_description)
+    seniority = ", ".join(filter(None, [
+        seniority_match.group(1).lower() if seniority_match else None,
+        f"{years_match.group(1)}+ years" if years_match else None
+    ])) or "Not stated"
+
+    requirements = []
+    seen = set()
+    for sentence in SENTENCE_SPLIT.split(job_description):
+        sentence = sentence.strip(" \t-*•")
+        if len(sentence) < 15 or not REQUIREMENT_CUES.search(sentence):
+            continue
+        key = sentence.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        requirements.append(sentence if len(sentence) <= 160 else sentence[:157].rsplit(" ", 1)[0] + "...")
+        if len(requirements) >= JD_DIGEST_MAX_REQUIREMENTS:
+            break
+
+    digest = [f"Role: {role}", f"Seniority: {seniority}", "Key requirements:"]
+    digest.extend(f"- {requirement}" for requirement in requirements or ["Not stated"])
+    role_terms = frozenset(term.lower() for term in TERM_PATTERN.findall(role))
+    digest.append(f"Keywords: {', '.join(_keywords(job_description, JD_DIGEST_MAX_KEYWORDS, role_terms))}")
+    return "\n".join(digest)
+
+def _is_valid_digest(text: str) -> bool:
+    return "Keywords:" in text and "Role:" in text and len(text) < 2000
+
+class JDDigest:
+    """A digest and the sizes needed to report what it saves"""
+    __slots__ = ("text", "source", "raw_tokens", "digest_tokens")
+
+    def __init__(self, text: str, source: str, raw_tokens: int):
+        self.text = text
+        self.source = source
+        self.raw_tokens = raw_tokens
+        self.digest_tokens = estimate_tokens(text)
+
+    @property
+    def tokens_saved_per_prompt(self) -> int:
+        return max(0, self.raw_tokens - self.digest_tokens)
+
+class JDDigestCache:
+    """Thread-safe LRU cache of digests keyed by JD hash, with usage counters"""
+
+    def __init__(self, max_size: int = JD_DIGEST_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, JDDigest]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "prompts": 0, "tokens_saved": 0}
+
+    def get(self, key: str) -> Optional[JDDigest]:
+        with self._lock:
+            digest = self._entries.get(key)
+            if digest is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return digest
+
+    def put(self, key: str, digest: JDDigest) -> None:
+        with self._lock:
+            self._entries[key] = digest
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def record_use(self, digest: JDDigest, prompts: int) -> int:
+        """Count the prompts that carried the digest; returns the tokens saved"""
+        saved = digest.tokens_saved_per_prompt * prompts
+        with self._lock:
+            self.stats["prompts"] += prompts
+            self.stats["tokens_saved"] += saved
+        return saved
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "size": len(self._entries), "max_size": self.max_size}
+
+_cache = JDDigestCache()
+
+def get_digest_stats() -> Dict[str, Any]:
+    """Process-wide digest cache counters, including estimated tokens saved"""
+    return _cache.snapshot()
+
+async def _invoke_digest(job_description: str, model: Any) -> Any:
+    async with llm_scheduler.slot():
+        return await model.ainvoke(DIGEST_PROMPT.format(job_description=job_description))
+
+async def _build_llm_digest(job_description: str, model: Any, timeout: Optional[float]) -> Optional[str]:
+    try:
+        response = await asyncio.wait_for(_invoke_digest(job_description, model), timeout)
+        text = response if isinstance(response, str) else getattr(response, 'content', str(response))
+        text = text.strip()
+        if _is_valid_digest(text):
+            return text
+        logger.warning("LLM job description digest had an unexpected format, using local digest")
+    except Exception as e:
+        logger.error(f"Error building job description digest: {str(e)}")
+    return None
+
+async def get_jd_digest(job_description: Optional[str],
+                        model: Any = None,
+                        timeout: Optional[float] = None) -> Optional[JDDigest]:
+    """
+    Return the cached digest of a job description, building it on a miss.
+
+    Args:
+        job_description: Raw job description text
+        model: LLM used when JD_DIGEST_MODE is "llm"
+        timeout: Seconds to wait for the LLM digest before using the local one
+
+    Returns:
+        The digest, or None when digests are disabled or the JD is short
+        enough to be used as-is
+    """
+    if not JD_DIGEST_ENABLED or not job_description or len(job_description) < JD_DIGEST_MIN_CHARS:
+        return None
+
+    key = hash_job_description(job_description)
+    digest = _cache.get(key)
+    if digest is not None:
+        return digest
+
+    # Another worker on the host may already have built it
+    shared = get_shared_cache()
+    cached = shared.get_json("jd_digest", key) if shared is not None else None
+    if cached is not None:
+        digest = JDDigest(cached["text"], cached["source"], cached["raw_tokens"])
+        _cache.put(key, digest)
+        return digest
+
+    text, source = None, "local"
+    if JD_DIGEST_MODE == "llm" and model is not None:
+        text = await _build_llm_digest(job_description, model, timeout)
+        source = "llm"
+    if text is None:
+        text, source = build_local_digest(job_description), "local"
+
+    digest = JDDigest(text, source, estimate_tokens(job_description))
+    if digest.digest_tokens >= digest.raw_tokens:
+        # Nothing to gain; cache the raw text so the next request skips the work
+        digest = JDDigest(job_description, "raw", digest.raw_tokens)
+    _cache.put(key, digest)
+    if shared is not None:
+        shared.set_json("jd_digest", key, {"text": digest.text, "source": digest.source, "raw_tokens": digest.raw_tokens})
+    logger.info(f"Built {source} job description digest: {digest.raw_tokens} -> {digest.digest_tokens} tokens")
+    return digest
+
+def record_digest_use(digest: JDDigest, prompts: int) -> int:
+    """Record that `prompts` prompts carried the digest; returns the tokens saved"""
+    return _cache.record_use(digest, prompts)
@@ -1,112 +1,391 @@
 import logging
+import logging.handlers
 import json
 import os
+import io
+import re
+import glob
+import time
+import queue
+import atexit
+import threading
+import functools
 from datetime import datetime
-from typing import Dict, Any, Optional
-import tiktoken
+from typing import Dict, Any, Optional, List
+import zstandard
 
-class LLMLogger:
-    def __init__(self, log_dir: str = "logs"):
-        """Initialize LLM logger with specified log directory"""
+# Interactions are handed to a queue and written by a single listener thread,
+# so the request path never touches the disk. Each process writes its own
+# segment files, rotated by size or age and compressed into .zst archives.
+LLM_LOG_DIR = os.getenv('LLM_LOG_DIR', 'logs')
+LLM_LOG_MAX_BYTES = int(os.getenv('LLM_LOG_MAX_BYTES', str(16 * 1024 * 1024)))
+LLM_LOG_MAX_AGE_SECONDS = float(os.getenv('LLM_LOG_MAX_AGE_SECONDS', '3600'))
+LLM_LOG_QUEUE_SIZE = int(os.getenv('LLM_LOG_QUEUE_SIZE', '10000'))
+LLM_LOG_COMPRESSION_LEVEL = int(os.getenv('LLM_LOG_COMPRESSION_LEVEL', '10'))
+TOKEN_ENCODING = os.getenv('LLM_LOG_TOKEN_ENCODING', 'cl100k_base')
+
+SEGMENT_PREFIX = "llm_interactions_"
+SEGMENT_PID = re.compile(re.escape(SEGMENT_PREFIX) + r'\d{8}-\d{6}_(\d+)_\d+\.log$')
+MAX_LOGGED_TEXT_CHARS = 1000
+
+def extract_token_usage(response: Any) -> Optional[Dict[str, int]]:
+    """
+    Token usage reported by the provider, if the response carries any.
+
+    Chat models expose `usage_metadata` (input/output tokens); OpenAI-style
+    providers and the local models report `response_metadata['token_usage']`
+    (prompt/completion tokens). Plain-string completions carry nothing.
+
+    Returns:
+        {"input_tokens": int, "output_tokens": int} or None
+    """
+    usage = getattr(response, 'usage_metadata', None)
+    if usage and 'input_tokens' in usage:
+        return {"input_tokens": usage['input_tokens'], "output_tokens": usage.get('output_tokens', 0)}
+
+    metadata = getattr(response, 'response_metadata', None) or {}
+    token_usage = metadata.get('token_usage') or metadata.get('usage') or {}
+    if 'prompt_tokens' in token_usage:
+        return {"input_tokens": token_usage['prompt_tokens'], "output_tokens": token_usage.get('completion_tokens', 0)}
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once; None if it cannot be loaded"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"tiktoken unavailable, estimating token counts: {str(e)}")
+        return None
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or estimate from the word count without it"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return int(len(text.split()) * 1.3)
+
+def _truncate(text: str) -> str:
+    return text[:MAX_LOGGED_TEXT_CHARS] + "..." if len(text) > MAX_LOGGED_TEXT_CHARS else text
+
+def format_interaction(entry: Dict[str, Any]) -> str:
+    """
+    Render a queued interaction as the JSON logged for it.
+
+    Runs on the listener thread, so tokenizing the full prompt and output
+    (when the provider reported no usage) stays off the request path.
+    """
+    usage = entry.get("usage")
+    if usage:
+        input_tokens, output_tokens, source = usage["input_tokens"], usage["output_tokens"], "provider"
+    else:
+        input_tokens, output_tokens, source = count_tokens(entry["input_text"]), count_tokens(entry["output_text"]), "estimated"
+
+    return json.dumps({
+        "timestamp": entry["timestamp"],
+        "model_name": entry["model_name"],
+        "stage": entry.get("stage"),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+        "usage_source": source,
+        "input_text": _truncate(entry["input_text"]),
+        "output_text": _truncate(entry["output_text"]),
+        "metadata": entry.get("metadata") or {}
+    })
+
+class InteractionFormatter(logging.Formatter):
+    """Formats queued interaction entries; other records are formatted as usual"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = getattr(record, 'llm_entry', None)
+        if entry is not None:
+            record.msg = format_interaction(entry)
+            record.args = None
+        return super().format(record)
+
+class SegmentFileHandler(logging.Handler):
+    """
+    Writes records to per-process segment files and archives full segments.
+
+    Segments are named `llm_interactions_<YYYYmmdd-HHMMSS>_<pid>_<seq>.log`,
+    so worker processes never share a file. A segment is closed once it exceeds
+    `max_bytes` or is older than `max_age_seconds`, then compressed to
+    `<segment>.zst` and removed. Only the listener thread calls emit().
+    """
+
+    def __init__(self,
+                 log_dir: str,
+                 max_bytes: int = LLM_LOG_MAX_BYTES,
+                 max_age_seconds: float = LLM_LOG_MAX_AGE_SECONDS,
+                 compression_level: int = LLM_LOG_COMPRESSION_LEVEL):
+        super().__init__()
         self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.compression_level = compression_level
+        self.segment_path: Optional[str] = None
+        self._stream = None
+        self._opened_at = 0.0
+        self._day = ""
+        self._sequence = 0
         os.makedirs(log_dir, exist_ok=True)
-        
-        # Set up file handler
-        log_file = os.path.join(log_dir, f"llm_interactions_{datetime.now().strftime('%Y%m%d')}.log")
-        
-        # Configure logging
-        self.logger = logging.getLogger("LLMLogger")
-        self.logger.setLevel(logging.INFO)
-        
-        # Create file handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.INFO)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s | %(levelname)s | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+
+    def _open_segment(self) -> None:
+        now = datetime.now()
+        self._sequence += 1
+        self.segment_path = os.path.join(
+            self.log_dir, f"{SEGMENT_PREFIX}{now.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}_{self._sequence}.log"
         )
-        file_handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        self.logger.addHandler(file_handler)
-        
-    def _count_tokens(self, text: str) -> int:
-        """Estimate token count using tiktoken"""
+        self._stream = open(self.segment_path, 'a', encoding='utf-8')
+        self._opened_at = time.monotonic()
+        self._day = now.strftime('%Y%m%d')
+
+    def _should_rotate(self) -> bool:
+        return (self._stream.tell() >= self.max_bytes
+                or time.monotonic() - self._opened_at >= self.max_age_seconds
+                or datetime.now().strftime('%Y%m%d') != self._day)
+
+    def _close_segment(self) -> None:
+        if self._stream is None:
+            return
+        self._stream.close()
+        self._stream = None
+        try:
+            archive_segment(self.segment_path, self.compression_level)
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Error archiving LLM log segment {self.segment_path}: {str(e)}")
+
+    def emit(self, record: logging.LogRecord) -> None:
         try:
-            encoding = tiktoken.get_encoding("cl100k_base")
-            return len(encoding.encode(text))
+            if self._stream is not None and self._should_rotate():
+                self._close_segment()
+            if self._stream is None:
+                self._open_segment()
+            self._stream.write(self.format(record) + "\n")
+            self._stream.flush()
         except Exception:
-            # Fallback to approximate token count if tiktoken fails
-            return len(text.split()) * 1.3
-    
-    def _format_log_entry(self, 
-                         model_name: str,
-                         input_text: str,
-                         output_text: str,
-                         input_tokens: int,
-                         output_tokens: int,
-                         metadata: Optional[Dict[str, Any]] = None) -> str:
-        """Format log entry as JSON string"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "model_name": model_name,
-            "input_tokens": input_tokens,
-            "output_tokens": output_tokens,
-            "total_tokens": input_tokens + output_tokens,
-            "input_text": input_text[:1000] + "..." if len(input_text) > 1000 else input_text,
-            "output_text": output_text[:1000] + "..." if len(output_text) > 1000 else output_text,
-            "metadata": metadata or {}
-        }
-        return json.dumps(log_entry)
-    
+            self.handleError(record)
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self._close_segment()
+        finally:
+            self.release()
+        super().close()
+
+def archive_segment(path: str, level: int = LLM_LOG_COMPRESSION_LEVEL) -> str:
+    """Compress a closed segment to `<path>.zst` and remove the original"""
+    archive_path = path + ".zst"
+    with open(path, 'rb') as src, open(archive_path + ".tmp", 'wb') as dst:
+        zstandard.ZstdCompressor(level=level).copy_stream(src, dst)
+    os.replace(archive_path + ".tmp", archive_path)
+    os.remove(path)
+    return archive_path
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def archive_orphaned_segments(log_dir: str, level: int = LLM_LOG_COMPRESSION_LEVEL) -> List[str]:
+    """
+    Archive live segments left behind by processes that have exited.
+
+    Segments of this process's pid are included: they predate the current
+    backend, which has not opened a segment yet when this runs.
+
+    Returns:
+        Paths of the archives written
+    """
+    archived = []
+    for path in glob.glob(os.path.join(log_dir, f"{SEGMENT_PREFIX}*.log")):
+        match = SEGMENT_PID.search(os.path.basename(path))
+        if match is None:
+            continue
+        pid = int(match.group(1))
+        if pid != os.getpid() and _pid_alive(pid):
+            continue
+        try:
+            archived.append(archive_segment(path, level))
+        except FileNotFoundError:
+            # Another process archived it first
+            continue
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Error archiving orphaned LLM log segment {path}: {str(e)}")
+    if archived:
+        logging.getLogger(__name__).info(f"Archived {len(archived)} LLM log segments of exited processes")
+    return archived
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _LogBackend:
+    """The process-wide queue, listener thread and segment writer"""
+
+    def __init__(self, log_dir: str):
+        self.log_dir = log_dir
+        self.pid = os.getpid()
+        self.file_handler = SegmentFileHandler(log_dir)
+        archive_orphaned_segments(log_dir)
+        self.file_handler.setFormatter(InteractionFormatter(
+            '%(asctime)s | %(levelname)s | %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        self.queue_handler = _DroppingQueueHandler(queue.Queue(LLM_LOG_QUEUE_SIZE))
+        self.listener = logging.handlers.QueueListener(self.queue_handler.queue, self.file_handler)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Drain the queue and archive the current segment"""
+        self.listener.stop()
+        self.file_handler.close()
+
+_backend: Optional[_LogBackend] = None
+_backend_lock = threading.Lock()
+
+def _get_backend(log_dir: str) -> _LogBackend:
+    """Start the backend on first use; a forked child starts its own"""
+    global _backend
+    with _backend_lock:
+        if _backend is None or _backend.pid != os.getpid():
+            _backend = _LogBackend(log_dir)
+            logger = logging.getLogger("LLMLogger")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            # Exactly one handler, however many LLMLogger instances exist
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+            logger.addHandler(_backend.queue_handler)
+        elif os.path.abspath(log_dir) != os.path.abspath(_backend.log_dir):
+            logging.getLogger(__name__).warning(
+                f"LLM log backend already writes to {_backend.log_dir}; ignoring log_dir={log_dir}"
+            )
+        return _backend
+
+def _reset_after_fork() -> None:
+    # The parent's listener thread does not exist in the child and its lock
+    # may have been held mid-fork; the child starts its own backend on first use
+    global _backend, _backend_lock
+    _backend = None
+    _backend_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def shutdown() -> None:
+    """Flush pending interactions and archive the current segment"""
+    global _backend
+    with _backend_lock:
+        if _backend is not None and _backend.pid == os.getpid():
+            _backend.stop()
+        _backend = None
+
+atexit.register(shutdown)
+
+def _read_segment_lines(path: str) -> List[str]:
+    if path.endswith(".zst"):
+        with open(path, 'rb') as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            return io.TextIOWrapper(reader, encoding='utf-8').readlines()
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.readlines()
+
+class LLMLogger:
+    def __init__(self, log_dir: str = LLM_LOG_DIR):
+        """Initialize LLM logger with specified log directory"""
+        self.log_dir = log_dir
+        self._backend = _get_backend(log_dir)
+        self.logger = logging.getLogger("LLMLogger")
+
+    def _current_backend(self) -> _LogBackend:
+        """The backend of the calling process; module-level loggers outlive a pre-fork"""
+        if self._backend.pid != os.getpid():
+            self._backend = _get_backend(self.log_dir)
+        return self._backend
+
+    @property
+    def dropped(self) -> int:
+        """Interactions dropped because the write queue was full"""
+        return self._current_backend().queue_handler.dropped
+
     def log_interaction(self,
                        model_name: str,
                        input_text: str,
                        output_text: str,
-                       metadata: Optional[Dict[str, Any]] = None) -> None:
-        """Log an LLM interaction with token counts"""
+                       metadata: Optional[Dict[str, Any]] = None,
+                       usage: Optional[Dict[str, int]] = None,
+                       stage: Optional[str] = None) -> None:
+        """
+        Queue an LLM interaction for logging.
+
+        Args:
+            model_name: Model type that served the call
+            input_text: Full prompt
+            output_text: Full response text
+            metadata: Extra fields stored with the entry
+            usage: Provider-reported usage from extract_token_usage(); token
+                counts are computed on the listener thread when missing
+            stage: Pipeline stage that made the call (e.g. "extract", "enhance.skills")
+        """
         try:
-            # Count tokens
-            input_tokens = self._count_tokens(input_text)
-            output_tokens = self._count_tokens(output_text)
-            
-            # Format and write log entry
-            log_entry = self._format_log_entry(
-                model_name=model_name,
-                input_text=input_text,
-                output_text=output_text,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                metadata=metadata
-            )
-            
-            self.logger.info(log_entry)
-            
+            self._current_backend()
+            self.logger.info("llm_interaction", extra={"llm_entry": {
+                "timestamp": datetime.now().isoformat(),
+                "model_name": model_name,
+                "stage": stage,
+                "input_text": input_text,
+                "output_text": output_text,
+                "usage": usage,
+                "metadata": metadata
+            }})
         except Exception as e:
             self.logger.error(f"Error logging LLM interaction: {str(e)}")
 
-    def get_usage_stats(self) -> Dict[str, Any]:
-        """Get usage statistics from the log file"""
+    def segment_paths(self, day: Optional[str] = None) -> List[str]:
+        """Live and archived segments of all processes for a day (YYYYmmdd, default today)"""
+        day = day or datetime.now().strftime('%Y%m%d')
+        pattern = os.path.join(self.log_dir, f"{SEGMENT_PREFIX}{day}-*.log")
+        return sorted(glob.glob(pattern) + glob.glob(pattern + ".zst"))
+
+    def get_usage_stats(self, day: Optional[str] = None) -> Dict[str, Any]:
+        """Get usage statistics from the day's log segments (default today)"""
         stats = {
             "total_interactions": 0,
             "total_tokens": 0,
             "models": {},
+            "stages": {},
+            "usage_sources": {},
             "average_tokens_per_request": 0
         }
         
         try:
-            log_file = os.path.join(self.log_dir, f"llm_interactions_{datetime.now().strftime('%Y%m%d')}.log")
-            
-            if not os.path.exists(log_file):
-                return stats
-                
-            with open(log_file, 'r') as f:
-                for line in f:
+            for segment_path in self.segment_paths(day):
+                try:
+                    lines = _read_segment_lines(segment_path)
+                except (FileNotFoundError, zstandard.ZstdError):
+                    # Archived or still being compressed by its owner
+                    continue
+
+                for line in lines:
                     try:
                         # Extract JSON from log line
-                        log_data = json.loads(line.split(" | ")[-1])
+                        log_data = json.loads(line.split(" | ", 2)[-1])
                         
                         stats["total_interactions"] += 1
                         stats["total_tokens"] += log_data["total_tokens"]
@@ -119,8 +398,20 @@ class LLMLogger:
                             
                         stats["models"][log_data["model_name"]]["interactions"] += 1
                         stats["models"][log_data["model_name"]]["total_tokens"] += log_data["total_tokens"]
+
+                        stage = stats["stages"].setdefault(log_data.get("stage") or "unknown", {
+                            "interactions": 0,
+                            "input_tokens": 0,
+                            "output_tokens": 0
+                        })
+                        stage["interactions"] += 1
+                        stage["input_tokens"] += log_data["input_tokens"]
+                        stage["output_tokens"] += log_data["output_tokens"]
+
+                        source = log_data.get("usage_source", "estimated")
+                        stats["usage_sources"][source] = stats["usage_sources"].get(source, 0) + 1
                         
-                    except json.JSONDecodeError:
+                    except (json.JSONDecodeError, KeyError, TypeError):
                         continue
                         
             if stats["total_interactions"] > 0:
@@ -130,4 +421,4 @@ class LLMLogger:
             
         except Exception as e:
             self.logger.error(f"Error getting usage stats: {str(e)}")
-            return stats
\ No newline at end of file
+            return stats
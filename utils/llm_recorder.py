@@ -0,0 +1,155 @@
+import io
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+def hash_prompt(prompt: Any) -> str:
+    """Stable key for a prompt, used to look up recorded responses"""
+    return hashlib.sha256(str(prompt).encode('utf-8')).hexdigest()
+
+def response_to_text(response: Any) -> str:
+    """Plain text of a provider response (chat message, LLM string or local response)"""
+    if isinstance(response, str):
+        return response
+    if hasattr(response, 'content'):
+        return response.content
+    if hasattr(response, 'text'):
+        return response.text
+    return str(response)
+
+class RecordStore:
+    """
+    Append-only, zstd-compressed store of full prompt/response pairs.
+
+    Records are JSON lines. They are buffered and written as one zstd frame
+    per batch; the file is a plain concatenation of frames, so a reader can
+    stream it even while another process is still appending.
+    """
+
+    def __init__(self, path: str, flush_every: int = 16, level: int = 10):
+        self.path = path
+        self.flush_every = flush_every
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._buffer: List[bytes] = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        atexit.register(self.flush)
+
+    def append(self,
+               prompt: str,
+               response_text: str,
+               latency_seconds: float,
+               model_type: str,
+               response_metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Buffer a single interaction, flushing once enough records are pending"""
+        record = {
+            "prompt_hash": hash_prompt(prompt),
+            "timestamp": datetime.now().isoformat(),
+            "model_type": model_type,
+            "latency_seconds": latency_seconds,
+            "prompt": prompt,
+            "response": response_text,
+            "response_metadata": response_metadata or {}
+        }
+        line = json.dumps(record, default=str).encode('utf-8') + b"\n"
+
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write all buffered records to disk as one compressed frame"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        frame = self._compressor.compress(b"".join(self._buffer))
+        with open(self.path, 'ab') as f:
+            f.write(frame)
+        self._buffer = []
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    """Read every record from a store file, in recording order"""
+    records = []
+    with open(path, 'rb') as f:
+        reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        for line in io.TextIOWrapper(reader, encoding='utf-8'):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt record in {path}")
+    return records
+
+def load_records_by_hash(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Index the records of a store file by prompt hash"""
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    for record in read_records(path):
+        index.setdefault(record["prompt_hash"], []).append(record)
+    logger.info(f"Loaded {sum(len(r) for r in index.values())} recorded interactions from {path}")
+    return index
+
+_STORES: Dict[str, RecordStore] = {}
+_STORES_LOCK = threading.Lock()
+
+def get_record_store(path: str) -> RecordStore:
+    """Return the process-wide store for a path"""
+    with _STORES_LOCK:
+        if path not in _STORES:
+            _STORES[path] = RecordStore(path)
+        return _STORES[path]
+
+class RecordingModel:
+    """
+    Wraps a provider model and records every call at full fidelity.
+
+    Anything other than invoke/ainvoke is delegated to the wrapped model.
+    """
+
+    def __init__(self, model: Any, store: RecordStore, model_type: str):
+        self.model = model
+        self.store = store
+        self.model_type = model_type
+
+    def _record(self, prompt: Any, response: Any, latency_seconds: float) -> None:
+        try:
+            self.store.append(
+                prompt=str(prompt),
+                response_text=response_to_text(response),
+                latency_seconds=latency_seconds,
+                model_type=self.model_type,
+                response_metadata=getattr(response, 'response_metadata', None)
+            )
+        except Exception as e:
+            logger.error(f"Error recording LLM interaction: {str(e)}")
+
+    async def ainvoke(self, prompt: Any, *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        response = await self.model.ainvoke(prompt, *args, **kwargs)
+        self._record(prompt, response, time.perf_counter() - start)
+        return response
+
+    def invoke(self, prompt: Any, *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        response = self.model.invoke(prompt, *args, **kwargs)
+        self._record(prompt, response, time.perf_counter() - start)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model, name)
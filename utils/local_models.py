@@ -0,0 +1,254 @@
+import json
+import math
+import random
+import asyncio
+import logging
+import time
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Markers used to recognise which pipeline stage a prompt belongs to
+EXTRACTION_PROMPT_PREFIX = "Extract and structure resume information"
+ORIGINAL_CONTENT_MARKER = "ORIGINAL CONTENT:"
+RETURN_MARKER = "Return ONLY"
+
+DEFAULT_CANNED_RESUME = {
+    "basics": {
+        "name": "John Doe",
+        "label": "Software Engineer",
+        "email": "johndoe@example.com",
+        "phone": "+1 234 567 8900",
+        "url": "https://johndoe.com",
+        "summary": "Software engineer with 5 years of experience building backend services.",
+        "location": {"city": "Austin", "countryCode": "US"},
+        "profiles": [
+            {"network": "LinkedIn", "username": "johndoe", "url": "https://www.linkedin.com/in/johndoe/"},
+            {"network": "GitHub", "username": "johndoe", "url": "https://github.com/johndoe"}
+        ]
+    },
+    "work": [
+        {
+            "name": "ExampleCorp",
+            "position": "Software Engineer",
+            "location": "Austin",
+            "startDate": "2020-01",
+            "endDate": "present",
+            "highlights": [
+                "Developed REST APIs using Django, reducing response times by 30%.",
+                "Migrated services to Kubernetes, cutting infrastructure costs by 20%."
+            ]
+        }
+    ],
+    "education": [
+        {
+            "institution": "Prestigious University",
+            "area": "Computer Science",
+            "studyType": "B.Tech",
+            "startDate": "2015-08",
+            "endDate": "2019-05",
+            "courses": ["Data Structures"]
+        }
+    ],
+    "skills": [{"name": "Technical Languages", "keywords": ["Python", "Go"]}],
+    "projects": [],
+    "publications": [],
+    "awards": []
+}
+
+# One random stream per seed for the whole process. SimpleModelManager builds a
+# new model for every call, so per-instance generators would replay the same
+# first sample forever instead of following the configured distribution.
+_LATENCY_RNGS: Dict[int, random.Random] = {}
+
+def _latency_rng(seed: int) -> random.Random:
+    if seed not in _LATENCY_RNGS:
+        _LATENCY_RNGS[seed] = random.Random(seed)
+    return _LATENCY_RNGS[seed]
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+class LocalModelResponse:
+    """Minimal stand-in for the message objects returned by the LangChain chat models"""
+    __slots__ = ("content", "response_metadata")
+
+    def __init__(self, content: str, response_metadata: Optional[Dict[str, Any]] = None):
+        self.content = content
+        self.response_metadata = response_metadata or {}
+
+    @property
+    def text(self) -> str:
+        return self.content
+
+    def __str__(self) -> str:
+        return self.content
+
+class FakeChatModel:
+    """
+    Deterministic local stand-in for an LLM provider.
+
+    Extraction prompts are answered with a canned resume, section prompts by
+    echoing the section's original content, so the whole pipeline runs
+    offline. Latency is sampled from a seeded distribution plus a per-token
+    generation time.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "fake-local",
+        latency_ms: float = 0.0,
+        latency_distribution: str = "fixed",
+        latency_sigma: float = 0.5,
+        tokens_per_second: float = 0.0,
+        canned_response: Optional[Union[str, Dict[str, Any]]] = None,
+        response_file: Optional[str] = None,
+        seed: int = 0,
+        **kwargs
+    ):
+        if latency_distribution not in ("fixed", "uniform", "lognormal", "exponential"):
+            raise ValueError(f"Unsupported latency distribution: {latency_distribution}")
+
+        self.model_name = model_name
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self._rng = _latency_rng(seed)
+
+        if response_file:
+            with open(response_file, 'r', encoding='utf-8') as f:
+                canned_response = f.read()
+        if canned_response is None:
+            canned_response = DEFAULT_CANNED_RESUME
+        if not isinstance(canned_response, str):
+            canned_response = json.dumps(canned_response, indent=2)
+        self.canned_response = canned_response
+
+    def _sample_latency(self, output_tokens: int) -> float:
+        """Return the simulated latency in seconds for a response"""
+        base = self.latency_ms / 1000
+        if base > 0 and self.latency_distribution == "uniform":
+            base = self._rng.uniform(base * (1 - self.latency_sigma), base * (1 + self.latency_sigma))
+        elif base > 0 and self.latency_distribution == "lognormal":
+            # Median equals latency_ms; sigma controls the tail
+            base = self._rng.lognormvariate(math.log(base), self.latency_sigma)
+        elif base > 0 and self.latency_distribution == "exponential":
+            base = self._rng.expovariate(1 / base)
+
+        generation = output_tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        return max(0.0, base) + generation
+
+    def _respond(self, prompt: str) -> str:
+        """Build the deterministic response text for a prompt"""
+        if prompt.lstrip().startswith(EXTRACTION_PROMPT_PREFIX):
+            return self.canned_response
+
+        start = prompt.find(ORIGINAL_CONTENT_MARKER)
+        if start != -1:
+            start += len(ORIGINAL_CONTENT_MARKER)
+            end = prompt.find(RETURN_MARKER, start)
+            return prompt[start:end if end != -1 else None].strip()
+
+        return "{}"
+
+    def _build_response(self, prompt: str) -> LocalModelResponse:
+        content = self._respond(str(prompt))
+        prompt_tokens = estimate_tokens(str(prompt))
+        completion_tokens = estimate_tokens(content)
+        return LocalModelResponse(content, {
+            "model_name": self.model_name,
+            "token_usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    async def ainvoke(self, prompt: Any, **kwargs) -> LocalModelResponse:
+        response = self._build_response(prompt)
+        delay = self._sample_latency(response.response_metadata["token_usage"]["completion_tokens"])
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+    def invoke(self, prompt: Any, **kwargs) -> LocalModelResponse:
+        response = self._build_response(prompt)
+        delay = self._sample_latency(response.response_metadata["token_usage"]["completion_tokens"])
+        if delay:
+            time.sleep(delay)
+        return response
+
+# Loaded recordings per store path; SimpleModelManager creates a model per
+# call, so the store is decompressed and indexed only once per process. The
+# next recording to serve for each (store path, prompt hash) is kept here
+# too, so repeated prompts rotate across model instances.
+_REPLAY_INDEXES: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+_REPLAY_POSITIONS: Dict[Tuple[str, str], int] = {}
+_REPLAY_LOCK = threading.Lock()
+
+def _replay_index(record_path: str) -> Dict[str, List[Dict[str, Any]]]:
+    with _REPLAY_LOCK:
+        if record_path not in _REPLAY_INDEXES:
+            from .llm_recorder import load_records_by_hash
+            _REPLAY_INDEXES[record_path] = load_records_by_hash(record_path)
+        return _REPLAY_INDEXES[record_path]
+
+class ReplayChatModel:
+    """
+    Serves responses recorded by RecordingModel, looked up by prompt hash.
+
+    When a prompt was recorded several times the recordings are served in
+    turn. The original provider latency can be replayed, optionally scaled.
+    """
+
+    def __init__(
+        self,
+        record_path: Optional[str] = None,
+        model_name: str = "replay",
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+        **kwargs
+    ):
+        if not record_path:
+            raise ValueError("Replay model requires a recording; set LLM_REPLAY_PATH in your .env file")
+
+        self.model_name = model_name
+        self.record_path = record_path
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self._index = _replay_index(record_path)
+
+    def _lookup(self, prompt: Any) -> Dict[str, Any]:
+        from .llm_recorder import hash_prompt
+
+        prompt_hash = hash_prompt(prompt)
+        records = self._index.get(prompt_hash)
+        if not records:
+            raise ValueError(f"No recorded response for prompt {prompt_hash[:12]} in {self.record_path}")
+
+        with _REPLAY_LOCK:
+            position = _REPLAY_POSITIONS.get((self.record_path, prompt_hash), 0)
+            _REPLAY_POSITIONS[(self.record_path, prompt_hash)] = position + 1
+        return records[position % len(records)]
+
+    def _delay(self, record: Dict[str, Any]) -> float:
+        if not self.simulate_latency:
+            return 0.0
+        return max(0.0, record.get("latency_seconds", 0.0) * self.latency_scale)
+
+    async def ainvoke(self, prompt: Any, **kwargs) -> LocalModelResponse:
+        record = self._lookup(prompt)
+        delay = self._delay(record)
+        if delay:
+            await asyncio.sleep(delay)
+        return LocalModelResponse(record["response"], record.get("response_metadata"))
+
+    def invoke(self, prompt: Any, **kwargs) -> LocalModelResponse:
+        record = self._lookup(prompt)
+        delay = self._delay(record)
+        if delay:
+            time.sleep(delay)
+        return LocalModelResponse(record["response"], record.get("response_metadata"))
@@ -1,11 +1,8 @@
 import os
 import logging
+import importlib
 from configparser import ConfigParser
-from typing import Dict, Optional
-from dotenv import load_dotenv
-from langchain_google_genai import GoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-from langchain_deepseek import ChatDeepSeek
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 
 logging.basicConfig(level=logging.INFO)
@@ -31,9 +28,66 @@ MODEL_CONFIGS = {
         'model_name': 'deepseek-chat',
         'temperature': 0.6,
         'max_tokens': 4096
+    },
+    'fake': {
+        'model_name': 'fake-local',
+        'latency_ms': float(os.getenv('FAKE_LLM_LATENCY_MS', '0')),
+        'latency_distribution': os.getenv('FAKE_LLM_LATENCY_DISTRIBUTION', 'fixed'),
+        'latency_sigma': float(os.getenv('FAKE_LLM_LATENCY_SIGMA', '0.5')),
+        'tokens_per_second': float(os.getenv('FAKE_LLM_TOKENS_PER_SECOND', '0')),
+        'response_file': os.getenv('FAKE_LLM_RESPONSE_FILE'),
+        'seed': int(os.getenv('FAKE_LLM_SEED', '0'))
+    },
+    'replay': {
+        'model_name': 'replay',
+        'record_path': os.getenv('LLM_REPLAY_PATH'),
+        'simulate_latency': os.getenv('LLM_REPLAY_SIMULATE_LATENCY', '').lower() in ('1', 'true', 'yes'),
+        'latency_scale': float(os.getenv('LLM_REPLAY_LATENCY_SCALE', '1.0'))
     }
 }
 
+# Model types that run locally and need no API key
+LOCAL_MODEL_TYPES = {'fake', 'replay'}
+
+# When set, every provider call is recorded in full to this zstd store
+LLM_RECORD_PATH = os.getenv('LLM_RECORD_PATH')
+
+# Provider backends are imported on first use. Importing all of them eagerly
+# pulls in grpc, protobuf and the Google client stacks even though only the
+# provider named by MODEL_NAME is ever used, which slows worker boot.
+PROVIDER_CLASSES = {
+    'gemini': ('langchain_google_genai', 'GoogleGenerativeAI'),
+    'openai': ('langchain_openai', 'ChatOpenAI'),
+    'deepseek': ('langchain_deepseek', 'ChatDeepSeek')
+}
+
+_loaded_provider_classes: Dict[str, type] = {}
+
+def load_provider_class(model_type: str) -> type:
+    """Import and return the LangChain class for a provider, once per process"""
+    provider_class = _loaded_provider_classes.get(model_type)
+    if provider_class is None:
+        if model_type not in PROVIDER_CLASSES:
+            raise ValueError(f"Unsupported model type: {model_type}")
+        module_name, class_name = PROVIDER_CLASSES[model_type]
+        provider_class = getattr(importlib.import_module(module_name), class_name)
+        _loaded_provider_classes[model_type] = provider_class
+        logger.info(f"Loaded provider backend {module_name}.{class_name}")
+    return provider_class
+
+def get_model_type(model: Any) -> str:
+    """Get the standardized model type name for a model instance"""
+    # Recording wrappers carry the type of the model they wrap
+    if hasattr(model, 'model_type') and isinstance(model.model_type, str):
+        return model.model_type
+    for model_type, provider_class in _loaded_provider_classes.items():
+        if isinstance(model, provider_class):
+            return model_type
+    return {
+        'FakeChatModel': 'fake',
+        'ReplayChatModel': 'replay'
+    }.get(type(model).__name__, "unknown")
+
 def get_api_key(model_type: str) -> str:
     """Get API key for the specified model type"""
     api_keys = {
@@ -58,6 +112,7 @@ def create_gemini_model(config: Optional[Dict] = None):
     import google.generativeai as genai
     genai.configure(api_key=api_key)
     
+    GoogleGenerativeAI = load_provider_class('gemini')
     return GoogleGenerativeAI(
         model=config['model_name'],
         temperature=config.get('temperature', 1.0)
@@ -68,6 +123,7 @@ def create_openai_model(config: Optional[Dict] = None):
     config = config or MODEL_CONFIGS['openai']
     api_key = get_api_key('openai')
     
+    ChatOpenAI = load_provider_class('openai')
     return ChatOpenAI(
         api_key=api_key,
         model_name=config['model_name'],
@@ -81,11 +137,26 @@ def create_deepseek_model(config: Optional[Dict] = None):
     config = config or MODEL_CONFIGS['deepseek']
     api_key = get_api_key('deepseek')
     
+    ChatDeepSeek = load_provider_class('deepseek')
     return ChatDeepSeek(
         api_key=api_key,
         **config
     )
 
+def create_fake_model(config: Optional[Dict] = None):
+    """Create and return a deterministic local stand-in model"""
+    config = config or MODEL_CONFIGS['fake']
+    
+    from .local_models import FakeChatModel
+    return FakeChatModel(**config)
+
+def create_replay_model(config: Optional[Dict] = None):
+    """Create and return a model that replays recorded provider responses"""
+    config = config or MODEL_CONFIGS['replay']
+    
+    from .local_models import ReplayChatModel
+    return ReplayChatModel(**config)
+
 class SimpleModelManager:
     """A simplified model manager that creates models on demand"""
     
@@ -104,9 +175,17 @@ class SimpleModelManager:
             self.current_model = create_openai_model()
         elif model_type == 'deepseek':
             self.current_model = create_deepseek_model()
+        elif model_type == 'fake':
+            self.current_model = create_fake_model()
+        elif model_type == 'replay':
+            self.current_model = create_replay_model()
         else:
             raise ValueError(f"Unsupported model type: {model_type}")
         
+        if LLM_RECORD_PATH and model_type != 'replay':
+            from .llm_recorder import RecordingModel, get_record_store
+            self.current_model = RecordingModel(self.current_model, get_record_store(LLM_RECORD_PATH), model_type)
+        
         self.current_model_type = model_type
         logger.info(f"Using model: {model_type}")
         return self.current_model
@@ -116,7 +195,8 @@ class SimpleModelManager:
         if model_type not in MODEL_CONFIGS:
             raise ValueError(f"Invalid model type: {model_type}")
         
-        get_api_key(model_type)
+        if model_type not in LOCAL_MODEL_TYPES:
+            get_api_key(model_type)
         
         self.current_model_type = model_type
         self.current_model = None  
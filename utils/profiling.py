@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+import hmac
+import json
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Any, Optional
+
+from .tracing import Trace
+
+logger = logging.getLogger(__name__)
+
+# Profiling is off unless PROFILE_REQUESTS is set or an admin asks for it per
+# request; when off, the only cost is the check in should_profile().
+PROFILE_REQUESTS = os.getenv('PROFILE_REQUESTS', '').lower() in ('1', 'true', 'yes')
+PROFILE_ADMIN_TOKEN = os.getenv('PROFILE_ADMIN_TOKEN', '')
+PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', '5'))
+PROFILE_OUTPUT_DIR = os.getenv('PROFILE_OUTPUT_DIR', os.path.join('logs', 'profiles'))
+
+def should_profile(headers: Any) -> bool:
+    """
+    Decide whether to profile a request.
+
+    Either PROFILE_REQUESTS is set, or the request carries `X-Profile: 1`
+    together with an `X-Admin-Token` matching PROFILE_ADMIN_TOKEN.
+    """
+    if PROFILE_REQUESTS:
+        return True
+    if not PROFILE_ADMIN_TOKEN or headers.get('X-Profile') != '1':
+        return False
+    return hmac.compare_digest(headers.get('X-Admin-Token', ''), PROFILE_ADMIN_TOKEN)
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+class StackSampler:
+    """
+    Samples the Python stack of one thread at a fixed interval.
+
+    The event loop runs in the request thread, so the async LLM portion and the
+    sync parse/convert/render portion both show up in the same profile. A
+    sample is taken whether or not the thread is on the CPU, so time spent
+    waiting on providers or on the Typst subprocess is visible as well. CPU
+    time is measured separately.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+        self._thread_cpu_start = 0.0
+        self.wall_seconds = 0.0
+        self.process_cpu_seconds = 0.0
+        self.thread_cpu_seconds = 0.0
+
+    def start(self) -> "StackSampler":
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._thread_cpu_start = time.thread_time()
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        """Stop sampling; call from the sampled thread so its CPU time is measured"""
+        self._stop.set()
+        self._thread.join()
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.process_cpu_seconds = time.process_time() - self._cpu_start
+        if threading.get_ident() == self.thread_id:
+            self.thread_cpu_seconds = time.thread_time() - self._thread_cpu_start
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        """Collapsed stacks, one 'frame;frame;frame count' line per stack"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+def start_profile() -> StackSampler:
+    """Start sampling the calling (request) thread"""
+    return StackSampler().start()
+
+def write_profile(sampler: StackSampler, profile_id: str, trace: Optional[Trace] = None) -> Dict[str, str]:
+    """
+    Stop the sampler and write its output.
+
+    Writes `<profile_id>.folded` (collapsed stacks for flamegraph.pl,
+    speedscope or inferno) and `<profile_id>.json` (wall-clock breakdown by
+    trace span, CPU time and sample counts).
+
+    Returns:
+        Paths of the written files
+    """
+    sampler.stop()
+    os.makedirs(PROFILE_OUTPUT_DIR, exist_ok=True)
+    folded_path = os.path.join(PROFILE_OUTPUT_DIR, f"{profile_id}.folded")
+    summary_path = os.path.join(PROFILE_OUTPUT_DIR, f"{profile_id}.json")
+
+    with open(folded_path, 'w', encoding='utf-8') as f:
+        f.write(sampler.folded())
+
+    breakdown: Dict[str, float] = {}
+    if trace is not None:
+        for trace_span in trace.spans:
+            breakdown[trace_span.name] = round(breakdown.get(trace_span.name, 0.0) + trace_span.duration * 1000, 2)
+
+    summary = {
+        "profile_id": profile_id,
+        "wall_ms": round(sampler.wall_seconds * 1000, 2),
+        "request_thread_cpu_ms": round(sampler.thread_cpu_seconds * 1000, 2),
+        "process_cpu_ms": round(sampler.process_cpu_seconds * 1000, 2),
+        "interval_ms": sampler.interval * 1000,
+        "samples": sampler.samples,
+        "wall_breakdown_ms": breakdown,
+        "top_stacks": [
+            {"stack": stack.rsplit(";", 3)[-3:], "samples": count}
+            for stack, count in sampler.stacks.most_common(10)
+        ]
+    }
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    logger.info(f"Profile written to {folded_path} ({sampler.samples} samples)")
+    return {"folded": folded_path, "summary": summary_path}
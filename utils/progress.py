@@ -0,0 +1,18 @@
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages report progress through a callback taking an event name and
+# a JSON-serializable payload. It is called on the event loop thread, so it
+# must not block; the streaming endpoint hands events to a queue.
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+def notify_progress(progress: Optional[ProgressCallback], event: str, data: Dict[str, Any]) -> None:
+    """Report a progress event; a failing callback never fails the pipeline"""
+    if progress is None:
+        return
+    try:
+        progress(event, data)
+    except Exception as e:
+        logger.error(f"Error reporting progress event {event}: {str(e)}")
@@ -3,25 +3,33 @@ import uuid
 import logging
 import traceback
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 # Import the new custom rendering function
-from .custom_typst import process_resume_with_custom_typst
+from .custom_typst import process_resume_with_custom_typst, process_resumes_with_custom_typst_bulk
+from .tracing import span
+from .singleflight import get_flight_group, content_key
+from .shared_cache import get_shared_cache
+from .scheduler import get_scheduler
+from .template_registry import get_template
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 TEMPLATE_PATH = os.path.join(BASE_DIR, 'utils', 'templates')
-TYPST_TEMPLATES_DIR = os.path.join(BASE_DIR, 'utils', 'typst_templates')
 
-def generate_resume_pdf(json_data: Dict[str, Any], theme_type: str = 'classic') -> str:
+# Concurrent requests rendering the same resume share one Typst compile
+render_flight = get_flight_group("render")
+render_scheduler = get_scheduler("render")
+
+def generate_resume_pdf(json_data: Dict[str, Any], theme_type: Optional[str] = None) -> str:
     """
-    Generate a PDF resume from JSON data using the custom Typst template.
+    Generate a PDF resume from JSON data using a registered Typst template.
     
     Args:
         json_data: Enhanced JSON resume data
-        theme_type: Theme type (not used in the custom implementation but kept for compatibility)
+        theme_type: Name of the template (utils.template_registry); None for the default
         
     Returns:
         Path to the generated PDF
@@ -30,19 +38,40 @@ def generate_resume_pdf(json_data: Dict[str, Any], theme_type: str = 'classic')
         if not json_data or not isinstance(json_data, dict):
             raise ValueError("Invalid JSON data provided")
 
-        logger.info("Generating resume PDF using custom Typst template")
+        template = get_template(theme_type)
+        logger.info(f"Generating resume PDF using Typst template {template.name}")
         
         # Create output directory
         TEMP_DIR = os.path.join(BASE_DIR, 'temp')
         OUTPUT_FOLDER = os.path.join(TEMP_DIR, 'output')
         os.makedirs(OUTPUT_FOLDER, exist_ok=True)
         
-        # Process the resume using the custom Typst implementation
-        pdf_path = process_resume_with_custom_typst(
-            json_data=json_data,
-            typst_template_dir=TYPST_TEMPLATES_DIR,
-            output_dir=OUTPUT_FOLDER
-        )
+        # PDFs rendered by any worker on the host are reused; the digest keeps
+        # PDFs of an edited template from being served for the new one
+        cache_key = content_key(template.name, template.digest, json_data)
+        cache = get_shared_cache()
+        pdf_bytes = cache.get("render", cache_key) if cache is not None else None
+        if pdf_bytes is not None:
+            pdf_path = os.path.join(OUTPUT_FOLDER, f"{uuid.uuid4()}_resume.pdf")
+            with open(pdf_path, 'wb') as f:
+                f.write(pdf_bytes)
+            logger.info(f"Resume PDF restored from cache at: {pdf_path}")
+            return pdf_path
+
+        def render() -> str:
+            # Process the resume using the custom Typst implementation
+            with render_scheduler.slot_sync():
+                path = process_resume_with_custom_typst(
+                    json_data=json_data,
+                    template=template,
+                    output_dir=OUTPUT_FOLDER
+                )
+            if cache is not None and path and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    cache.set("render", cache_key, f.read())
+            return path
+
+        pdf_path = render_flight.do_sync(cache_key, render)
         
         logger.info(f"Resume PDF generated successfully at: {pdf_path}")
         return pdf_path
@@ -52,6 +81,43 @@ def generate_resume_pdf(json_data: Dict[str, Any], theme_type: str = 'classic')
         logger.error(traceback.format_exc())
         raise
 
+def generate_resume_pdfs_bulk(json_list: List[Dict[str, Any]], theme_type: Optional[str] = None) -> List[str]:
+    """
+    Generate many PDF resumes with a single Typst compile.
+    
+    Args:
+        json_list: Enhanced JSON resume data, one dict per resume
+        theme_type: Name of the template (utils.template_registry); None for the default
+        
+    Returns:
+        Paths to the generated PDFs, in the same order as json_list
+    """
+    try:
+        if not all(json_data and isinstance(json_data, dict) for json_data in json_list):
+            raise ValueError("Invalid JSON data provided")
+
+        template = get_template(theme_type)
+        logger.info(f"Generating {len(json_list)} resume PDFs in bulk using Typst template {template.name}")
+        
+        TEMP_DIR = os.path.join(BASE_DIR, 'temp')
+        OUTPUT_FOLDER = os.path.join(TEMP_DIR, 'output')
+        os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+        
+        with render_scheduler.slot_sync(), span("render.bulk"):
+            pdf_paths = process_resumes_with_custom_typst_bulk(
+                json_list=json_list,
+                template=template,
+                output_dir=OUTPUT_FOLDER
+            )
+        
+        logger.info(f"Generated {len(pdf_paths)} resume PDFs in bulk")
+        return pdf_paths
+        
+    except Exception as e:
+        logger.error(f"Bulk resume generation failed: {e}")
+        logger.error(traceback.format_exc())
+        raise
+
 def generate_resume_html(json_data, theme_type='classic'):
     """
     Generate HTML resume from JSON data.
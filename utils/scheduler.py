@@ -0,0 +1,263 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Slots for the work every request competes for: LLM calls (extraction,
+# section enhancement, job description digests) and Typst renders. Each
+# pool hands its slots out by priority class first, weighted by
+# SCHEDULER_WEIGHTS, and then fairly across the tenants within that class,
+# using stride scheduling at both levels so no class or tenant starves.
+# Bulk work may hold at most SCHEDULER_BULK_MAX_SHARE of a pool's slots, so
+# an interactive call usually finds a slot free instead of waiting for a
+# bulk call to finish. Each request runs its own event loop on its own
+# thread, so waiters are woken through their own loop.
+SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '16'))
+RENDER_MAX_CONCURRENCY = int(os.getenv('RENDER_MAX_CONCURRENCY', str(os.cpu_count() or 4)))
+SCHEDULER_BULK_MAX_SHARE = float(os.getenv('SCHEDULER_BULK_MAX_SHARE', '0.75'))
+# Batch clients mark their requests with `X-Priority: bulk`
+PRIORITY_HEADER = os.getenv('PRIORITY_HEADER', 'X-Priority')
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, BULK)
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Parse "interactive:8,bulk:1" into per-class weights"""
+    weights = {INTERACTIVE: 8.0, BULK: 1.0}
+    for item in spec.split(","):
+        if ":" not in item:
+            continue
+        name, value = item.split(":", 1)
+        if name.strip() in weights and float(value) > 0:
+            weights[name.strip()] = float(value)
+    return weights
+
+SCHEDULER_WEIGHTS = parse_weights(os.getenv('SCHEDULER_WEIGHTS', 'interactive:8,bulk:1'))
+
+_priority: ContextVar[str] = ContextVar("priority", default=INTERACTIVE)
+_tenant: ContextVar[str] = ContextVar("tenant", default="default")
+
+def set_work_class(priority: str, tenant: str) -> None:
+    """Set the priority class and tenant that work started from this context is scheduled under"""
+    _priority.set(priority if priority in PRIORITIES else INTERACTIVE)
+    _tenant.set(tenant)
+
+def current_work_class() -> Tuple[str, str]:
+    return _priority.get(), _tenant.get()
+
+class _Waiter:
+    __slots__ = ("priority", "tenant", "wake", "granted")
+
+    def __init__(self, priority: str, tenant: str, wake: Callable[[], None]):
+        self.priority = priority
+        self.tenant = tenant
+        self.wake = wake
+        self.granted = False
+
+class FairScheduler:
+    """A pool of slots shared by priority class weight, then fairly across tenants"""
+
+    def __init__(self,
+                 name: str,
+                 capacity: int,
+                 weights: Optional[Dict[str, float]] = None,
+                 bulk_max_share: float = SCHEDULER_BULK_MAX_SHARE):
+        self.name = name
+        self.capacity = max(1, capacity)
+        self.weights = weights or SCHEDULER_WEIGHTS
+        self.limits = {INTERACTIVE: self.capacity, BULK: max(1, int(self.capacity * bulk_max_share))}
+        self._lock = threading.Lock()
+        self._running = dict.fromkeys(PRIORITIES, 0)
+        # class -> tenant -> waiters; dicts keep tenants in arrival order
+        self._queues: Dict[str, Dict[str, Deque[_Waiter]]] = {p: {} for p in PRIORITIES}
+        # Stride passes; a class or tenant that becomes active starts at the
+        # pass of the last one served, so idle time does not bank credit
+        self._class_pass = dict.fromkeys(PRIORITIES, 0.0)
+        self._class_clock = 0.0
+        self._tenant_pass: Dict[str, Dict[str, float]] = {p: {} for p in PRIORITIES}
+        self._tenant_clock = dict.fromkeys(PRIORITIES, 0.0)
+        self.stats = {p: {"granted": 0, "queued": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+                      for p in PRIORITIES}
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        queues = self._queues[waiter.priority]
+        if not queues:
+            self._class_pass[waiter.priority] = max(self._class_pass[waiter.priority], self._class_clock)
+        if waiter.tenant not in queues:
+            queues[waiter.tenant] = deque()
+            self._tenant_pass[waiter.priority][waiter.tenant] = self._tenant_clock[waiter.priority]
+        queues[waiter.tenant].append(waiter)
+        self.stats[waiter.priority]["queued"] += 1
+
+    def _dequeue(self, priority: str, tenant: str) -> _Waiter:
+        queues = self._queues[priority]
+        waiter = queues[tenant].popleft()
+        if not queues[tenant]:
+            del queues[tenant]
+            del self._tenant_pass[priority][tenant]
+        return waiter
+
+    def _dispatch(self) -> List[_Waiter]:
+        """Grant free slots to queued waiters; returns the ones to wake (lock held)"""
+        granted = []
+        while sum(self._running.values()) < self.capacity:
+            eligible = [p for p in PRIORITIES if self._queues[p] and self._running[p] < self.limits[p]]
+            if not eligible:
+                break
+            priority = min(eligible, key=lambda p: (self._class_pass[p], PRIORITIES.index(p)))
+            self._class_clock = self._class_pass[priority]
+            self._class_pass[priority] += 1.0 / self.weights[priority]
+
+            passes = self._tenant_pass[priority]
+            tenant = min(passes, key=passes.get)
+            self._tenant_clock[priority] = passes[tenant]
+            passes[tenant] += 1.0
+            waiter = self._dequeue(priority, tenant)
+            waiter.granted = True
+            self._running[priority] += 1
+            granted.append(waiter)
+        return granted
+
+    def _grant_immediately(self, priority: str) -> bool:
+        """Take a slot without queueing when nobody is waiting (lock held)"""
+        if any(self._queues[p] for p in PRIORITIES):
+            return False
+        if sum(self._running.values()) >= self.capacity or self._running[priority] >= self.limits[priority]:
+            return False
+        self._running[priority] += 1
+        self.stats[priority]["granted"] += 1
+        return True
+
+    def _record_wait(self, priority: str, waited: float) -> None:
+        with self._lock:
+            stats = self.stats[priority]
+            stats["granted"] += 1
+            stats["wait_seconds"] += waited
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+
+    def _withdraw(self, waiter: _Waiter) -> None:
+        """Take back a waiter that gave up, returning its slot if it was granted meanwhile"""
+        with self._lock:
+            if not waiter.granted:
+                queue = self._queues[waiter.priority].get(waiter.tenant)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self._queues[waiter.priority][waiter.tenant]
+                        del self._tenant_pass[waiter.priority][waiter.tenant]
+                return
+        self.release(waiter.priority)
+
+    def release(self, priority: str) -> None:
+        with self._lock:
+            self._running[priority] -= 1
+            woken = self._dispatch()
+        for waiter in woken:
+            waiter.wake()
+
+    def _join(self, priority: str, tenant: str, wake: Callable[[], None]) -> Optional[_Waiter]:
+        """Take a slot, or queue for one; returns the waiter to wait on, or None if granted at once"""
+        with self._lock:
+            if self._grant_immediately(priority):
+                return None
+            waiter = _Waiter(priority, tenant, wake)
+            self._enqueue(waiter)
+            woken = self._dispatch()
+        for other in woken:
+            other.wake()
+        return waiter
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot of the pool for the duration of the block"""
+        if not SCHEDULER_ENABLED:
+            yield
+            return
+        priority, tenant = current_work_class()
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake() -> None:
+            try:
+                loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+            except RuntimeError:
+                # The loop closed after its waiter gave up; _withdraw returned the slot
+                pass
+
+        waiter = self._join(priority, tenant, wake)
+        if waiter is not None:
+            start = time.monotonic()
+            try:
+                with span(f"queue.{self.name}"):
+                    await granted
+            except BaseException:
+                self._withdraw(waiter)
+                raise
+            self._record_wait(priority, time.monotonic() - start)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    @contextmanager
+    def slot_sync(self) -> Iterator[None]:
+        """Blocking counterpart of slot() for synchronous work such as rendering"""
+        if not SCHEDULER_ENABLED:
+            yield
+            return
+        priority, tenant = current_work_class()
+        event = threading.Event()
+        waiter = self._join(priority, tenant, event.set)
+        if waiter is not None:
+            start = time.monotonic()
+            with span(f"queue.{self.name}"):
+                event.wait()
+            self._record_wait(priority, time.monotonic() - start)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            classes = {}
+            for priority in PRIORITIES:
+                stats = self.stats[priority]
+                classes[priority] = {
+                    "granted": stats["granted"],
+                    "queued": stats["queued"],
+                    "avg_wait_ms": round(stats["wait_seconds"] / stats["queued"] * 1000, 1) if stats["queued"] else 0.0,
+                    "max_wait_ms": round(stats["max_wait_seconds"] * 1000, 1),
+                    "running": self._running[priority],
+                    "waiting": sum(len(q) for q in self._queues[priority].values()),
+                    "limit": self.limits[priority]
+                }
+            return {"capacity": self.capacity, "classes": classes}
+
+_schedulers: Dict[str, FairScheduler] = {}
+_schedulers_lock = threading.Lock()
+_capacities = {"llm": LLM_MAX_CONCURRENCY, "render": RENDER_MAX_CONCURRENCY}
+
+def get_scheduler(name: str) -> FairScheduler:
+    """Process-wide scheduler for one kind of work ("llm" or "render")"""
+    with _schedulers_lock:
+        if name not in _schedulers:
+            _schedulers[name] = FairScheduler(name, _capacities.get(name, LLM_MAX_CONCURRENCY))
+        return _schedulers[name]
+
+def get_scheduler_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-class grants, waits and occupancy for every scheduler"""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    return {scheduler.name: scheduler.snapshot() for scheduler in schedulers}
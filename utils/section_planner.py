@@ -0,0 +1,242 @@
+import os
+import re
+import json
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A call's latency is dominated by the tokens it has to generate, so the
+# slowest call sets the request's critical path. The planner keeps every call
+# near ENHANCE_TARGET_CALL_TOKENS of original content: large array sections are
+# split per entry and small sections share a call. ENHANCE_MAX_CALLS bounds
+# the fan-out, since every call repeats the instructions and job description.
+ENHANCE_BATCHING = os.getenv('ENHANCE_BATCHING', 'true').lower() in ('1', 'true', 'yes')
+ENHANCE_TARGET_CALL_TOKENS = int(os.getenv('ENHANCE_TARGET_CALL_TOKENS', '800'))
+ENHANCE_MAX_CALLS = int(os.getenv('ENHANCE_MAX_CALLS', '8'))
+ENHANCE_MAX_SECTIONS_PER_CALL = int(os.getenv('ENHANCE_MAX_SECTIONS_PER_CALL', '3'))
+
+# How much an enhanced section is worth to the reader when it is not
+# specifically relevant to the job description
+SECTION_WEIGHTS = {
+    'work': 1.0,
+    'skills': 0.9,
+    'basics': 0.8,
+    'projects': 0.7,
+    'education': 0.5,
+    'awards': 0.3,
+    'publications': 0.3
+}
+DEFAULT_SECTION_WEIGHT = 0.4
+
+_WORD_PATTERN = re.compile(r'[a-z][a-z0-9+#.]{2,}')
+
+def estimate_content_tokens(data: Any) -> int:
+    """Cheap token estimate of a section as it appears in the prompt (~4 characters per token)"""
+    return max(1, len(json.dumps(data, indent=2)) // 4)
+
+class EnhancementCall:
+    """
+    One planned LLM call.
+
+    Either a single whole section, several whole sections sent together as a
+    JSON object keyed by section name, or a contiguous slice of the entries of
+    one array section.
+    """
+    __slots__ = ("sections", "entry_range", "tokens")
+
+    def __init__(self, sections: List[str], tokens: int, entry_range: Optional[Tuple[int, int]] = None):
+        self.sections = sections
+        self.tokens = tokens
+        self.entry_range = entry_range
+
+    @property
+    def is_batch(self) -> bool:
+        return len(self.sections) > 1
+
+    @property
+    def label(self) -> str:
+        """Name used for spans and LLM log stages, e.g. `work[0:3]` or `awards+publications`"""
+        if self.entry_range is not None:
+            return f"{self.sections[0]}[{self.entry_range[0]}:{self.entry_range[1]}]"
+        return "+".join(self.sections)
+
+    def payload(self, resume_data: Dict[str, Any]) -> Any:
+        """The original content this call enhances"""
+        if self.entry_range is not None:
+            start, end = self.entry_range
+            return resume_data[self.sections[0]][start:end]
+        if self.is_batch:
+            return {section: resume_data[section] for section in self.sections}
+        return resume_data[self.sections[0]]
+
+def _split_entries(section_name: str, entries: List[Any], target_tokens: int) -> List[EnhancementCall]:
+    """Group consecutive entries into slices of roughly target_tokens each"""
+    calls = []
+    start, tokens = 0, 0
+    for index, entry in enumerate(entries):
+        entry_tokens = estimate_content_tokens(entry)
+        if index > start and tokens + entry_tokens > target_tokens:
+            calls.append(EnhancementCall([section_name], tokens, (start, index)))
+            start, tokens = index, 0
+        tokens += entry_tokens
+    calls.append(EnhancementCall([section_name], tokens, (start, len(entries))))
+    return calls
+
+def _pack_sections(sizes: List[Tuple[str, int]], capacity: int, max_sections: int) -> List[EnhancementCall]:
+    """First-fit decreasing packing of whole sections into calls of at most capacity tokens"""
+    bins: List[List[Any]] = []
+    for section_name, tokens in sorted(sizes, key=lambda item: item[1], reverse=True):
+        for bin_ in bins:
+            if bin_[1] + tokens <= capacity and len(bin_[0]) < max_sections:
+                bin_[0].append(section_name)
+                bin_[1] += tokens
+                break
+        else:
+            bins.append([[section_name], tokens])
+    return [EnhancementCall(sections, tokens) for sections, tokens in bins]
+
+def _plan(resume_data: Dict[str, Any], target_tokens: int, max_sections: int) -> List[EnhancementCall]:
+    calls = []
+    packable = []
+    for section_name, section_data in resume_data.items():
+        if not section_data:
+            # Nothing to enhance; merge_call_results keeps the empty original
+            continue
+        tokens = estimate_content_tokens(section_data)
+        if isinstance(section_data, list) and len(section_data) > 1 and tokens > target_tokens:
+            calls.extend(_split_entries(section_name, section_data, target_tokens))
+        elif tokens > target_tokens:
+            calls.append(EnhancementCall([section_name], tokens))
+        else:
+            packable.append((section_name, tokens))
+    # Packing never creates a call larger than the largest one that has to be
+    # made anyway, so batching saves round-trips without lengthening the
+    # critical path
+    capacity = max([call.tokens for call in calls] + [tokens for _, tokens in packable], default=0)
+    calls.extend(_pack_sections(packable, min(capacity, target_tokens), max_sections))
+    # Largest calls first, so the critical path starts as early as possible
+    calls.sort(key=lambda call: call.tokens, reverse=True)
+    return calls
+
+def plan_enhancement_calls(resume_data: Dict[str, Any],
+                           target_tokens: int = ENHANCE_TARGET_CALL_TOKENS,
+                           max_calls: int = ENHANCE_MAX_CALLS,
+                           max_sections: int = ENHANCE_MAX_SECTIONS_PER_CALL) -> List[EnhancementCall]:
+    """
+    Plan the LLM calls that enhance a resume.
+
+    Args:
+        resume_data: Resume sections keyed by section name
+        target_tokens: Preferred amount of original content per call
+        max_calls: Upper bound on the number of calls; the target is raised
+            until the plan fits
+        max_sections: Most whole sections sent in one call
+
+    Returns:
+        The planned calls, largest first
+    """
+    if not ENHANCE_BATCHING:
+        return [EnhancementCall([name], estimate_content_tokens(data)) for name, data in resume_data.items()]
+
+    total_tokens = sum(estimate_content_tokens(data) for data in resume_data.values())
+    calls = _plan(resume_data, target_tokens, max_sections)
+    while len(calls) > max_calls and target_tokens < total_tokens:
+        target_tokens = int(target_tokens * 1.5) + 1
+        calls = _plan(resume_data, target_tokens, max_sections)
+
+    logger.info(f"Planned {len(calls)} enhancement calls for {len(resume_data)} sections: "
+                f"{', '.join(call.label for call in calls)}")
+    return calls
+
+def _terms(text: str) -> set:
+    return set(_WORD_PATTERN.findall(text.lower()))
+
+def prioritize_calls(calls: List[EnhancementCall],
+                     resume_data: Dict[str, Any],
+                     job_description: Optional[str] = None) -> List[EnhancementCall]:
+    """
+    Order planned calls by their value for this job description.
+
+    A call scores the highest weight among its sections plus the share of
+    job description terms its content mentions; ties go to the larger call,
+    which is the one most likely to set the critical path.
+
+    Returns:
+        The calls, most valuable first
+    """
+    jd_terms = _terms(job_description) if job_description else set()
+
+    def score(call: EnhancementCall) -> float:
+        weight = max(SECTION_WEIGHTS.get(name, DEFAULT_SECTION_WEIGHT) for name in call.sections)
+        if not jd_terms:
+            return weight
+        content_terms = _terms(json.dumps(call.payload(resume_data)))
+        return weight + len(jd_terms & content_terms) / len(jd_terms)
+
+    return sorted(calls, key=lambda call: (score(call), call.tokens), reverse=True)
+
+def merge_call_results(resume_data: Dict[str, Any],
+                       calls: List[EnhancementCall],
+                       results: List[Any],
+                       degraded: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Reassemble enhanced sections from the results of planned calls.
+
+    A call that failed (result None or empty) or returned the wrong shape
+    keeps its original content, as do sections no call was planned for.
+    Sections and entries keep their original order.
+
+    Args:
+        resume_data: The original resume sections
+        calls: The planned calls
+        results: Parsed result of each call, in the same order as calls
+        degraded: If given, receives the name of every section that kept all or
+            part of its original content because a call failed
+
+    Returns:
+        Enhanced resume sections keyed by section name
+    """
+    merged: Dict[str, Any] = {}
+    slices: Dict[str, List[Tuple[int, List[Any]]]] = {}
+    fallbacks: List[str] = []
+
+    for call, result in zip(calls, results):
+        original = call.payload(resume_data)
+        section_name = call.sections[0]
+
+        if call.entry_range is not None:
+            # Models sometimes wrap the entries in an object keyed by section
+            if isinstance(result, dict) and isinstance(result.get(section_name), list):
+                result = result[section_name]
+            if not isinstance(result, list) or len(result) != len(original):
+                if result:
+                    logger.warning(f"Enhancement of {call.label} returned {type(result).__name__}, keeping original entries")
+                result = original
+                fallbacks.append(section_name)
+            slices.setdefault(section_name, []).append((call.entry_range[0], result))
+        elif call.is_batch:
+            result = result if isinstance(result, dict) else {}
+            for name in call.sections:
+                if result.get(name) or (name in result and not resume_data[name]):
+                    merged[name] = result[name]
+                else:
+                    if result:
+                        logger.warning(f"Enhancement of {name} missing from batch {call.label}, keeping original")
+                    merged[name] = resume_data[name]
+                    fallbacks.append(name)
+        elif result:
+            if isinstance(original, list) and isinstance(result, dict) and isinstance(result.get(section_name), list):
+                result = result[section_name]
+            merged[section_name] = result
+        else:
+            merged[section_name] = original
+            fallbacks.append(section_name)
+
+    for section_name, parts in slices.items():
+        merged[section_name] = [entry for _, part in sorted(parts, key=lambda item: item[0]) for entry in part]
+
+    if degraded is not None:
+        degraded.extend(name for name in resume_data if name in fallbacks and name not in degraded)
+
+    return {section_name: merged.get(section_name, section_data) for section_name, section_data in resume_data.items()}
@@ -0,0 +1,121 @@
+import os
+import re
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Long resumes are split at their section headings and extracted by
+# concurrent, schema-scoped calls. Each call generates a fraction of the
+# output, so the slowest call is much shorter than one whole-resume call and
+# none of them approaches the max_tokens cap. Short documents, and documents
+# whose headings are not recognised, are extracted in one call as before.
+SEGMENTED_EXTRACTION = os.getenv('SEGMENTED_EXTRACTION', 'true').lower() in ('1', 'true', 'yes')
+SEGMENTED_EXTRACTION_MIN_CHARS = int(os.getenv('SEGMENTED_EXTRACTION_MIN_CHARS', '5000'))
+# Segments shorter than this are extracted together with the header instead
+# of paying for a call of their own
+SEGMENT_MIN_CHARS = int(os.getenv('SEGMENT_MIN_CHARS', '400'))
+
+SCHEMA_SECTIONS = ("basics", "work", "education", "skills", "projects", "publications", "awards")
+
+SECTION_HEADINGS = {
+    "basics": ["summary", "professional summary", "profile", "professional profile", "about", "about me",
+               "objective", "career objective", "contact", "contact information"],
+    "work": ["experience", "work experience", "professional experience", "employment", "employment history",
+             "work history", "career history", "relevant experience", "experience and employment"],
+    "education": ["education", "academic background", "academics", "education and training",
+                  "educational qualifications", "qualifications"],
+    "skills": ["skills", "technical skills", "core skills", "key skills", "core competencies", "competencies",
+               "technologies", "tools and technologies", "skills and tools", "tech stack"],
+    "projects": ["projects", "personal projects", "key projects", "selected projects", "academic projects",
+                 "side projects", "open source", "open source projects"],
+    "publications": ["publications", "papers", "research", "research and publications", "selected publications"],
+    "awards": ["awards", "honors", "honours", "awards and honors", "awards and honours", "achievements",
+               "awards and achievements", "accomplishments"],
+}
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+# Headings that are recognisably headings but have no schema section; their
+# text goes with the header so nothing is dropped
+OTHER_HEADINGS = {"certifications", "certificates", "licenses and certifications", "languages", "interests",
+                  "hobbies", "volunteering", "volunteer experience", "references", "activities", "courses"}
+
+MAX_HEADING_CHARS = 40
+
+def _normalize_heading(line: str) -> str:
+    line = line.strip().strip(':').replace('&', ' and ')
+    return " ".join(re.sub(r'[^a-z ]', ' ', line.lower()).split())
+
+def classify_heading(line: str) -> Optional[str]:
+    """Schema section a heading line introduces, "other" for known non-schema headings, else None"""
+    if not line.strip() or len(line.strip()) > MAX_HEADING_CHARS:
+        return None
+    heading = _normalize_heading(line)
+    if heading in _HEADING_LOOKUP:
+        return _HEADING_LOOKUP[heading]
+    if heading in OTHER_HEADINGS:
+        return "other"
+    return None
+
+class ExtractionSegment:
+    """Text for one extraction call and the schema sections it is responsible for"""
+    __slots__ = ("sections", "text")
+
+    def __init__(self, sections: List[str], text: str):
+        self.sections = sections
+        self.text = text
+
+    @property
+    def label(self) -> str:
+        return "+".join(self.sections)
+
+def split_sections(resume_text: str) -> Dict[str, str]:
+    """
+    Split resume text at recognised headings.
+
+    Returns:
+        Text per schema section (repeated headings are concatenated), plus
+        "header" for text before the first heading and "other" for sections
+        without a schema counterpart; heading lines are kept in the text
+    """
+    parts: Dict[str, List[str]] = {}
+    current = "header"
+    for line in resume_text.splitlines():
+        section = classify_heading(line)
+        if section is not None:
+            current = section
+        parts.setdefault(current, []).append(line)
+    return {section: "\n".join(lines).strip() for section, lines in parts.items()}
+
+def plan_extraction_segments(resume_text: str,
+                             min_chars: int = SEGMENTED_EXTRACTION_MIN_CHARS) -> Optional[List[ExtractionSegment]]:
+    """
+    Plan the extraction calls for a resume.
+
+    Each sufficiently large schema section gets its own call. The header,
+    the summary, small sections and unrecognised text form one more call,
+    which is responsible for `basics` and every schema section that has no
+    call of its own.
+
+    Returns:
+        The segments, or None when the resume should be extracted in one call
+    """
+    if not SEGMENTED_EXTRACTION or len(resume_text) < min_chars:
+        return None
+
+    parts = split_sections(resume_text)
+    dedicated = [section for section in SCHEMA_SECTIONS
+                 if section != "basics" and len(parts.get(section, "")) >= SEGMENT_MIN_CHARS]
+    if not dedicated:
+        logger.info("No large recognised section for segmented extraction, using a single call")
+        return None
+
+    remainder_sections = [section for section in SCHEMA_SECTIONS if section not in dedicated]
+    remainder_text = "\n\n".join(
+        text for section, text in parts.items() if section not in dedicated and text
+    )
+    segments = [ExtractionSegment(remainder_sections, remainder_text)]
+    segments.extend(ExtractionSegment([section], parts[section]) for section in dedicated)
+    # Largest first, so the call most likely to set the critical path starts first
+    segments.sort(key=lambda segment: len(segment.text), reverse=True)
+    logger.info(f"Segmented extraction into {len(segments)} calls: {', '.join(s.label for s in segments)}")
+    return segments
@@ -0,0 +1,269 @@
+import os
+import time
+import atexit
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Cache shared by every worker process on the host: an SQLite file in WAL
+# mode, so readers never block and each write is one atomic transaction.
+# Entries are namespaced ("extract", "enhance", "jd_digest", "render") and
+# keyed by content hash. Entries past their TTL are misses; when the file
+# grows past SHARED_CACHE_MAX_BYTES the least recently used entries go first.
+# Recency is only refreshed once per SHARED_CACHE_TOUCH_SECONDS, so hits are
+# reads rather than writes. Counters are kept per process and added to the
+# shared per-namespace totals every SHARED_CACHE_STATS_FLUSH_SECONDS.
+SHARED_CACHE_ENABLED = os.getenv('SHARED_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+SHARED_CACHE_PATH = os.getenv('SHARED_CACHE_PATH', os.path.join('cache', 'shared_cache.sqlite3'))
+SHARED_CACHE_MAX_BYTES = int(os.getenv('SHARED_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+SHARED_CACHE_TTL_SECONDS = float(os.getenv('SHARED_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+SHARED_CACHE_TOUCH_SECONDS = float(os.getenv('SHARED_CACHE_TOUCH_SECONDS', '60'))
+SHARED_CACHE_STATS_FLUSH_SECONDS = float(os.getenv('SHARED_CACHE_STATS_FLUSH_SECONDS', '5'))
+SHARED_CACHE_BUSY_TIMEOUT_MS = int(os.getenv('SHARED_CACHE_BUSY_TIMEOUT_MS', '2000'))
+# Size is checked against the budget after this many bytes have been written
+EVICTION_CHECK_BYTES = 4 * 1024 * 1024
+EVICTION_BATCH = 200
+
+COUNTERS = ("hits", "misses", "writes", "evictions", "errors")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS stats (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    writes INTEGER NOT NULL DEFAULT 0,
+    evictions INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+class SharedCache:
+    """
+    Namespaced bytes cache in an SQLite file shared across processes.
+
+    Every operation swallows database errors (logged and counted) and
+    behaves as a miss, so the cache can never fail a request.
+    """
+
+    def __init__(self,
+                 path: str = SHARED_CACHE_PATH,
+                 max_bytes: int = SHARED_CACHE_MAX_BYTES,
+                 ttl_seconds: float = SHARED_CACHE_TTL_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, int]] = {}
+        self._last_flush = time.monotonic()
+        self._written_since_check = 0
+        self._initialized_pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection for the current thread; reopened after a fork"""
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == pid:
+            return conn
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=SHARED_CACHE_BUSY_TIMEOUT_MS / 1000,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={SHARED_CACHE_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            if self._initialized_pid != pid:
+                conn.executescript(SCHEMA)
+                self._initialized_pid = pid
+                self._pending = {}
+        self._local.conn = conn
+        self._local.pid = pid
+        return conn
+
+    def _count(self, namespace: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            counts = self._pending.setdefault(namespace, dict.fromkeys(COUNTERS, 0))
+            counts[counter] += amount
+            due = time.monotonic() - self._last_flush >= SHARED_CACHE_STATS_FLUSH_SECONDS
+        if due:
+            self.flush_stats()
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        """Cached value, or None on a miss or expired entry"""
+        try:
+            conn = self._connection()
+            now = time.time()
+            row = conn.execute(
+                "SELECT value, accessed_at, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is None or (row[2] is not None and row[2] <= now):
+                self._count(namespace, "misses")
+                return None
+            if now - row[1] >= SHARED_CACHE_TOUCH_SECONDS:
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                             (now, namespace, key))
+            self._count(namespace, "hits")
+            return row[0]
+        except sqlite3.Error as e:
+            logger.error(f"Shared cache read failed ({namespace}): {str(e)}")
+            self._count(namespace, "errors")
+            return None
+
+    def set(self, namespace: str, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> bool:
+        """Store a value, replacing any previous one atomically; returns whether it was stored"""
+        if len(value) > self.max_bytes:
+            return False
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        try:
+            conn = self._connection()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, size, created_at, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (namespace, key, value, len(value), now, now, now + ttl if ttl > 0 else None)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Shared cache write failed ({namespace}): {str(e)}")
+            self._count(namespace, "errors")
+            return False
+        self._count(namespace, "writes")
+        with self._lock:
+            self._written_since_check += len(value)
+            check = self._written_since_check >= min(EVICTION_CHECK_BYTES, self.max_bytes // 10 or 1)
+            if check:
+                self._written_since_check = 0
+        if check:
+            self.evict()
+        return True
+
+    def get_json(self, namespace: str, key: str) -> Any:
+        value = self.get(namespace, key)
+        return None if value is None else orjson.loads(value)
+
+    def set_json(self, namespace: str, key: str, data: Any, ttl_seconds: Optional[float] = None) -> bool:
+        return self.set(namespace, key, orjson.dumps(data), ttl_seconds)
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            self._connection().execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+        except sqlite3.Error as e:
+            logger.error(f"Shared cache delete failed ({namespace}): {str(e)}")
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes; returns entries removed"""
+        removed: Dict[str, int] = {}
+        try:
+            conn = self._connection()
+            for (namespace,) in conn.execute(
+                "SELECT DISTINCT namespace FROM entries WHERE expires_at <= ?", (time.time(),)
+            ).fetchall():
+                cursor = conn.execute("DELETE FROM entries WHERE namespace = ? AND expires_at <= ?",
+                                      (namespace, time.time()))
+                removed[namespace] = removed.get(namespace, 0) + cursor.rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            while total > self.max_bytes:
+                victims = conn.execute(
+                    "SELECT namespace, key, size FROM entries ORDER BY accessed_at LIMIT ?", (EVICTION_BATCH,)
+                ).fetchall()
+                if not victims:
+                    break
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for namespace, key, size in victims:
+                        if total <= self.max_bytes:
+                            break
+                        conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+                        removed[namespace] = removed.get(namespace, 0) + 1
+                        total -= size
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            logger.error(f"Shared cache eviction failed: {str(e)}")
+        for namespace, count in removed.items():
+            self._count(namespace, "evictions", count)
+        if removed:
+            logger.info(f"Shared cache evicted {sum(removed.values())} entries")
+        return sum(removed.values())
+
+    def flush_stats(self) -> None:
+        """Add this process's counters to the shared per-namespace totals"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for namespace, counts in pending.items():
+                    conn.execute("INSERT OR IGNORE INTO stats (namespace) VALUES (?)", (namespace,))
+                    conn.execute(
+                        f"UPDATE stats SET {', '.join(f'{c} = {c} + ?' for c in COUNTERS)} WHERE namespace = ?",
+                        (*(counts[c] for c in COUNTERS), namespace)
+                    )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.error(f"Shared cache stats flush failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-namespace counters from all processes, plus current entries and bytes"""
+        self.flush_stats()
+        result: Dict[str, Dict[str, Any]] = {}
+        try:
+            conn = self._connection()
+            for row in conn.execute(f"SELECT namespace, {', '.join(COUNTERS)} FROM stats"):
+                result[row[0]] = {**dict(zip(COUNTERS, row[1:])), "entries": 0, "bytes": 0}
+            for namespace, entries, size in conn.execute(
+                "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY namespace"
+            ):
+                stats = result.setdefault(namespace, dict.fromkeys(COUNTERS, 0))
+                stats["entries"], stats["bytes"] = entries, size
+        except sqlite3.Error as e:
+            logger.error(f"Shared cache stats read failed: {str(e)}")
+        for stats in result.values():
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return result
+
+_cache: Optional[SharedCache] = None
+_cache_lock = threading.Lock()
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """The process-wide shared cache, or None when SHARED_CACHE_ENABLED is off"""
+    global _cache
+    if not SHARED_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SharedCache()
+            atexit.register(_cache.flush_stats)
+        return _cache
+
+def get_shared_cache_stats() -> Dict[str, Dict[str, Any]]:
+    cache = get_shared_cache()
+    return cache.stats() if cache is not None else {}
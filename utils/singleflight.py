@@ -0,0 +1,152 @@
+import os
+import copy
+import asyncio
+import hashlib
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import orjson
+
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Identical work that is already in flight is not started again: the first
+# caller (the leader) runs it and concurrent callers with the same key (the
+# followers) wait for its result. Each request runs its own event loop on its
+# own thread, so the shared result is a concurrent.futures.Future that any
+# loop can await. Followers get a deep copy, so no caller can modify what
+# another one sees.
+SINGLEFLIGHT_ENABLED = os.getenv('SINGLEFLIGHT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+T = TypeVar("T")
+
+class LeaderCancelled(Exception):
+    """The leader was cancelled (e.g. by its own deadline); followers retry"""
+
+def content_key(*parts: Any) -> str:
+    """Hash of the parts that determine a piece of work; dicts and lists are hashed as sorted JSON"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode('utf-8')
+        else:
+            data = orjson.dumps(part, option=orjson.OPT_SORT_KEYS)
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+class _Flight:
+    __slots__ = ("future", "followers")
+
+    def __init__(self):
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.followers = 0
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self.stats = {"executions": 0, "coalesced": 0, "errors": 0}
+
+    def _join(self, key: str):
+        """Return (flight, is_leader), registering a new flight if none is in progress"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.stats["executions"] += 1
+                return flight, True
+            flight.followers += 1
+            self.stats["coalesced"] += 1
+            return flight, False
+
+    def _complete(self, key: str, flight: _Flight, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+            followers = flight.followers
+            if error is not None:
+                self.stats["errors"] += 1
+        if error is not None:
+            flight.future.set_exception(error)
+        else:
+            # Followers copy from a snapshot the leader never touches again
+            flight.future.set_result(copy.deepcopy(result) if followers else None)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn` unless a call with the same key is in flight, in which case
+        wait for that call's result.
+
+        Args:
+            key: Identity of the work, e.g. from content_key
+            fn: Coroutine function doing the work
+
+        Returns:
+            The result of `fn`; exceptions it raises reach every caller
+        """
+        if not SINGLEFLIGHT_ENABLED:
+            return await fn()
+        while True:
+            flight, is_leader = self._join(key)
+            if is_leader:
+                try:
+                    result = await fn()
+                except asyncio.CancelledError:
+                    self._complete(key, flight, error=LeaderCancelled())
+                    raise
+                except Exception as e:
+                    self._complete(key, flight, error=e)
+                    raise
+                self._complete(key, flight, result)
+                return result
+            try:
+                # Shielded, so a follower giving up never cancels the shared work
+                with span(f"coalesced.{self.name}"):
+                    result = await asyncio.shield(asyncio.wrap_future(flight.future))
+            except LeaderCancelled:
+                continue
+            return copy.deepcopy(result)
+
+    def do_sync(self, key: str, fn: Callable[[], T]) -> T:
+        """Blocking counterpart of do() for synchronous work such as rendering"""
+        if not SINGLEFLIGHT_ENABLED:
+            return fn()
+        flight, is_leader = self._join(key)
+        if is_leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                self._complete(key, flight, error=e)
+                raise
+            self._complete(key, flight, result)
+            return result
+        with span(f"coalesced.{self.name}"):
+            return copy.deepcopy(flight.future.result())
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "in_flight": len(self._flights)}
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+def get_flight_group(name: str) -> SingleFlight:
+    """Process-wide coalescing group for one kind of work"""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(name)
+        return _groups[name]
+
+def get_singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    """Executions, coalesced callers and errors per group"""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.snapshot() for group in groups}
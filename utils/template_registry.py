@@ -0,0 +1,258 @@
+import os
+import re
+import uuid
+import shutil
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Resume templates are discovered once per process: every
+# `<name>.template.yaml` manifest in TYPST_TEMPLATES_DIR names an entry
+# point, the assets the Typst sources read and the configuration fields they
+# need. Loading follows the entry points' imports, reads every file into
+# memory, checks the manifest's sample configuration against its required
+# fields, and writes the files once into a content-addressed directory under
+# TEMPLATE_RUNTIME_DIR that Typst compiles from directly. Requests then pick
+# a template by name; nothing is looked up or copied per render.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TYPST_TEMPLATES_DIR = os.path.join(BASE_DIR, 'utils', 'typst_templates')
+TEMPLATE_RUNTIME_DIR = os.getenv('TEMPLATE_RUNTIME_DIR', os.path.join(BASE_DIR, 'temp', 'templates'))
+DEFAULT_TEMPLATE = os.getenv('DEFAULT_TEMPLATE', 'software_engineer')
+
+MANIFEST_SUFFIX = '.template.yaml'
+# Subdirectory of a template's root for per-render configuration files
+INPUTS_DIR = 'inputs'
+TYPST_IMPORT = re.compile(r'#(?:import|include)\s+"([^"@][^"]*\.typ)"')
+
+class TemplateError(Exception):
+    """A template manifest or its files are invalid"""
+
+class UnknownTemplateError(ValueError):
+    """A request named a template that is not registered"""
+
+    def __init__(self, name: str, available: List[str]):
+        super().__init__(f"Unknown template '{name}'; available: {', '.join(available)}")
+        self.name = name
+        self.available = available
+
+class ResumeTemplate:
+    """A validated template, its files held in memory and materialized at `root`"""
+    __slots__ = ("name", "description", "entry", "bulk_entry", "prompt_style",
+                 "required_fields", "files", "digest", "root")
+
+    def __init__(self, name: str, description: str, entry: str, bulk_entry: Optional[str],
+                 prompt_style: str, required_fields: List[str], files: Dict[str, bytes]):
+        self.name = name
+        self.description = description
+        self.entry = entry
+        self.bulk_entry = bulk_entry
+        self.prompt_style = prompt_style
+        self.required_fields = required_fields
+        self.files = files
+        digest = hashlib.sha256()
+        for path in sorted(files):
+            digest.update(path.encode('utf-8') + b'\0' + hashlib.sha256(files[path]).digest())
+        self.digest = digest.hexdigest()
+        self.root: Optional[str] = None
+
+    def missing_fields(self, configuration: Dict[str, Any]) -> List[str]:
+        """Required fields the configuration lacks"""
+        return [field for field in self.required_fields if not has_field(configuration, field.split('.'))]
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name, "description": self.description, "bulk": self.bulk_entry is not None}
+
+def has_field(value: Any, parts: List[str]) -> bool:
+    """Whether a dotted path exists; a `[]` suffix requires it on every list item"""
+    if not parts:
+        return True
+    key = parts[0]
+    each = key.endswith('[]')
+    key = key[:-2] if each else key
+    if not isinstance(value, dict) or key not in value:
+        return False
+    if each:
+        items = value[key]
+        return isinstance(items, list) and all(has_field(item, parts[1:]) for item in items)
+    return has_field(value[key], parts[1:])
+
+def collect_sources(template_dir: str, entry: str) -> Dict[str, bytes]:
+    """The entry file and every local file it imports or includes, transitively"""
+    files: Dict[str, bytes] = {}
+    pending = [entry]
+    while pending:
+        relative = os.path.normpath(pending.pop())
+        if relative in files:
+            continue
+        path = os.path.join(template_dir, relative)
+        if relative.startswith('..') or not os.path.isfile(path):
+            raise TemplateError(f"{relative} is missing from {template_dir}")
+        with open(path, 'rb') as f:
+            files[relative] = f.read()
+        base = os.path.dirname(relative)
+        pending.extend(os.path.join(base, name) for name in TYPST_IMPORT.findall(files[relative].decode('utf-8')))
+    return files
+
+def collect_assets(template_dir: str, assets: List[str]) -> Dict[str, bytes]:
+    files: Dict[str, bytes] = {}
+    for asset in assets:
+        path = os.path.join(template_dir, asset)
+        if os.path.isfile(path):
+            paths = [path]
+        elif os.path.isdir(path):
+            paths = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+        else:
+            raise TemplateError(f"Asset {asset} is missing from {template_dir}")
+        for file_path in paths:
+            with open(file_path, 'rb') as f:
+                files[os.path.relpath(file_path, template_dir)] = f.read()
+    return files
+
+def load_template(manifest_path: str) -> ResumeTemplate:
+    """
+    Read and validate one template manifest and its files.
+
+    Raises:
+        TemplateError: the manifest is malformed, a file it needs is missing,
+            or its sample configuration lacks a required field
+    """
+    template_dir = os.path.dirname(manifest_path)
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        raise TemplateError(f"Could not read {manifest_path}: {str(e)}")
+    if not isinstance(manifest, dict) or not manifest.get('entry'):
+        raise TemplateError(f"{manifest_path} does not name an entry file")
+
+    name = manifest.get('name') or os.path.basename(manifest_path)[:-len(MANIFEST_SUFFIX)]
+    files = collect_sources(template_dir, manifest['entry'])
+    if manifest.get('bulk_entry'):
+        files.update(collect_sources(template_dir, manifest['bulk_entry']))
+    files.update(collect_assets(template_dir, manifest.get('assets') or []))
+
+    template = ResumeTemplate(
+        name=name,
+        description=manifest.get('description', ''),
+        entry=manifest['entry'],
+        bulk_entry=manifest.get('bulk_entry'),
+        prompt_style=manifest.get('prompt_style', 'simple'),
+        required_fields=list(manifest.get('required_fields') or []),
+        files=files
+    )
+    if manifest.get('sample'):
+        try:
+            with open(os.path.join(template_dir, manifest['sample']), encoding='utf-8') as f:
+                sample = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError) as e:
+            raise TemplateError(f"Could not read the sample configuration of {name}: {str(e)}")
+        missing = template.missing_fields(sample)
+        if missing:
+            raise TemplateError(f"Sample configuration of {name} lacks {', '.join(missing)}")
+    return template
+
+def materialize(template: ResumeTemplate, runtime_dir: str) -> str:
+    """
+    Write the template's files to <runtime_dir>/<name>-<digest>, once.
+
+    The directory is named by content, so workers sharing runtime_dir reuse
+    it and a changed template never mixes with an older copy. It is built
+    under a temporary name and renamed into place, so a compile never sees a
+    half-written template.
+    """
+    root = os.path.join(runtime_dir, f"{template.name}-{template.digest[:16]}")
+    if not os.path.isdir(root):
+        staging = os.path.join(runtime_dir, f".{template.name}-{uuid.uuid4().hex}")
+        for relative, data in template.files.items():
+            path = os.path.join(staging, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+        try:
+            os.rename(staging, root)
+        except OSError:
+            # Another worker materialized it first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(root):
+                raise
+    os.makedirs(os.path.join(root, INPUTS_DIR), exist_ok=True)
+    return root
+
+class TemplateRegistry:
+    """Templates discovered and validated once, selected by name per request"""
+
+    def __init__(self,
+                 template_dir: str = TYPST_TEMPLATES_DIR,
+                 runtime_dir: str = TEMPLATE_RUNTIME_DIR,
+                 default: str = DEFAULT_TEMPLATE):
+        self.template_dir = template_dir
+        self.runtime_dir = runtime_dir
+        self.default = default
+        self._templates: Dict[str, ResumeTemplate] = {}
+
+    def load(self) -> None:
+        """
+        Discover every manifest; invalid templates are logged and left out.
+
+        Raises:
+            TemplateError: no valid template was found, or the default is not
+                among them
+        """
+        templates: Dict[str, ResumeTemplate] = {}
+        for file_name in sorted(os.listdir(self.template_dir)):
+            if not file_name.endswith(MANIFEST_SUFFIX):
+                continue
+            try:
+                template = load_template(os.path.join(self.template_dir, file_name))
+                template.root = materialize(template, self.runtime_dir)
+            except (TemplateError, OSError) as e:
+                logger.error(f"Skipping template {file_name}: {str(e)}")
+                continue
+            if template.name in templates:
+                logger.error(f"Skipping template {file_name}: {template.name} is already registered")
+                continue
+            templates[template.name] = template
+            logger.info(f"Registered template {template.name} ({len(template.files)} files) at {template.root}")
+        if self.default not in templates:
+            raise TemplateError(f"Default template '{self.default}' is not among the valid templates "
+                                f"in {self.template_dir}: {', '.join(templates) or 'none'}")
+        self._templates = templates
+
+    def get(self, name: Optional[str] = None) -> ResumeTemplate:
+        """
+        The template called `name`, or the default one.
+
+        Raises:
+            UnknownTemplateError: no template has that name
+        """
+        template = self._templates.get(name or self.default)
+        if template is None:
+            raise UnknownTemplateError(name, self.names())
+        return template
+
+    def names(self) -> List[str]:
+        return sorted(self._templates)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        return [self._templates[name].describe() for name in self.names()]
+
+_registry: Optional[TemplateRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_template_registry() -> TemplateRegistry:
+    """The process-wide registry, loaded on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            registry = TemplateRegistry()
+            registry.load()
+            _registry = registry
+        return _registry
+
+def get_template(name: Optional[str] = None) -> ResumeTemplate:
+    return get_template_registry().get(name)
@@ -0,0 +1,154 @@
+import os
+import re
+import time
+import uuid
+import random
+import logging
+import threading
+import functools
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Tracing itself is cheap (a few perf_counter calls per stage); sampling only
+# decides which traces are also written to the trace log.
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0.1'))
+TRACE_LOG_PATH = os.getenv('TRACE_LOG_PATH', os.path.join('logs', 'traces.jsonl'))
+
+_INVALID_METRIC_CHARS = re.compile(r'[^A-Za-z0-9_.\-]')
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_write_lock = threading.Lock()
+
+class Span:
+    """A finished, timed stage of a request"""
+    __slots__ = ("name", "start", "duration")
+
+    def __init__(self, name: str, start: float, duration: float):
+        self.name = name
+        self.start = start
+        self.duration = duration
+
+class Trace:
+    """Collects the spans of a single request, including concurrent ones"""
+
+    def __init__(self, name: str, sampled: bool = False):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.sampled = sampled
+        self.started_at = datetime.now().isoformat()
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self.attributes: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, start: float, duration: float) -> None:
+        with self._lock:
+            self.spans.append(Span(name, start - self.origin, duration))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def server_timing_header(self) -> str:
+        """Render the spans as a Server-Timing header value (durations in ms)"""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for span in self.spans:
+                metric = _INVALID_METRIC_CHARS.sub('-', span.name)
+                totals[metric] = totals.get(metric, 0.0) + span.duration
+        totals["total"] = self.elapsed()
+        return ", ".join(f"{metric};dur={duration * 1000:.1f}" for metric, duration in totals.items())
+
+    def to_record(self) -> Dict[str, Any]:
+        """Compact representation written to the trace log"""
+        with self._lock:
+            spans = [[span.name, round(span.start * 1000, 2), round(span.duration * 1000, 2)] for span in self.spans]
+        return {
+            "id": self.trace_id,
+            "name": self.name,
+            "ts": self.started_at,
+            "total_ms": round(self.elapsed() * 1000, 2),
+            "spans": spans,
+            "attrs": self.attributes
+        }
+
+def start_trace(name: str, force_sample: bool = False) -> Optional[Trace]:
+    """
+    Start a trace for the current request and make it the active one.
+
+    Args:
+        name: Name of the traced operation
+        force_sample: Write this trace to the log regardless of TRACE_SAMPLE_RATE
+
+    Returns:
+        The new trace, or None when tracing is disabled
+    """
+    if not TRACING_ENABLED:
+        return None
+    trace = Trace(name, sampled=force_sample or random.random() < TRACE_SAMPLE_RATE)
+    _current_trace.set(trace)
+    return trace
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+def finish_trace(trace: Optional[Trace]) -> None:
+    """Write a sampled trace to the trace log and deactivate it"""
+    if trace is None:
+        return
+    if _current_trace.get() is trace:
+        _current_trace.set(None)
+    if not trace.sampled:
+        return
+    try:
+        line = orjson.dumps(trace.to_record()) + b"\n"
+        directory = os.path.dirname(TRACE_LOG_PATH)
+        with _write_lock:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(TRACE_LOG_PATH, 'ab') as f:
+                f.write(line)
+    except Exception as e:
+        logger.warning(f"Failed to write trace record: {str(e)}")
+
+def set_attribute(key: str, value: Any) -> None:
+    """Attach a value to the active trace, if any"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attributes[key] = value
+
+@contextmanager
+def span(name: str):
+    """Time a block as a span of the active trace; a no-op without one"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_span(name, start, time.perf_counter() - start)
+
+def traced(name: str) -> Callable:
+    """Decorator recording every call of a sync or async function as a span"""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,134 @@
+"""
+Fonts and packages for hermetic Typst renders.
+
+The templates in utils/typst_templates are compiled with only the fonts in
+TYPST_FONT_DIR and the packages in TYPST_PACKAGE_DIR, so renders neither
+depend on nor scan what is installed on the host. This module knows what
+belongs there and fetches it; run it once when setting up a checkout or
+building an image, and commit or bake in the result:
+
+    python -m utils.typst_assets            # fetch missing fonts and packages
+    python -m utils.typst_assets --check    # exit 1 if anything is missing
+"""
+import os
+import re
+import io
+import sys
+import tarfile
+import logging
+import argparse
+import urllib.request
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'typst_templates')
+TYPST_FONT_DIR = os.getenv('TYPST_FONT_DIR', os.path.join(TEMPLATES_DIR, 'fonts'))
+TYPST_PACKAGE_DIR = os.getenv('TYPST_PACKAGE_DIR', os.path.join(TEMPLATES_DIR, 'packages'))
+
+# vantage-typst.typ sets its body text in PT Sans (SIL Open Font License)
+FONT_SOURCE = "https://github.com/google/fonts/raw/main/ofl/ptsans"
+FONT_FILES = (
+    "PT_Sans-Web-Regular.ttf",
+    "PT_Sans-Web-Bold.ttf",
+    "PT_Sans-Web-Italic.ttf",
+    "PT_Sans-Web-BoldItalic.ttf",
+)
+FONT_MAGIC = (b"\x00\x01\x00\x00", b"true", b"OTTO")
+
+PACKAGE_SOURCE = "https://packages.typst.org"
+PACKAGE_IMPORT = re.compile(r'#import\s+"@([a-z0-9-]+)/([a-z0-9-]+):(\d+\.\d+\.\d+)"')
+DOWNLOAD_TIMEOUT_SECONDS = 60
+
+def missing_fonts(font_dir: str = TYPST_FONT_DIR) -> List[str]:
+    """Font files from FONT_FILES that are not in font_dir"""
+    return [name for name in FONT_FILES if not os.path.isfile(os.path.join(font_dir, name))]
+
+def find_package_imports(template_dir: str = TEMPLATES_DIR) -> List[Tuple[str, str, str]]:
+    """(namespace, name, version) of every package the templates import"""
+    packages = set()
+    for file_name in sorted(os.listdir(template_dir)):
+        if file_name.endswith('.typ'):
+            with open(os.path.join(template_dir, file_name), encoding='utf-8') as f:
+                packages.update(PACKAGE_IMPORT.findall(f.read()))
+    return sorted(packages)
+
+def missing_packages(template_dir: str = TEMPLATES_DIR, package_dir: str = TYPST_PACKAGE_DIR) -> List[Tuple[str, str, str]]:
+    """Imported packages that are not resolved into package_dir"""
+    return [package for package in find_package_imports(template_dir)
+            if not os.path.isfile(os.path.join(package_dir, *package, 'typst.toml'))]
+
+def download(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT_SECONDS) as response:
+        return response.read()
+
+def fetch_fonts(font_dir: str = TYPST_FONT_DIR) -> List[str]:
+    """Download the missing fonts into font_dir; returns the files fetched"""
+    os.makedirs(font_dir, exist_ok=True)
+    fetched = []
+    for name in missing_fonts(font_dir):
+        data = download(f"{FONT_SOURCE}/{name}")
+        if not data.startswith(FONT_MAGIC):
+            raise RuntimeError(f"Downloaded {name} is not a TrueType/OpenType font")
+        # Written under a temporary name first, so a failed run never leaves a truncated font
+        path = os.path.join(font_dir, name)
+        with open(f"{path}.part", 'wb') as f:
+            f.write(data)
+        os.replace(f"{path}.part", path)
+        fetched.append(name)
+        logger.info(f"Fetched font {name}")
+    return fetched
+
+def fetch_packages(template_dir: str = TEMPLATES_DIR, package_dir: str = TYPST_PACKAGE_DIR) -> List[str]:
+    """
+    Resolve the missing package imports into package_dir.
+
+    The layout is Typst's own package cache layout
+    (<namespace>/<name>/<version>), so the directory works as both
+    --package-path and --package-cache-path. Packages imported by fetched
+    packages are resolved as well.
+    """
+    fetched = []
+    pending = missing_packages(template_dir, package_dir)
+    while pending:
+        namespace, name, version = pending.pop()
+        target = os.path.join(package_dir, namespace, name, version)
+        if os.path.isfile(os.path.join(target, 'typst.toml')):
+            continue
+        archive = download(f"{PACKAGE_SOURCE}/{namespace}/{name}-{version}.tar.gz")
+        os.makedirs(target, exist_ok=True)
+        with tarfile.open(fileobj=io.BytesIO(archive), mode='r:gz') as tar:
+            tar.extractall(target, filter='data')
+        fetched.append(f"@{namespace}/{name}:{version}")
+        logger.info(f"Fetched package @{namespace}/{name}:{version}")
+        for root, _, files in os.walk(target):
+            for file_name in files:
+                if file_name.endswith('.typ'):
+                    with open(os.path.join(root, file_name), encoding='utf-8') as f:
+                        pending.extend(PACKAGE_IMPORT.findall(f.read()))
+    return fetched
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Only report what is missing")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.check:
+        fonts, packages = missing_fonts(), missing_packages()
+        for name in fonts:
+            print(f"missing font: {name}")
+        for namespace, name, version in packages:
+            print(f"missing package: @{namespace}/{name}:{version}")
+        sys.exit(1 if fonts or packages else 0)
+
+    try:
+        fetch_fonts()
+        fetch_packages()
+    except (OSError, RuntimeError, tarfile.TarError) as e:
+        logger.error(f"Fetching Typst assets failed: {str(e)}")
+        sys.exit(1)
+    print(f"Fonts in {TYPST_FONT_DIR}, packages in {TYPST_PACKAGE_DIR}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+#import "resume.typ": render-resume
+#let configurations = json(sys.inputs.at("configurations-file", default: "configurations.json"))
+
+#set document(title: "Resumes")
+
+// Every resume starts on a fresh page and contributes exactly one level-1
+// heading (its name), which the PDF outline exposes as a bookmark. The
+// bulk renderer uses those top-level bookmarks as page boundaries when
+// splitting the combined PDF back into one file per resume.
+#for (index, configuration) in configurations.enumerate() {
+  if index > 0 {
+    pagebreak()
+  }
+  render-resume(configuration, standalone: false)
+}
@@ -17,7 +17,9 @@
   services.map(service => {
       icon(service.name)
 
-      if "display" in service.keys() {
+      if service.link == "" {
+        service.at("display", default: "")
+      } else if "display" in service.keys() {
         link(service.link)[#{service.display}]
       } else {
         link(service.link)
@@ -87,13 +89,14 @@
   position: "",
   links: (),
   tagline: [],
+  standalone: true,
   leftSide,
   rightSide
 ) = {
   set document(
     title: name + "'s CV",
     author: name,
-  )
+  ) if standalone
   set text(9.8pt, font: "PT Sans")
   set page(
     margin: (x: 1.2cm, y: 1.2cm),
@@ -0,0 +1,108 @@
+import os
+import io
+import hashlib
+import logging
+import tempfile
+from typing import IO, Optional
+
+import filetype
+from flask import Request
+from PyPDF2 import PdfReader
+from PyPDF2.errors import PdfReadError
+from werkzeug.datastructures import FileStorage
+
+logger = logging.getLogger(__name__)
+
+# Uploads are never read into memory as a whole. Werkzeug writes the file
+# part to a spooled temporary file that moves to disk past
+# UPLOAD_SPOOL_BYTES, requests larger than MAX_UPLOAD_BYTES (plus room for
+# the form fields) are refused with 413 while the body is being read, and
+# the PDF is checked by magic bytes, size and page count before any text is
+# extracted. The pipeline then reads the spooled file directly.
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+MAX_PDF_PAGES = int(os.getenv('MAX_PDF_PAGES', '20'))
+UPLOAD_SPOOL_BYTES = int(os.getenv('UPLOAD_SPOOL_BYTES', str(1024 * 1024)))
+# Allowance for the job description and multipart framing on top of the file
+UPLOAD_FORM_OVERHEAD_BYTES = int(os.getenv('UPLOAD_FORM_OVERHEAD_BYTES', str(256 * 1024)))
+MAX_REQUEST_BYTES = MAX_UPLOAD_BYTES + UPLOAD_FORM_OVERHEAD_BYTES
+# filetype needs at most this many leading bytes to recognise a format
+MAGIC_BYTES = 261
+HASH_CHUNK_BYTES = 1024 * 1024
+
+class UploadRejected(Exception):
+    """An upload that is refused before processing, with the HTTP status to return"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+class SpoolingRequest(Request):
+    """Request whose file uploads spill to disk past UPLOAD_SPOOL_BYTES"""
+
+    def _get_file_stream(self, total_content_length: Optional[int], content_type: Optional[str],
+                         filename: Optional[str] = None, content_length: Optional[int] = None) -> IO[bytes]:
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES, mode="rb+")
+
+class PdfUpload:
+    """A validated PDF upload: the open stream and what is known about it"""
+    __slots__ = ("stream", "size", "pages", "digest")
+
+    def __init__(self, stream: IO[bytes], size: int, pages: int, digest: str):
+        self.stream = stream
+        self.size = size
+        self.pages = pages
+        self.digest = digest
+
+    def close(self) -> None:
+        self.stream.close()
+
+def stream_digest(stream: IO[bytes]) -> str:
+    """SHA-256 of a seekable stream, read in chunks; leaves it at the start"""
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+def open_pdf_upload(file_storage: FileStorage,
+                    max_bytes: int = MAX_UPLOAD_BYTES,
+                    max_pages: int = MAX_PDF_PAGES) -> PdfUpload:
+    """
+    Validate an uploaded resume and take ownership of its stream.
+
+    The stream is detached from the request, so it stays open after the
+    request ends (the streaming endpoint keeps working on it); the caller
+    must close the returned upload.
+
+    Raises:
+        UploadRejected: 415 if it is not a PDF, 413 if it is larger than
+            max_bytes, 422 if it has more than max_pages pages or cannot be
+            read
+    """
+    stream = file_storage.stream
+    file_storage.stream = io.BytesIO()
+    try:
+        stream.seek(0)
+        kind = filetype.guess(stream.read(MAGIC_BYTES))
+        if kind is None or kind.mime != "application/pdf":
+            raise UploadRejected("Uploaded file is not a PDF", 415)
+
+        size = stream.seek(0, os.SEEK_END)
+        if size > max_bytes:
+            raise UploadRejected(f"PDF is larger than {max_bytes // (1024 * 1024)} MB", 413)
+
+        # Only the cross-reference table and page tree are read here; page
+        # content is parsed later, during extraction
+        stream.seek(0)
+        try:
+            pages = len(PdfReader(stream).pages)
+        except (PdfReadError, ValueError, KeyError) as e:
+            raise UploadRejected(f"Could not read the PDF: {str(e)}", 422)
+        if pages > max_pages:
+            raise UploadRejected(f"PDF has {pages} pages; at most {max_pages} are accepted", 422)
+
+        return PdfUpload(stream, size, pages, stream_digest(stream))
+    except BaseException:
+        stream.close()
+        raise